@@ -0,0 +1,43 @@
+import logging
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, get_engine
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+
+# Configure logging from alembic.ini only for the alembic CLI; app.migrate
+# sets up logging itself
+if config.config_file_name is not None and not logging.getLogger().handlers:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit SQL to stdout (alembic upgrade head --sql)"""
+    context.configure(
+        url=get_engine().url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with get_engine().connect() as connection:
+        # Batch mode lets SQLite alter tables by copying them
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,137 @@
+"""Baseline schema: users, jobs, candidates and match results
+
+Databases created with create_all before migrations existed are stamped at
+this revision by app.migrate instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+GRADE_LEVELS = ("P1", "P2", "P3", "P4", "P5", "P6", "D1", "D2")
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("reference_number", sa.String(100), nullable=True),
+        sa.Column("department", sa.String(255), nullable=True),
+        sa.Column("directorate", sa.String(255), nullable=True),
+        sa.Column("duty_station", sa.String(255), nullable=True),
+        sa.Column("grade_level", sa.Enum(*GRADE_LEVELS, name="gradelevel"), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("raw_jd_text", sa.Text(), nullable=True),
+        sa.Column("education_criteria", sa.JSON(), nullable=True),
+        sa.Column("experience_criteria", sa.JSON(), nullable=True),
+        sa.Column("min_pass_mark", sa.Integer(), nullable=True),
+        sa.Column(
+            "status", sa.Enum("DRAFT", "ACTIVE", "SCREENING", "COMPLETED", "ARCHIVED", name="jobstatus"),
+            nullable=True
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("screening_completed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_jobs_id", "jobs", ["id"])
+    op.create_index("ix_jobs_reference_number", "jobs", ["reference_number"], unique=True)
+
+    op.create_table(
+        "candidates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("email", sa.String(255), nullable=True),
+        sa.Column("phone", sa.String(50), nullable=True),
+        sa.Column(
+            "gender", sa.Enum("MALE", "FEMALE", "OTHER", "NOT_SPECIFIED", name="gender"), nullable=True
+        ),
+        sa.Column("date_of_birth", sa.Date(), nullable=True),
+        sa.Column("nationality", sa.String(100), nullable=True),
+        sa.Column("country_of_residence", sa.String(100), nullable=True),
+        sa.Column("is_least_represented_country", sa.Boolean(), nullable=True),
+        sa.Column("has_disability", sa.Boolean(), nullable=True),
+        sa.Column("disability_details", sa.Text(), nullable=True),
+        sa.Column("cv_filename", sa.String(255), nullable=True),
+        sa.Column("cv_file_path", sa.String(500), nullable=True),
+        sa.Column("cv_raw_text", sa.Text(), nullable=True),
+        sa.Column("education", sa.JSON(), nullable=True),
+        sa.Column("experience", sa.JSON(), nullable=True),
+        sa.Column("skills", sa.JSON(), nullable=True),
+        sa.Column("certifications", sa.JSON(), nullable=True),
+        sa.Column("languages", sa.JSON(), nullable=True),
+        sa.Column("parsed_cv_data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_candidates_id", "candidates", ["id"])
+
+    op.create_table(
+        "match_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("education_scores", sa.JSON(), nullable=True),
+        sa.Column("education_total", sa.Float(), nullable=True),
+        sa.Column("experience_scores", sa.JSON(), nullable=True),
+        sa.Column("experience_total", sa.Float(), nullable=True),
+        sa.Column("base_score", sa.Float(), nullable=True),
+        sa.Column("bonus_female", sa.Integer(), nullable=True),
+        sa.Column("bonus_age", sa.Integer(), nullable=True),
+        sa.Column("bonus_least_represented", sa.Integer(), nullable=True),
+        sa.Column("bonus_inclusion", sa.Integer(), nullable=True),
+        sa.Column("total_bonus", sa.Integer(), nullable=True),
+        sa.Column("final_score", sa.Float(), nullable=True),
+        sa.Column("rank", sa.Integer(), nullable=True),
+        sa.Column("is_in_longlist", sa.Boolean(), nullable=True),
+        sa.Column("passes_cutoff", sa.Boolean(), nullable=True),
+        sa.Column("overall_reasoning", sa.Text(), nullable=True),
+        sa.Column("strengths", sa.JSON(), nullable=True),
+        sa.Column("weaknesses", sa.JSON(), nullable=True),
+        sa.Column("recommendations", sa.Text(), nullable=True),
+        sa.Column("flags", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["candidate_id"], ["candidates.id"]),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("candidate_id"),
+    )
+    op.create_index("ix_match_results_id", "match_results", ["id"])
+
+
+def downgrade():
+    op.drop_table("match_results")
+    op.drop_table("candidates")
+    op.drop_table("jobs")
+    op.drop_table("users")
+    for name in ("gender", "jobstatus", "gradelevel"):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""Pre-screening status and score on match results
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+screening_status = sa.Enum("SCORED", "PRESCREEN_REJECTED", name="screeningstatus")
+
+
+def upgrade():
+    # Columns may already exist on databases built with create_all
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("match_results")}
+    if "screening_status" not in columns:
+        screening_status.create(op.get_bind(), checkfirst=True)
+        op.add_column("match_results", sa.Column("screening_status", screening_status, nullable=True))
+        # Every existing result was scored by the LLM
+        op.execute("UPDATE match_results SET screening_status = 'SCORED'")
+    if "prescreen_score" not in columns:
+        op.add_column("match_results", sa.Column("prescreen_score", sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("match_results") as batch:
+        batch.drop_column("prescreen_score")
+        batch.drop_column("screening_status")
+    screening_status.drop(op.get_bind(), checkfirst=True)
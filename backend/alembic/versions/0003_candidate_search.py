@@ -0,0 +1,47 @@
+"""Candidate search fields, nationality index and full-text index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# Must match Candidate._search_document, which search queries use
+SEARCH_DOCUMENT = (
+    "to_tsvector('english'::regconfig, coalesce(full_name, '') || ' ' "
+    "|| coalesce(search_text, '') || ' ' || coalesce(cv_raw_text, ''))"
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("candidates")}
+    indexes = {index["name"] for index in inspector.get_indexes("candidates")}
+    if "search_text" not in columns:
+        op.add_column("candidates", sa.Column("search_text", sa.Text(), nullable=True))
+    if "highest_degree_level" not in columns:
+        op.add_column("candidates", sa.Column("highest_degree_level", sa.String(50), nullable=True))
+    if "ix_candidates_highest_degree_level" not in indexes:
+        op.create_index("ix_candidates_highest_degree_level", "candidates", ["highest_degree_level"])
+    if "ix_candidates_nationality" not in indexes:
+        op.create_index("ix_candidates_nationality", "candidates", ["nationality"])
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_candidates_search_document ON candidates USING gin ({SEARCH_DOCUMENT})"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_candidates_search_document")
+    op.drop_index("ix_candidates_nationality", table_name="candidates")
+    op.drop_index("ix_candidates_highest_degree_level", table_name="candidates")
+    with op.batch_alter_table("candidates") as batch:
+        batch.drop_column("highest_degree_level")
+        batch.drop_column("search_text")
@@ -0,0 +1,41 @@
+"""Versioned scoring policies, and the policy version on match results
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("scoring_policies"):
+        op.create_table(
+            "scoring_policies",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("config", sa.JSON(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("created_by", sa.String(100), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_scoring_policies_id", "scoring_policies", ["id"])
+        op.create_index("ix_scoring_policies_version", "scoring_policies", ["version"], unique=True)
+        op.create_index("ix_scoring_policies_is_active", "scoring_policies", ["is_active"])
+    if "policy_version" not in {column["name"] for column in inspector.get_columns("match_results")}:
+        op.add_column("match_results", sa.Column("policy_version", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("match_results") as batch:
+        batch.drop_column("policy_version")
+    op.drop_table("scoring_policies")
@@ -0,0 +1,44 @@
+"""LLM call ledger
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("llm_calls"):
+        return
+    op.create_table(
+        "llm_calls",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("operation", sa.String(40), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=True),
+        sa.Column("candidate_id", sa.Integer(), nullable=True),
+        sa.Column("model", sa.String(64), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("cache_creation_input_tokens", sa.Integer(), nullable=True),
+        sa.Column("cache_read_input_tokens", sa.Integer(), nullable=True),
+        sa.Column("cost_usd", sa.Float(), nullable=True),
+        sa.Column("latency_ms", sa.Integer(), nullable=True),
+        sa.Column("wall_ms", sa.Integer(), nullable=True),
+        sa.Column("retries", sa.SmallInteger(), nullable=True),
+        sa.Column("error", sa.String(64), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_llm_calls_created_at", "llm_calls", ["created_at"])
+    op.create_index("ix_llm_calls_operation", "llm_calls", ["operation"])
+    op.create_index("ix_llm_calls_job_operation", "llm_calls", ["job_id", "operation"])
+
+
+def downgrade():
+    op.drop_table("llm_calls")
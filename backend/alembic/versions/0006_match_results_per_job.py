@@ -0,0 +1,45 @@
+"""Match results unique per (job, candidate) instead of per candidate
+
+Talent-pool matching gives a candidate one result per job, so the baseline
+unique constraint on match_results.candidate_id is replaced.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Names reflected unnamed SQLite constraints so batch mode can drop them
+NAMING_CONVENTION = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    uniques = inspector.get_unique_constraints("match_results")
+    indexes = {index["name"] for index in inspector.get_indexes("match_results")}
+    with op.batch_alter_table("match_results", naming_convention=NAMING_CONVENTION) as batch:
+        for constraint in uniques:
+            if constraint["column_names"] == ["candidate_id"]:
+                # match_results_candidate_id_key on PostgreSQL, unnamed on SQLite
+                batch.drop_constraint(constraint["name"] or "uq_match_results_candidate_id", type_="unique")
+        if not any(constraint["name"] == "uq_match_results_job_candidate" for constraint in uniques):
+            batch.create_unique_constraint("uq_match_results_job_candidate", ["job_id", "candidate_id"])
+        if "ix_match_results_job_id" not in indexes:
+            batch.create_index("ix_match_results_job_id", ["job_id"])
+        if "ix_match_results_candidate_id" not in indexes:
+            batch.create_index("ix_match_results_candidate_id", ["candidate_id"])
+
+
+def downgrade():
+    # Fails if a candidate has been matched against more than one job
+    with op.batch_alter_table("match_results") as batch:
+        batch.drop_index("ix_match_results_candidate_id")
+        batch.drop_index("ix_match_results_job_id")
+        batch.drop_constraint("uq_match_results_job_candidate", type_="unique")
+        batch.create_unique_constraint("uq_match_results_candidate_id", ["candidate_id"])
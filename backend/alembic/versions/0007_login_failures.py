@@ -0,0 +1,31 @@
+"""Failed logins, for the login throttle shared by workers
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("login_failures"):
+        return
+    op.create_table(
+        "login_failures",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(300), nullable=False),
+        sa.Column("failed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_login_failures_failed_at", "login_failures", ["failed_at"])
+    op.create_index("ix_login_failures_key_failed_at", "login_failures", ["key", "failed_at"])
+
+
+def downgrade():
+    op.drop_table("login_failures")
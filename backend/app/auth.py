@@ -1,16 +1,29 @@
+import asyncio
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, event, inspect, insert, select
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 
 from .config import get_settings
-from .database import get_db
-from .models import User
+from .database import get_db, get_engine
+from .models import LoginFailure, User
+from .services import shared_state
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
@@ -18,6 +31,29 @@ ACCESS_TOKEN_EXPIRE_HOURS = 8
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# user id -> (expiry on the monotonic clock, generation, column values)
+_user_cache: Dict[int, Tuple[float, bytes, Dict[str, Any]]] = {}
+_user_cache_lock = threading.Lock()
+# Bumped on every user change (in Redis when workers share it); entries cached
+# under another generation are stale
+_USER_CACHE_GENERATION_KEY = "user_cache:generation"
+_local_generation = 0
+_USER_COLUMNS = tuple(column.key for column in inspect(User).column_attrs)
+
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    """Shared bcrypt pool; its size bounds the CPU spent on password checks"""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt"
+            )
+        return _hash_executor
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
@@ -27,10 +63,169 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(
-        password.encode("utf-8"), bcrypt.gensalt()
+        password.encode("utf-8"), bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     ).decode("utf-8")
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool(), verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_pool(), get_password_hash, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than `bcrypt_rounds`"""
+    try:
+        # $2b$<cost>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+
+class LoginThrottle:
+    """
+    Sliding-window count of failed logins per key (username or client IP),
+    in this process. Checked before the password, so throttled attempts cost
+    no bcrypt work. Used when the app runs as a single worker; see
+    get_login_throttle for the shared variants.
+    """
+
+    # Bounds memory under a spray of distinct usernames or addresses
+    MAX_KEYS = 10000
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._failures: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, key: str, now: float) -> Optional[Deque[float]]:
+        failures = self._failures.get(key)
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if failures is not None and not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    async def retry_after(self, limits: Iterable[Tuple[str, int]]) -> float:
+        """Seconds until every (key, max failures) pair is under its limit; 0 if it is now"""
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            for key, limit in limits:
+                failures = self._prune(key, now)
+                if failures is not None and len(failures) >= limit:
+                    # The oldest failure counted against the limit expires first
+                    oldest = failures[len(failures) - limit]
+                    wait = max(wait, oldest + self.window_seconds - now)
+        return wait
+
+    async def record_failure(self, keys: Iterable[str]):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failures) >= self.MAX_KEYS:
+                for key in list(self._failures):
+                    self._prune(key, now)
+            for key in keys:
+                if key in self._failures or len(self._failures) < self.MAX_KEYS:
+                    self._failures.setdefault(key, deque()).append(now)
+
+    async def reset(self, key: str):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+class DatabaseLoginThrottle(LoginThrottle):
+    """The login throttle over the login_failures table, shared by all workers"""
+
+    def _retry_after(self, limits: Iterable[Tuple[str, int]]) -> float:
+        now = datetime.now(timezone.utc)
+        wait = 0.0
+        with get_engine().connect() as connection:
+            for key, limit in limits:
+                recent = connection.execute(
+                    select(LoginFailure.failed_at)
+                    .where(LoginFailure.key == key,
+                           LoginFailure.failed_at > now - timedelta(seconds=self.window_seconds))
+                    .order_by(LoginFailure.failed_at.desc())
+                    .limit(limit)
+                ).scalars().all()
+                if len(recent) >= limit:
+                    # SQLite hands back naive timestamps
+                    oldest = recent[-1] if recent[-1].tzinfo else recent[-1].replace(tzinfo=timezone.utc)
+                    wait = max(wait, (oldest - now).total_seconds() + self.window_seconds)
+        return wait
+
+    def _record_failure(self, keys: Iterable[str]):
+        now = datetime.now(timezone.utc)
+        with get_engine().begin() as connection:
+            connection.execute(
+                delete(LoginFailure).where(LoginFailure.failed_at <= now - timedelta(seconds=self.window_seconds))
+            )
+            connection.execute(insert(LoginFailure), [{"key": key, "failed_at": now} for key in keys])
+
+    def _reset(self, key: str):
+        with get_engine().begin() as connection:
+            connection.execute(delete(LoginFailure).where(LoginFailure.key == key))
+
+    async def retry_after(self, limits: Iterable[Tuple[str, int]]) -> float:
+        return await run_in_threadpool(self._retry_after, list(limits))
+
+    async def record_failure(self, keys: Iterable[str]):
+        await run_in_threadpool(self._record_failure, list(keys))
+
+    async def reset(self, key: str):
+        await run_in_threadpool(self._reset, key)
+
+
+class RedisLoginThrottle(LoginThrottle):
+    """The login throttle as one sorted set of failure times per key in SHARED_STATE_URL"""
+
+    async def retry_after(self, limits: Iterable[Tuple[str, int]]) -> float:
+        client = shared_state.redis_client()
+        now = time.time()
+        wait = 0.0
+        for key, limit in limits:
+            name = f"login_failures:{key}"
+            await client.zremrangebyscore(name, "-inf", now - self.window_seconds)
+            count = await client.zcard(name)
+            if count >= limit:
+                [(_, oldest)] = await client.zrange(name, count - limit, count - limit, withscores=True)
+                wait = max(wait, oldest + self.window_seconds - now)
+        return wait
+
+    async def record_failure(self, keys: Iterable[str]):
+        client = shared_state.redis_client()
+        now = time.time()
+        for key in keys:
+            name = f"login_failures:{key}"
+            await client.zadd(name, {secrets.token_hex(8): now})
+            await client.pexpire(name, int(self.window_seconds * 1000))
+
+    async def reset(self, key: str):
+        await shared_state.redis_client().delete(f"login_failures:{key}")
+
+
+@lru_cache()
+def get_login_throttle() -> LoginThrottle:
+    """Failed-login counts where every worker sees them: Redis, PostgreSQL or (one worker) memory"""
+    kind = shared_state.backend()
+    if kind == "redis":
+        return RedisLoginThrottle(settings.login_failure_window_seconds)
+    if kind == "postgresql":
+        return DatabaseLoginThrottle(settings.login_failure_window_seconds)
+    return LoginThrottle(settings.login_failure_window_seconds)
+
+
+def token_claims(user: User) -> dict:
+    """Claims identifying the user and their role, checked on every request"""
+    return {"sub": user.username, "uid": user.id, "adm": bool(user.is_admin)}
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
@@ -38,10 +233,110 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _user_cache_mode() -> Optional[str]:
+    """
+    "redis" when invalidations are shared through SHARED_STATE_URL, "local"
+    for a single worker, None (no cache) when several workers could not
+    tell each other about changed users
+    """
+    if settings.user_cache_ttl_seconds <= 0:
+        return None
+    if shared_state.backend() == "redis":
+        return "redis"
+    return "local" if settings.web_workers <= 1 else None
+
+
+def _drop_cached(user_id: Optional[int] = None):
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
+
+
+def invalidate_user(user_id: Optional[int] = None):
+    """Drop one user (or everyone) from the cache, in every worker"""
+    global _local_generation
+    _drop_cached(user_id)
+    with _user_cache_lock:
+        _local_generation += 1
+    if _user_cache_mode() == "redis":
+        try:
+            shared_state.redis_sync_client().incr(_USER_CACHE_GENERATION_KEY)
+        except Exception as e:
+            logger.warning("could not invalidate user %s in other workers: %s", user_id, e)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    # Bulk query.update()/delete() bypass mapper events; call invalidate_user() after them
+    _drop_cached(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_users", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _users_committed(session):
+    # Again once committed, so no worker keeps a copy it read before the commit
+    for user_id in session.info.pop("changed_users", ()):
+        invalidate_user(user_id)
+
+
+def _cache_generation() -> Optional[bytes]:
+    """
+    The generation usable cache entries carry, read before any database
+    lookup; None when the cache is off or Redis can't be read
+    """
+    mode = _user_cache_mode()
+    if mode != "redis":
+        return str(_local_generation).encode() if mode else None
+    try:
+        return shared_state.redis_sync_client().get(_USER_CACHE_GENERATION_KEY) or b"0"
+    except Exception as e:
+        # Redis is down: skip the cache rather than risk serving changed users
+        logger.warning("user cache generation unavailable: %s", e)
+        return None
+
+
+def _cached_user(user_id: int, generation: Optional[bytes]) -> Optional[User]:
+    if generation is None:
+        return None
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+    if entry is None:
+        return None
+    expires, cached_generation, values = entry
+    if expires < time.monotonic() or cached_generation != generation:
+        _drop_cached(user_id)
+        return None
+    # A detached copy per request: never bound to the request's session, and
+    # merging it back would update the row rather than insert a duplicate
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def _cache_user(user: User, generation: Optional[bytes]):
+    if generation is None:
+        return
+    values = {key: getattr(user, key) for key in _USER_COLUMNS}
+    with _user_cache_lock:
+        _user_cache[user.id] = (time.monotonic() + settings.user_cache_ttl_seconds, generation, values)
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ) -> User:
+    """
+    The user a bearer token belongs to. Users are cached in-process for
+    `user_cache_ttl_seconds` (and dropped in every worker as soon as they are
+    updated or deleted through the ORM), so a request with a warm cache
+    doesn't touch the database. Tokens whose username or admin claim no
+    longer match the user are rejected.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -50,12 +345,32 @@ def get_current_user(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
+        user_id = payload.get("uid")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if user is None or not user.is_active:
+    generation = _cache_generation()
+    user = _cached_user(user_id, generation) if isinstance(user_id, int) else None
+    if user is None:
+        query = db.query(User)
+        # Tokens issued before the uid claim are looked up by username
+        if isinstance(user_id, int):
+            user = query.filter(User.id == user_id).first()
+        else:
+            user = query.filter(User.username == username).first()
+        if user is not None:
+            _cache_user(user, generation)
+
+    if user is None or not user.is_active or user.username != username:
+        raise credentials_exception
+    if "adm" in payload and payload["adm"] != bool(user.is_admin):
         raise credentials_exception
     return user
+
+
+def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
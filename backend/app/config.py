@@ -1,11 +1,117 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     anthropic_api_key: str
     database_url: str
     secret_key: str = "dev-secret-key"
+    # Processes serving the app (gunicorn.conf.py sets it to the worker count)
+    web_workers: int = 1
+    # Authenticated users are cached per process for this long (0 disables);
+    # with several workers only when SHARED_STATE_URL shares invalidations
+    user_cache_ttl_seconds: float = 60.0
+
+    # Password hashing runs in a bounded thread pool; hashes with a different
+    # cost are upgraded on the next successful login
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    # Failed logins allowed per username and (opt-in) per client IP within the
+    # window; behind a proxy the IP limit needs FORWARDED_ALLOW_IPS, or every
+    # client shares the proxy's address
+    login_max_failures_per_user: int = 5
+    login_max_failures_per_ip: Optional[int] = None
+    login_failure_window_seconds: float = 300.0
     debug: bool = True
+    log_level: str = "INFO"
+
+    # Optional Unicode TTF font for PDF reports (core Helvetica otherwise)
+    report_pdf_font: Optional[str] = None
+
+    # Local pre-screening before LLM scoring (disabled when both are unset)
+    prescreen_top_k: Optional[int] = None
+    prescreen_min_score: Optional[float] = None
+
+    # LLM scheduling (shared by all Claude calls in a process)
+    llm_requests_per_minute: int = 50
+    llm_tokens_per_minute: int = 80000
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 5
+    # Processes sharing the limits above (web_workers unless set); each
+    # process gets an equal share of the budgets
+    llm_workers: Optional[int] = None
+    screening_concurrency: int = 4
+
+    # Claude model routing: per-operation models (default llm_model), with
+    # invalid or low-confidence output redone on the escalation model
+    llm_model: str = "claude-sonnet-4-20250514"
+    llm_extract_model: Optional[str] = None
+    llm_parse_model: Optional[str] = "claude-haiku-4-5-20251001"
+    llm_match_model: Optional[str] = None
+    llm_escalation_model: Optional[str] = None
+    llm_escalation_min_confidence: float = 0.6
+
+    # Rule-based personal fields at or above this confidence skip the LLM;
+    # lower-confidence ones are sent to it for verification
+    preparse_min_confidence: float = 0.85
+
+    # CV text sent to the parser is normalised and truncated to this many tokens
+    cv_token_budget: int = 12000
+
+    # PDF text extraction: "pypdf2", "pypdfium2" or "pdfminer" (falls back to
+    # pypdf2 if not installed); long documents are split across processes
+    pdf_backend: str = "pypdfium2"
+    pdf_workers: int = 4
+    pdf_parallel_min_pages: int = 12
+
+    # Document parsing runs in a bounded thread pool; legacy .doc files use the
+    # antiword binary if installed, else the pure-Python OLE reader (olefile)
+    extraction_workers: int = 4
+    antiword_cmd: str = "antiword"
+    doc_timeout_seconds: float = 30.0
+
+    # Every Claude call is recorded in the llm_calls ledger, written in
+    # batches of llm_ledger_batch_size or every llm_ledger_flush_seconds
+    llm_ledger_enabled: bool = True
+    llm_ledger_batch_size: int = 100
+    llm_ledger_flush_seconds: float = 10.0
+
+    # Prometheus metrics at /metrics (off by default), scraped with
+    # "Authorization: Bearer <metrics_token>"; TIMING_SPANS also times the
+    # steps of screening and report generation (app_span_duration_seconds)
+    metrics_enabled: bool = False
+    metrics_token: Optional[str] = None
+    timing_spans: bool = False
+
+    # Event-loop watchdog: callbacks blocking the loop longer than this are
+    # logged with their stack (0 disables); admin profiles are capped at
+    # profiler_max_seconds
+    loop_lag_threshold_ms: float = 250.0
+    profiler_max_seconds: int = 60
+
+    # OpenTelemetry tracing (needs the opentelemetry packages): "otlp" uses the
+    # standard OTEL_EXPORTER_OTLP_* variables, "file" appends JSON lines to
+    # tracing_file
+    tracing_exporter: Optional[str] = None
+    tracing_file: str = "traces.jsonl"
+    tracing_service_name: str = "au-cv-matching-api"
+    tracing_sample_ratio: float = 1.0
+
+    # Shared state for multi-worker deployments: a redis:// URL (any
+    # Redis-compatible server), else PostgreSQL advisory locks, else
+    # in-process locks (single worker only, e.g. SQLite)
+    shared_state_url: Optional[str] = None
+    # Redis lock lease, renewed while the lock is held
+    job_lock_ttl_seconds: float = 60.0
+
+    # OCR for scanned PDF pages (skipped if the tesseract binary is missing)
+    ocr_enabled: bool = True
+    tesseract_cmd: str = "tesseract"
+    ocr_language: str = "eng"
+    ocr_workers: int = 2
+    ocr_max_pages: int = 10
+    ocr_timeout_seconds: float = 60.0
+    ocr_cache_dir: Optional[str] = "uploads/ocr_cache"
 
     class Config:
         env_file = ".env"
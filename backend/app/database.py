@@ -1,20 +1,45 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import get_settings
 
-settings = get_settings()
 
-# Convert postgresql:// to postgresql+psycopg:// for psycopg3 driver
-database_url = settings.database_url
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+@lru_cache()
+def get_engine():
+    """
+    The application engine, created on first use (importing the DB driver
+    and reading settings) rather than at import time.
+    """
+    # Convert postgresql:// to postgresql+psycopg:// for psycopg3 driver
+    database_url = get_settings().database_url
+    if database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+
+    engine = create_engine(database_url)
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
 
-engine = create_engine(database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+
+def __getattr__(name):
+    # `engine` is still importable, but only built when first asked for
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,38 +1,46 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import logging
+import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
-from .auth import get_password_hash
-from .database import engine, Base, SessionLocal
-from .models import User
-from .routes import jobs_router, candidates_router, reports_router, auth_router
-
-
-def seed_admin_user():
-    db = SessionLocal()
-    try:
-        existing = db.query(User).filter(User.is_admin == True).first()
-        if not existing:
-            admin = User(
-                username="admin",
-                email="admin@au.int",
-                hashed_password=get_password_hash("admin123"),
-                full_name="System Administrator",
-                is_active=True,
-                is_admin=True,
-            )
-            db.add(admin)
-            db.commit()
-    finally:
-        db.close()
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+
+from .config import get_settings
+from .metrics import REQUEST_SECONDS, instrument_database, render_metrics, scrape_authorized
+from .profiling import LoopLagMonitor
+from .tracing import setup_tracing
+from .routes import (
+    jobs_router, candidates_router, reports_router, auth_router, policies_router, admin_router, llm_usage_router
+)
+from .services import shared_state
+from .services.llm_ledger import get_llm_ledger
+
+settings = get_settings()
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Tables and the default admin are created by `python -m app.migrate`, which
+# runs once per deploy rather than on every worker start
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    seed_admin_user()
+    if settings.web_workers > 1:
+        # Fail at startup, not on the first screening, if workers can't share locks
+        shared_state.backend()
+    monitor = LoopLagMonitor(settings.loop_lag_threshold_ms / 1000).start() if settings.loop_lag_threshold_ms else None
+    if settings.llm_ledger_enabled:
+        get_llm_ledger().start()
     yield
-
+    if settings.llm_ledger_enabled:
+        # Write the ledger entries still buffered in this worker
+        await get_llm_ledger().stop()
+    if monitor:
+        await monitor.stop()
 
 app = FastAPI(
     title="African Union CV Matching System",
@@ -59,6 +67,9 @@ app = FastAPI(
     ## Cutoff Scores
     - P5 and above: 70%
     - P4 and below: 60%
+
+    Weights, bonuses, cutoffs and the longlist size above are the defaults of
+    the versioned scoring policy (`/api/policies`).
     """,
     version="1.0.0",
     lifespan=lifespan
@@ -73,11 +84,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+setup_tracing(app)
+
+if settings.metrics_enabled:
+    instrument_database()
+
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next):
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Route templates, not raw paths, keep label cardinality bounded
+            route = request.scope.get("route")
+            REQUEST_SECONDS.labels(
+                request.method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - started)
+
+    if not settings.metrics_token:
+        logger.warning(
+            "METRICS_ENABLED without METRICS_TOKEN: /metrics is unauthenticated, keep it off public routes"
+        )
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics(authorization: Optional[str] = Header(None)):
+        if not scrape_authorized(authorization):
+            raise HTTPException(
+                status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"}
+            )
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
+
 # Include routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(jobs_router, prefix="/api")
 app.include_router(candidates_router, prefix="/api")
 app.include_router(reports_router, prefix="/api")
+app.include_router(policies_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
+app.include_router(llm_usage_router, prefix="/api")
 
 
 @app.get("/")
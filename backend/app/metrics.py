@@ -0,0 +1,176 @@
+"""
+Prometheus metrics and span-style timing hooks.
+
+Metrics are served at /metrics when METRICS_ENABLED is set, behind
+METRICS_TOKEN. Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory so every worker's samples are aggregated.
+"""
+import asyncio
+import functools
+import hmac
+import logging
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+from .tracing import trace_span
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds: fast DB queries up to multi-minute LLM calls and screenings
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+_TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+_PAGE_BUCKETS = (1, 2, 3, 5, 8, 12, 20, 30, 50, 100)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], buckets=_SLOW_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram(
+    "llm_call_duration_seconds", "Claude call latency per ClaudeService operation",
+    ["operation", "model"], buckets=_SLOW_BUCKETS
+)
+LLM_CALL_TOKENS = Histogram(
+    "llm_call_tokens", "Tokens per Claude call", ["operation", "model", "kind"], buckets=_TOKEN_BUCKETS
+)
+LLM_RETRIES = Counter("llm_call_retries_total", "Retried Claude calls", ["operation"])
+LLM_PARSE_OUTCOMES = Counter(
+    "llm_parse_outcomes_total", "Structured-output repairs, failures, retries and escalations",
+    ["operation", "outcome"]
+)
+LLM_QUEUED = Gauge("llm_calls_queued", "Claude calls waiting for admission", multiprocess_mode="livesum")
+LLM_ACTIVE = Gauge("llm_calls_active", "Claude calls in flight", multiprocess_mode="livesum")
+EXTRACTION_SECONDS = Histogram(
+    "cv_extraction_duration_seconds", "CV text extraction time by detected format",
+    ["format"], buckets=_SLOW_BUCKETS
+)
+EXTRACTION_PAGES = Histogram("cv_extraction_pages", "Pages per extracted PDF CV", buckets=_PAGE_BUCKETS)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "Database statement time by statement type",
+    ["statement"], buckets=_FAST_BUCKETS
+)
+REPORT_RENDER_SECONDS = Histogram(
+    "report_render_duration_seconds", "Report build and render time (cache misses)",
+    ["report", "format"], buckets=_SLOW_BUCKETS
+)
+SCREENING_QUEUED = Gauge(
+    "screening_candidates_queued", "Candidates waiting for a screening slot", multiprocess_mode="livesum"
+)
+SCREENING_ACTIVE = Gauge(
+    "screening_candidates_active", "Candidates being parsed or scored", multiprocess_mode="livesum"
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop heartbeat woke up", buckets=_FAST_BUCKETS
+)
+SPAN_SECONDS = Histogram(
+    "app_span_duration_seconds", "Timed steps in MatchingService and ReportService (TIMING_SPANS)",
+    ["span"], buckets=_SLOW_BUCKETS
+)
+
+_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def scrape_authorized(authorization: Optional[str]) -> bool:
+    """Whether a scrape's Authorization header carries METRICS_TOKEN (always, if no token is set)"""
+    if not settings.metrics_token:
+        return True
+    expected = f"Bearer {settings.metrics_token}".encode()
+    return hmac.compare_digest((authorization or "").encode(), expected)
+
+
+def render_metrics():
+    """(body, content type) for a scrape, aggregated across workers if multiprocess"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    verb = statement.lstrip()[:6].upper()
+    DB_QUERY_SECONDS.labels(verb if verb in _STATEMENTS else "OTHER").observe(time.perf_counter() - started)
+
+
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_database():
+    """Time statements on every engine (including ones created later)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+@asynccontextmanager
+async def screening_slot(semaphore: asyncio.Semaphore):
+    """Acquire a screening slot, tracking queued and active candidates"""
+    SCREENING_QUEUED.inc()
+    try:
+        await semaphore.acquire()
+    finally:
+        SCREENING_QUEUED.dec()
+    SCREENING_ACTIVE.inc()
+    try:
+        yield
+    finally:
+        SCREENING_ACTIVE.dec()
+        semaphore.release()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block as `name` when TIMING_SPANS is enabled, and trace it when
+    tracing is on; otherwise free
+    """
+    with trace_span(name, **attributes):
+        if not settings.timing_spans:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            SPAN_SECONDS.labels(name).observe(elapsed)
+            logger.debug("span %s %.1fms", name, elapsed * 1000)
+
+
+def timed(name: str):
+    """Decorator form of `span` for sync and async methods"""
+    def decorate(function):
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,123 @@
+"""
+Schema migrations and seed data. Run once per deploy, before starting the app:
+
+    python -m app.migrate
+
+Migrations are Alembic revisions in backend/alembic/versions; new schema
+changes need a revision there (`alembic revision --autogenerate -m ...` from
+the backend directory).
+"""
+import logging
+import os
+
+from sqlalchemy import inspect
+
+from .auth import get_password_hash
+from .config import get_settings
+from .database import SessionLocal, get_engine
+from .models import Candidate, User
+from .services.scoring_policy import ScoringPolicyService
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The schema of databases created with create_all before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    return config
+
+
+def upgrade_schema():
+    """`alembic upgrade head`, adopting unversioned databases at the baseline first"""
+    from alembic import command
+
+    config = alembic_config()
+    tables = set(inspect(get_engine()).get_table_names())
+    if "jobs" in tables and "alembic_version" not in tables:
+        # Later revisions skip columns and tables create_all already added
+        logger.info("unversioned database, stamping baseline revision %s", BASELINE_REVISION)
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+def seed_admin_user():
+    db = SessionLocal()
+    try:
+        existing = db.query(User).filter(User.is_admin == True).first()
+        if not existing:
+            admin = User(
+                username="admin",
+                email="admin@au.int",
+                hashed_password=get_password_hash("admin123"),
+                full_name="System Administrator",
+                is_active=True,
+                is_admin=True,
+            )
+            db.add(admin)
+            db.commit()
+            logger.info("created default admin user")
+    finally:
+        db.close()
+
+
+def seed_scoring_policy():
+    db = SessionLocal()
+    try:
+        ScoringPolicyService.seed_default(db)
+    finally:
+        db.close()
+
+
+def backfill_search_fields(batch_size: int = 500) -> int:
+    """
+    Fill search_text and highest_degree_level for candidates parsed before
+    those fields existed; refreshed rows get a non-NULL search_text, so this
+    only does work once
+    """
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            candidates = db.query(Candidate).filter(
+                Candidate.search_text.is_(None), Candidate.id > last_id
+            ).order_by(Candidate.id).limit(batch_size).all()
+            if not candidates:
+                break
+            for candidate in candidates:
+                # Unparsed candidates get empty fields; parsing refreshes them
+                candidate.refresh_search_fields()
+            db.commit()
+            updated += len(candidates)
+            last_id = candidates[-1].id
+    finally:
+        db.close()
+    if updated:
+        logger.info("backfilled search fields for %d candidates", updated)
+    return updated
+
+
+def migrate():
+    """
+    Apply pending migrations, backfill derived fields and seed the default
+    admin and scoring policy; safe to run repeatedly
+    """
+    upgrade_schema()
+    backfill_search_fields()
+    seed_admin_user()
+    seed_scoring_policy()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=get_settings().log_level.upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    migrate()
+    logger.info("database is up to date")
@@ -1,6 +1,10 @@
 from .job import Job
 from .candidate import Candidate
-from .match_result import MatchResult
+from .match_result import MatchResult, ScreeningStatus
 from .user import User
+from .scoring_policy import ScoringPolicy
+from .llm_call import LLMCall
+from .login_failure import LoginFailure
 
-__all__ = ["Job", "Candidate", "MatchResult", "User"]
+__all__ = ["Job", "Candidate", "MatchResult", "ScreeningStatus", "User", "ScoringPolicy", "LLMCall",
+           "LoginFailure"]
@@ -1,9 +1,43 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Date, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Date, ForeignKey, Enum, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 from ..database import Base
 
+# Degree levels from most to least senior, used for the degree facet
+DEGREE_LEVELS = ["PhD", "Masters", "Bachelor", "Diploma", "Certificate"]
+_DEGREE_ALIASES = {
+    "phd": "PhD", "doctor": "PhD", "doctorate": "PhD",
+    "master": "Masters", "masters": "Masters", "msc": "Masters", "mba": "Masters", "ma": "Masters",
+    "bachelor": "Bachelor", "bachelors": "Bachelor", "bsc": "Bachelor", "ba": "Bachelor", "licence": "Bachelor",
+    "diploma": "Diploma",
+    "certificate": "Certificate",
+}
+
+
+def normalize_degree_level(value: str):
+    """Map free-text degree levels such as "Master's" onto DEGREE_LEVELS"""
+    if not value:
+        return None
+    key = "".join(ch for ch in value.lower() if ch.isalpha())
+    for alias, level in _DEGREE_ALIASES.items():
+        # Short abbreviations must match exactly ("ma" is not "management")
+        if key == alias or (len(alias) > 3 and key.startswith(alias)):
+            return level
+    return None
+
+
+def _search_document(full_name, search_text, cv_raw_text):
+    """PostgreSQL tsvector over a candidate; must match the GIN index expression"""
+    # Literal SQL (not bound parameters) so prepared queries still match the index
+    empty, space = literal_column("''"), literal_column("' '")
+    return func.to_tsvector(
+        literal_column("'english'::regconfig"),
+        func.coalesce(full_name, empty) + space
+        + func.coalesce(search_text, empty) + space
+        + func.coalesce(cv_raw_text, empty)
+    )
+
 
 class Gender(str, enum.Enum):
     MALE = "male"
@@ -47,13 +81,44 @@ class Candidate(Base):
     # Full parsed data from Claude
     parsed_cv_data = Column(JSON, default=dict)
 
+    # Search fields (see refresh_search_fields)
+    search_text = Column(Text)  # Flattened skills, education and certifications
+    highest_degree_level = Column(String(50), index=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_candidates_nationality", nationality),
+        Index(
+            "ix_candidates_search_document",
+            _search_document(full_name, search_text, cv_raw_text),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # Relationships
     job = relationship("Job", back_populates="candidates")
-    match_result = relationship("MatchResult", back_populates="candidate", uselist=False)
+    # One result per job the candidate has been matched against (own job plus talent-pool matches)
+    match_results = relationship("MatchResult", back_populates="candidate")
+
+    def refresh_search_fields(self):
+        """Recompute the denormalised fields used by candidate search"""
+        from ..services.text_index import flatten_text
+
+        self.search_text = " ".join(
+            part for part in (
+                flatten_text(self.skills),
+                flatten_text(self.education),
+                flatten_text(self.certifications),
+            ) if part
+        )
+        levels = {
+            normalize_degree_level(entry.get("degree_level") or entry.get("degree"))
+            for entry in (self.education or []) if isinstance(entry, dict)
+        }
+        self.highest_degree_level = next((level for level in DEGREE_LEVELS if level in levels), None)
 
     @property
     def age(self):
@@ -64,3 +129,8 @@ class Candidate(Base):
         return today.year - self.date_of_birth.year - (
             (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
         )
+
+
+def search_document():
+    """Full-text document expression used by search queries"""
+    return _search_document(Candidate.full_name, Candidate.search_text, Candidate.cv_raw_text)
@@ -45,8 +45,8 @@ class Job(Base):
     # Experience criteria (7 items, 70% weight)
     experience_criteria = Column(JSON, default=list)
 
-    # Minimum pass mark based on grade
-    min_pass_mark = Column(Integer, default=60)  # 70 for P5+, 60 for P4-
+    # Minimum pass mark, set from the scoring policy for the grade
+    min_pass_mark = Column(Integer, default=60)  # 70 for P5+, 60 for P4- by default
 
     status = Column(Enum(JobStatus), default=JobStatus.DRAFT)
 
@@ -61,7 +61,5 @@ class Job(Base):
 
     @property
     def cutoff_score(self):
-        """Return cutoff score based on grade level"""
-        if self.grade_level in [GradeLevel.P5, GradeLevel.P6, GradeLevel.D1, GradeLevel.D2]:
-            return 70
-        return 60
+        """Return the job's pass mark (set from the scoring policy for its grade)"""
+        return self.min_pass_mark
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, Index
+from sqlalchemy.sql import func
+
+from ..database import Base
+
+
+class LLMCall(Base):
+    """
+    One Claude call in the cost and latency ledger. Rows are written in
+    batches by LLMLedger; job and candidate ids are plain columns, not
+    foreign keys, so the ledger outlives deleted jobs.
+    """
+    __tablename__ = "llm_calls"
+    __table_args__ = (
+        Index("ix_llm_calls_job_operation", "job_id", "operation"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    operation = Column(String(40), nullable=False, index=True)
+    job_id = Column(Integer, nullable=True)
+    candidate_id = Column(Integer, nullable=True)
+    model = Column(String(64), nullable=False)
+
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    cache_creation_input_tokens = Column(Integer, default=0)
+    cache_read_input_tokens = Column(Integer, default=0)
+    cost_usd = Column(Float, default=0.0)
+
+    # latency_ms: the final API attempt; wall_ms: from first queueing to the
+    # result, including rate-limit waits and retry backoff
+    latency_ms = Column(Integer, default=0)
+    wall_ms = Column(Integer, default=0)
+    retries = Column(SmallInteger, default=0)
+    error = Column(String(64), nullable=True)  # Exception class of a failed call
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+
+from ..database import Base
+
+
+class LoginFailure(Base):
+    """
+    A failed login attempt against a throttle key ("user:<name>" or
+    "ip:<address>"), shared by all workers when the database is PostgreSQL.
+    Rows older than the throttle window are pruned as new failures arrive.
+    """
+    __tablename__ = "login_failures"
+    __table_args__ = (
+        Index("ix_login_failures_key_failed_at", "key", "failed_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(300), nullable=False)
+    failed_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,15 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Float, Boolean, ForeignKey, Enum, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import enum
 from ..database import Base
 
 
+class ScreeningStatus(str, enum.Enum):
+    SCORED = "scored"  # Fully scored by the LLM
+    PRESCREEN_REJECTED = "prescreen_rejected"  # Rejected by local pre-screening, never sent to the LLM
+
+
 class MatchResult(Base):
     __tablename__ = "match_results"
+    # A candidate can be matched against several jobs (talent pool), once per job
+    __table_args__ = (
+        UniqueConstraint("job_id", "candidate_id", name="uq_match_results_job_candidate"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
-    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False, unique=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False, index=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False, index=True)
 
     # Education Scores (30% weight, 3 criteria)
     education_scores = Column(JSON, default=dict)
@@ -46,6 +56,11 @@ class MatchResult(Base):
     is_in_longlist = Column(Boolean, default=False)  # Top 20
     passes_cutoff = Column(Boolean, default=False)  # Meets minimum score
 
+    # Pre-screening
+    screening_status = Column(Enum(ScreeningStatus), default=ScreeningStatus.SCORED)
+    prescreen_score = Column(Float, nullable=True)  # Local relevance score (0-1)
+    policy_version = Column(Integer, nullable=True)  # ScoringPolicy.version the scores were computed under
+
     # AI Analysis
     overall_reasoning = Column(Text)  # Detailed explanation of the score
     strengths = Column(JSON, default=list)  # List of candidate strengths
@@ -62,7 +77,7 @@ class MatchResult(Base):
 
     # Relationships
     job = relationship("Job", back_populates="match_results")
-    candidate = relationship("Candidate", back_populates="match_result")
+    candidate = relationship("Candidate", back_populates="match_results")
 
     def calculate_total_bonus(self):
         """Calculate total bonus points"""
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean
+from datetime import datetime
+from ..database import Base
+
+
+class ScoringPolicy(Base):
+    """
+    A versioned set of scoring rules (weights, bonuses, pass marks, longlist
+    size). Versions are immutable; exactly one is active at a time.
+    """
+    __tablename__ = "scoring_policies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(Integer, unique=True, index=True, nullable=False)
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    config = Column(JSON, nullable=False)  # ScoringPolicyConfig
+    is_active = Column(Boolean, default=False, index=True)
+    created_by = Column(String(100), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,302 @@
+"""
+Production diagnosis: an on-demand sampling profiler and an event-loop lag
+watchdog. Both are pure Python (sys._current_frames) and only ever see the
+worker process they run in.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_settings
+from .metrics import EVENT_LOOP_LAG
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# (function, file, first line)
+Frame = Tuple[str, str, int]
+
+# Top frames of threads that are waiting, not working
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("selectors.py", "EpollSelector.select"),
+    ("selectors.py", "KqueueSelector.select"),
+    ("selectors.py", "PollSelector.select"),
+    ("selectors.py", "SelectSelector.select"),
+    ("threading.py", "Condition.wait"),
+    ("threading.py", "Event.wait"),
+    ("threading.py", "Thread._wait_for_tstate_lock"),
+    ("thread.py", "_worker"),
+    ("queue.py", "Queue.get"),
+    ("connection.py", "wait"),
+}
+
+# Innermost matching frame decides the stage: (stage, qualname prefixes, path fragments)
+_STAGES = [
+    ("database", (), (f"{os.sep}sqlalchemy{os.sep}", f"{os.sep}psycopg{os.sep}")),
+    ("cv_extraction", ("CVParser.", "OCRService."), ("pdf_extraction.py", "doc_extraction.py")),
+    ("report", ("ReportService.",), ()),
+    ("claude", ("ClaudeService.", "LLMScheduler."), ()),
+    ("scoring", ("MatchingService.", "CompiledPolicy.", "PrescreenService."), ()),
+    ("auth", (), (f"app{os.sep}auth.py",)),
+]
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """A profile is already being taken in this process"""
+
+
+def _frame_key(frame) -> Frame:
+    code = frame.f_code
+    return getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno
+
+
+def _stack(frame) -> Tuple[Frame, ...]:
+    """Root-first stack of a thread's current frame"""
+    frames = []
+    while frame is not None:
+        frames.append(_frame_key(frame))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+def _is_idle(stack: Tuple[Frame, ...]) -> bool:
+    if not stack:
+        return True
+    name, path, _ = stack[-1]
+    return (os.path.basename(path), name) in _IDLE_FRAMES
+
+
+def stage_of(stack: Tuple[Frame, ...]) -> str:
+    for name, path, _ in reversed(stack):
+        for stage, prefixes, fragments in _STAGES:
+            if prefixes and name.startswith(prefixes):
+                return stage
+            if any(fragment in path for fragment in fragments):
+                return stage
+    return "other"
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's stack at a fixed interval from a background
+    thread. Identical stacks are aggregated, so memory stays bounded by the
+    number of distinct stacks rather than the duration.
+    """
+
+    def __init__(self, interval: float, loop_thread_id: Optional[int] = None, include_idle: bool = False):
+        self.interval = interval
+        self.loop_thread_id = loop_thread_id
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()  # (thread name, stack) -> count
+        self.idle: Counter = Counter()  # thread name -> idle samples
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def _thread_name(self, thread_id: int, names: Dict[int, str]) -> str:
+        name = names.get(thread_id, f"thread-{thread_id}")
+        return f"{name} (event loop)" if thread_id == self.loop_thread_id else name
+
+    def run(self, seconds: float):
+        """Sample for `seconds`; blocks the calling thread"""
+        me = threading.get_ident()
+        self.started = time.perf_counter()
+        deadline = self.started + seconds
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                thread = self._thread_name(thread_id, names)
+                stack = _stack(frame)
+                if _is_idle(stack):
+                    self.idle[thread] += 1
+                    if not self.include_idle:
+                        continue
+                self.samples[(thread, stack)] += 1
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(self.interval, remaining))
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self, top: int = 25) -> Dict[str, Any]:
+        """Busy seconds by stage, by thread and for the event loop, plus the hottest functions"""
+        stages: Counter = Counter()
+        threads: Counter = Counter()
+        loop_stages: Counter = Counter()
+        self_time: Counter = Counter()
+        total_time: Counter = Counter()
+        for (thread, stack), count in self.samples.items():
+            if _is_idle(stack):
+                continue
+            stage = stage_of(stack)
+            stages[stage] += count
+            threads[thread] += count
+            if thread.endswith("(event loop)"):
+                loop_stages[stage] += count
+            if stack:
+                self_time[stack[-1]] += count
+            for frame in set(stack):
+                total_time[frame] += count
+
+        def seconds(count: int) -> float:
+            return round(count * self.interval, 3)
+
+        loop_idle = sum(count for thread, count in self.idle.items() if thread.endswith("(event loop)"))
+        return {
+            "duration_s": round(self.elapsed, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": sum(self.samples.values()),
+            "stages_s": {stage: seconds(count) for stage, count in stages.most_common()},
+            "event_loop": {
+                "busy_s": seconds(sum(loop_stages.values())),
+                "idle_s": seconds(loop_idle),
+                "stages_s": {stage: seconds(count) for stage, count in loop_stages.most_common()},
+            },
+            "threads_busy_s": {thread: seconds(count) for thread, count in threads.most_common()},
+            "top_functions": [
+                {
+                    "function": name,
+                    "file": f"{path}:{line}",
+                    "self_s": seconds(count),
+                    "total_s": seconds(total_time[(name, path, line)]),
+                }
+                for (name, path, line), count in self_time.most_common(top)
+            ],
+        }
+
+    def collapsed(self) -> str:
+        """Folded stacks ("thread;root;...;leaf count"), for flamegraph.pl or speedscope"""
+        lines = []
+        for (thread, stack), count in self.samples.most_common():
+            names = [thread.replace(";", ",")] + [name for name, _, _ in stack]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, Any]:
+        """A speedscope.app file: one sampled profile per thread"""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for (thread, stack), count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    name, path, line = frame
+                    frames.append({"name": name, "file": path, "line": line})
+                indices.append(frame_index[frame])
+            profile = profiles.setdefault(thread, {
+                "type": "sampled", "name": thread, "unit": "seconds",
+                "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+            })
+            profile["samples"].append(indices)
+            profile["weights"].append(count * self.interval)
+        for profile in profiles.values():
+            profile["endValue"] = sum(profile["weights"])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"AU CV Matching profile ({self.elapsed:.1f}s, pid {os.getpid()})",
+            "exporter": "app.profiling",
+            "shared": {"frames": frames},
+            "profiles": sorted(profiles.values(), key=lambda p: -p["endValue"]),
+        }
+
+
+async def profile(seconds: float, interval: float, include_idle: bool = False) -> SamplingProfiler:
+    """
+    Profile this process for `seconds` without blocking the event loop.
+    Raises ProfilerBusy if another profile is running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    profiler = SamplingProfiler(interval, loop_thread_id=threading.get_ident(), include_idle=include_idle)
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+
+    def run():
+        # The lock is held until sampling ends, even if the request is cancelled
+        try:
+            profiler.run(seconds)
+        finally:
+            _profile_lock.release()
+            loop.call_soon_threadsafe(lambda: done.done() or done.set_result(None))
+
+    # A dedicated thread, not the default executor, which may be saturated
+    try:
+        threading.Thread(target=run, name="profiler", daemon=True).start()
+    except BaseException:
+        _profile_lock.release()
+        raise
+    await done
+    return profiler
+
+
+class LoopLagMonitor:
+    """
+    Detects callbacks that block the event loop. A heartbeat task measures
+    how late each tick wakes up; a watchdog thread notices a stalled
+    heartbeat while the loop is still blocked and logs the loop thread's
+    stack, which names the blocking code.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.interval = max(threshold / 2, 0.01)
+        self._beat = time.monotonic()
+        self._reported = False
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread_id: Optional[int] = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._beat = now
+            EVENT_LOOP_LAG.observe(lag)
+            if lag > self.threshold:
+                logger.warning("event loop blocked for %.0fms", lag * 1000)
+            self._reported = False
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            stalled = time.monotonic() - self._beat
+            if stalled <= self.threshold + self.interval or self._reported:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._reported = True
+            logger.warning(
+                "event loop blocked for over %.0fms in:\n%s",
+                stalled * 1000, "".join(traceback.format_stack(frame)).rstrip()
+            )
+
+    def start(self) -> "LoopLagMonitor":
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True).start()
+        return self
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
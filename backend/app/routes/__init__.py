@@ -2,5 +2,11 @@ from .jobs import router as jobs_router
 from .candidates import router as candidates_router
 from .reports import router as reports_router
 from .auth import router as auth_router
+from .policies import router as policies_router
+from .admin import router as admin_router
+from .llm_usage import router as llm_usage_router
 
-__all__ = ["jobs_router", "candidates_router", "reports_router", "auth_router"]
+__all__ = [
+    "jobs_router", "candidates_router", "reports_router", "auth_router", "policies_router", "admin_router",
+    "llm_usage_router"
+]
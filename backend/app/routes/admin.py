@@ -0,0 +1,42 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from ..auth import get_current_admin
+from ..config import get_settings
+from ..profiling import ProfilerBusy, profile
+
+settings = get_settings()
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin)])
+
+
+@router.post("/profile")
+async def run_profiler(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed|summary)$"),
+    include_idle: bool = False
+):
+    """
+    Sample every thread of this worker for `seconds` and return a speedscope
+    profile, folded stacks for flamegraph.pl, or a summary of busy time by
+    stage (CV extraction, reports, scoring, Claude, database, event loop).
+    """
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.profiler_max_seconds}")
+    try:
+        profiler = await profile(seconds, interval_ms / 1000, include_idle=include_idle)
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profile is already running in this worker")
+
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    if format == "summary":
+        return profiler.summary()
+    return Response(
+        json.dumps(profiler.speedscope()),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="profile.speedscope.json"'}
+    )
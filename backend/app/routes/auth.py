@@ -1,33 +1,63 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from ..auth import verify_password, create_access_token, get_current_user
+from ..auth import (
+    create_access_token, get_current_user, token_claims, verify_password_async,
+    get_password_hash_async, password_needs_rehash, get_login_throttle
+)
+from ..config import get_settings
 from ..database import get_db
 from ..models import User
 from ..schemas import Token, UserResponse
 
+settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user_key = f"user:{form_data.username.lower()}"
+    limits = [(user_key, settings.login_max_failures_per_user)]
+    if settings.login_max_failures_per_ip:
+        # Only meaningful when the client address is real (FORWARDED_ALLOW_IPS behind a proxy)
+        ip_key = f"ip:{request.client.host if request.client else 'unknown'}"
+        limits.append((ip_key, settings.login_max_failures_per_ip))
+    login_throttle = get_login_throttle()
+    retry_after = await login_throttle.retry_after(limits)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    # Sync DB calls go to the threadpool, off the event loop
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.username == form_data.username).first())
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
+        await login_throttle.record_failure([key for key, _ in limits])
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await login_throttle.reset(user_key)
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled",
         )
-    access_token = create_access_token(data={"sub": user.username})
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(form_data.password)
+        await run_in_threadpool(db.commit)
+    access_token = create_access_token(data=token_claims(user))
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import os
 import shutil
 from datetime import datetime
 
 from ..auth import get_current_user
+from ..config import get_settings
 from ..database import get_db
-from ..models import Job, Candidate, MatchResult
+from ..models import Job, Candidate, MatchResult, ScreeningStatus
 from ..schemas import (
-    CandidateResponse, MatchResultResponse, ProcessCandidatesResponse
+    CandidateResponse, MatchResultResponse, ProcessCandidatesResponse,
+    CandidateSearchResponse, TalentPoolMatchResponse, Gender
 )
-from ..services import CVParser, MatchingService
+from ..services import CVParser, MatchingService, CandidateSearchService
+from ..services.shared_state import LockUnavailable, job_screening_lock
+
+settings = get_settings()
 
 router = APIRouter(prefix="/candidates", tags=["candidates"], dependencies=[Depends(get_current_user)])
 
@@ -20,6 +25,32 @@ UPLOAD_DIR = "uploads/cvs"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
+@router.get("/search", response_model=CandidateSearchResponse)
+def search_candidates(
+    q: str = "",
+    job_id: Optional[int] = None,
+    nationality: Optional[str] = None,
+    gender: Optional[Gender] = None,
+    degree_level: Optional[str] = None,
+    skill: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over all candidates' CVs, skills, education and certifications"""
+    search_service = CandidateSearchService(db)
+    return search_service.search(
+        q=q,
+        job_id=job_id,
+        nationality=nationality,
+        gender=gender.value if gender else None,
+        degree_level=degree_level,
+        skill=skill,
+        page=page,
+        page_size=page_size
+    )
+
+
 @router.post("/{job_id}/upload", status_code=status.HTTP_201_CREATED)
 async def upload_cv(
     job_id: int,
@@ -148,8 +179,18 @@ async def upload_cvs_bulk(
 
 
 @router.post("/{job_id}/process-all", response_model=ProcessCandidatesResponse)
-async def process_all_candidates(job_id: int, db: Session = Depends(get_db)):
-    """Process and match all candidates for a job"""
+async def process_all_candidates(
+    job_id: int,
+    prescreen_top_k: Optional[int] = None,
+    prescreen_min_score: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Process and match all candidates for a job.
+
+    Optionally pre-screen locally so only the top-K candidates, or those with
+    a relevance score of at least `prescreen_min_score`, are sent to Claude.
+    """
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -164,16 +205,66 @@ async def process_all_candidates(job_id: int, db: Session = Depends(get_db)):
     if not candidates:
         raise HTTPException(status_code=400, detail="No candidates found for this job")
 
+    if prescreen_top_k is None:
+        prescreen_top_k = settings.prescreen_top_k
+    if prescreen_min_score is None:
+        prescreen_min_score = settings.prescreen_min_score
+
     matching_service = MatchingService(db)
-    results = await matching_service.process_all_candidates(job_id)
+    try:
+        async with job_screening_lock(job_id):
+            results = await matching_service.process_all_candidates(
+                job_id,
+                prescreen_top_k=prescreen_top_k,
+                prescreen_min_score=prescreen_min_score
+            )
+    except LockUnavailable:
+        raise HTTPException(status_code=409, detail="Screening is already running for this job")
 
     longlist_count = sum(1 for r in results if r.is_in_longlist)
+    rejected_count = sum(
+        1 for r in results if r.screening_status == ScreeningStatus.PRESCREEN_REJECTED
+    )
 
     return ProcessCandidatesResponse(
         message="All candidates processed and matched",
         job_id=job_id,
         candidates_processed=len(results),
-        longlist_count=longlist_count
+        longlist_count=longlist_count,
+        prescreen_rejected=rejected_count
+    )
+
+
+@router.post("/{job_id}/match-talent-pool", response_model=TalentPoolMatchResponse)
+async def match_talent_pool(
+    job_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Match already-parsed candidates from other jobs against this job"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if not job.education_criteria or not job.experience_criteria:
+        raise HTTPException(
+            status_code=400,
+            detail="Job criteria not yet extracted. Process the job first."
+        )
+
+    matching_service = MatchingService(db)
+    try:
+        async with job_screening_lock(job_id):
+            outcome = await matching_service.match_from_talent_pool(job_id, limit=limit)
+    except LockUnavailable:
+        raise HTTPException(status_code=409, detail="Screening is already running for this job")
+
+    return TalentPoolMatchResponse(
+        message="Talent pool candidates matched",
+        job_id=job_id,
+        pool_size=outcome["pool_size"],
+        shortlisted=outcome["shortlisted"],
+        longlist_count=sum(1 for r in outcome["results"] if r.is_in_longlist)
     )
 
 
@@ -232,6 +323,9 @@ def get_match_results(
             "rank": result.rank,
             "is_in_longlist": result.is_in_longlist,
             "passes_cutoff": result.passes_cutoff,
+            "screening_status": result.screening_status.value if result.screening_status else None,
+            "prescreen_score": result.prescreen_score,
+            "policy_version": result.policy_version,
             "overall_reasoning": result.overall_reasoning,
             "strengths": result.strengths or [],
             "weaknesses": result.weaknesses or [],
@@ -273,6 +367,9 @@ def get_single_result(result_id: int, db: Session = Depends(get_db)):
         rank=result.rank,
         is_in_longlist=result.is_in_longlist,
         passes_cutoff=result.passes_cutoff,
+        screening_status=result.screening_status.value if result.screening_status else None,
+        prescreen_score=result.prescreen_score,
+        policy_version=result.policy_version,
         overall_reasoning=result.overall_reasoning,
         strengths=result.strengths or [],
         weaknesses=result.weaknesses or [],
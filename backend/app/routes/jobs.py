@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
+from contextlib import nullcontext
+import json
 
 from ..auth import get_current_user
 from ..database import get_db
@@ -8,10 +12,12 @@ from ..models import Job, Candidate, MatchResult
 from ..schemas import (
     JobCreate, JobUpdate, JobResponse, JobListResponse,
     ProcessJobResponse, StatisticsResponse,
-    ExtractRequest, ExtractResponse
+    ExtractRequest, ExtractResponse, WhatIfRequest, WhatIfResponse
 )
 from ..services import MatchingService, CVParser
 from ..services.claude_service import ClaudeService
+from ..services.scoring_policy import CompiledPolicy, ScoringPolicyService
+from ..services.shared_state import LockUnavailable, job_screening_lock
 
 router = APIRouter(prefix="/jobs", tags=["jobs"], dependencies=[Depends(get_current_user)])
 
@@ -52,6 +58,32 @@ async def extract_job_data(request: ExtractRequest):
         raise HTTPException(status_code=400, detail=f"Failed to extract job data: {str(e)}")
 
 
+@router.post("/extract/stream")
+async def stream_job_data(request: ExtractRequest):
+    """
+    Streaming variant of /extract as server-sent events: a `field` event per
+    metadata field and a `criterion` event per criterion as they arrive, then
+    `done` with the full ExtractResponse (or `error`).
+    """
+    claude_service = ClaudeService()
+
+    async def events():
+        try:
+            async for event, data in claude_service.stream_job_criteria(request.raw_jd_text):
+                if event == "done":
+                    data = ExtractResponse(**data).model_dump()
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            detail = {"detail": f"Failed to extract job data: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(detail)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     """Create a new job and extract criteria from job description"""
@@ -82,10 +114,7 @@ async def create_job(job_data: JobCreate, db: Session = Depends(get_db)):
     if job_data.education_criteria and job_data.experience_criteria:
         job.education_criteria = job_data.education_criteria
         job.experience_criteria = job_data.experience_criteria
-        if job.grade_level.value in ["P5", "P6", "D1", "D2"]:
-            job.min_pass_mark = 70
-        else:
-            job.min_pass_mark = 60
+        job.min_pass_mark = ScoringPolicyService.active(db).pass_mark(job.grade_level)
         job.status = "active"
         db.add(job)
         db.commit()
@@ -145,18 +174,39 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{job_id}", response_model=JobResponse)
-def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get_db)):
-    """Update job details"""
+async def update_job(job_id: int, job_data: JobUpdate, db: Session = Depends(get_db)):
+    """Update job details; edited criteria are re-scored for existing candidates"""
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     update_data = job_data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(job, field, value)
-
-    db.commit()
-    db.refresh(job)
+    for field in ("education_criteria", "experience_criteria"):
+        criteria = update_data.get(field)
+        if criteria is None:
+            update_data.pop(field, None)
+            continue
+        ids = [c.get("id") for c in criteria]
+        if not all(ids) or len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail=f"Every item in {field} needs a unique id")
+
+    rescore = "education_criteria" in update_data or "experience_criteria" in update_data
+    try:
+        # Criteria edits re-score results, so they can't overlap a screening run
+        async with job_screening_lock(job_id) if rescore else nullcontext():
+            old_education, old_experience = job.education_criteria, job.experience_criteria
+            for field, value in update_data.items():
+                setattr(job, field, value)
+
+            db.commit()
+            db.refresh(job)
+
+            if rescore:
+                matching_service = MatchingService(db)
+                await matching_service.rescore_changed_criteria(job, old_education, old_experience)
+                db.refresh(job)
+    except LockUnavailable:
+        raise HTTPException(status_code=409, detail="Screening is already running for this job")
     return job
 
 
@@ -167,8 +217,12 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Delete associated match results and candidates
-    db.query(MatchResult).filter(MatchResult.job_id == job_id).delete()
+    # Delete associated match results and candidates, including talent-pool
+    # results that other jobs hold for this job's candidates
+    job_candidates = db.query(Candidate.id).filter(Candidate.job_id == job_id)
+    db.query(MatchResult).filter(
+        (MatchResult.job_id == job_id) | MatchResult.candidate_id.in_(job_candidates)
+    ).delete(synchronize_session=False)
     db.query(Candidate).filter(Candidate.job_id == job_id).delete()
     db.delete(job)
     db.commit()
@@ -182,7 +236,12 @@ async def process_job(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Job not found")
 
     matching_service = MatchingService(db)
-    job = await matching_service.process_job_description(job)
+    try:
+        # Re-extracted criteria would change under a running screening
+        async with job_screening_lock(job_id):
+            job = await matching_service.process_job_description(job)
+    except LockUnavailable:
+        raise HTTPException(status_code=409, detail="Screening is already running for this job")
 
     return ProcessJobResponse(
         message="Job processed successfully",
@@ -204,6 +263,52 @@ def get_job_statistics(job_id: int, db: Session = Depends(get_db)):
     return StatisticsResponse(**stats)
 
 
+@router.post("/{job_id}/recompute")
+async def recompute_job_scores(job_id: int, db: Session = Depends(get_db)):
+    """Re-apply bonuses, cutoff and ranking to all results locally (no Claude calls)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    matching_service = MatchingService(db)
+    try:
+        # Ranks and totals must not be rewritten while results are being written
+        async with job_screening_lock(job_id):
+            return await run_in_threadpool(matching_service.recompute_job_scores, job_id)
+    except LockUnavailable:
+        raise HTTPException(status_code=409, detail="Screening is already running for this job")
+
+
+@router.post("/{job_id}/what-if", response_model=WhatIfResponse)
+def what_if_job_ranking(job_id: int, request: WhatIfRequest, db: Session = Depends(get_db)):
+    """
+    Re-rank a job under another scoring policy version and/or config
+    overrides, in memory only (nothing is saved, no Claude calls)
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if request.policy_version is not None:
+        base = ScoringPolicyService.get(db, request.policy_version)
+        if base is None:
+            raise HTTPException(status_code=404, detail="Scoring policy not found")
+    else:
+        base = ScoringPolicyService.get_active(db)
+
+    if request.config:
+        try:
+            config = ScoringPolicyService.merge_config(base.config, request.config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid policy config: {str(e)}")
+        policy = CompiledPolicy(None, config)
+    else:
+        policy = ScoringPolicyService.compile(base)
+
+    matching_service = MatchingService(db)
+    return matching_service.what_if(job_id, policy, limit=request.limit)
+
+
 @router.post("/{job_id}/complete")
 def complete_screening(job_id: int, db: Session = Depends(get_db)):
     """Mark job screening as completed"""
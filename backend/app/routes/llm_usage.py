@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..auth import get_current_user
+from ..database import get_db
+from ..models import Job
+from ..services.llm_ledger import LLMCostService
+
+router = APIRouter(prefix="/llm-usage", tags=["llm-usage"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/jobs")
+def get_llm_usage_by_job(
+    days: Optional[int] = Query(None, ge=1),
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("cost", pattern="^(cost|wall_time)$"),
+    db: Session = Depends(get_db)
+):
+    """Jobs ranked by Claude spend or total call time, with p95 call latency"""
+    return {"days": days, "jobs": LLMCostService(db).by_job(days=days, limit=limit, order_by=order_by)}
+
+
+@router.get("/jobs/{job_id}")
+def get_llm_usage_for_job(job_id: int, days: Optional[int] = Query(None, ge=1), db: Session = Depends(get_db)):
+    """Cost and latency of one job's Claude calls, in total and per stage (operation)"""
+    title = db.query(Job.title).filter(Job.id == job_id).scalar()
+    return {**LLMCostService(db).job_summary(job_id, days=days), "title": title}
+
+
+@router.get("/stages")
+def get_llm_usage_by_stage(
+    job_id: Optional[int] = None,
+    days: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db)
+):
+    """Cost and latency per stage (operation) across all jobs, or for one job"""
+    return {"job_id": job_id, "days": days, "stages": LLMCostService(db).by_stage(job_id=job_id, days=days)}
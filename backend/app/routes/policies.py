@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+
+from ..auth import get_current_user, get_current_admin
+from ..database import get_db
+from ..models import ScoringPolicy, User
+from ..schemas import ScoringPolicyCreate, ScoringPolicyResponse
+from ..services.scoring_policy import ScoringPolicyService
+
+router = APIRouter(prefix="/policies", tags=["policies"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/", response_model=List[ScoringPolicyResponse])
+def list_policies(db: Session = Depends(get_db)):
+    """List all scoring policy versions, newest first"""
+    ScoringPolicyService.get_active(db)
+    return db.query(ScoringPolicy).order_by(ScoringPolicy.version.desc()).all()
+
+
+@router.get("/active", response_model=ScoringPolicyResponse)
+def get_active_policy(db: Session = Depends(get_db)):
+    """The scoring policy applied to new and recomputed scores"""
+    return ScoringPolicyService.get_active(db)
+
+
+@router.get("/{version}", response_model=ScoringPolicyResponse)
+def get_policy(version: int, db: Session = Depends(get_db)):
+    """Get a scoring policy version"""
+    policy = ScoringPolicyService.get(db, version)
+    if not policy:
+        raise HTTPException(status_code=404, detail="Scoring policy not found")
+    return policy
+
+
+@router.post("/", response_model=ScoringPolicyResponse, status_code=status.HTTP_201_CREATED)
+def create_policy(
+    policy_data: ScoringPolicyCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    """Create a new policy version from the active one plus config overrides"""
+    try:
+        return ScoringPolicyService.create(
+            db,
+            name=policy_data.name,
+            overrides=policy_data.config,
+            description=policy_data.description,
+            activate=policy_data.activate,
+            created_by=admin.username
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid policy config: {str(e)}")
+
+
+@router.post("/{version}/activate", response_model=ScoringPolicyResponse)
+def activate_policy(version: int, db: Session = Depends(get_db), admin: User = Depends(get_current_admin)):
+    """
+    Make a policy version active. Existing scores keep their version until
+    POST /jobs/{id}/recompute is run for the job.
+    """
+    try:
+        return ScoringPolicyService.activate(db, version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -9,24 +9,56 @@ from ..services import ReportService
 
 router = APIRouter(prefix="/reports", tags=["reports"], dependencies=[Depends(get_current_user)])
 
+MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
 
-@router.get("/{job_id}/longlist/docx")
-def download_longlist_report(job_id: int, db: Session = Depends(get_db)):
-    """Download longlist report as DOCX"""
+
+def _download(buffer, filename: str, fmt: str) -> StreamingResponse:
+    return StreamingResponse(
+        buffer,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+def _longlist_report(job_id: int, fmt: str, db: Session) -> StreamingResponse:
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     report_service = ReportService(db)
-    buffer = report_service.generate_longlist_report(job_id)
+    buffer = report_service.generate_longlist_report(job_id, fmt=fmt)
 
-    filename = f"longlist_report_{job.reference_number or job_id}_{job.title.replace(' ', '_')}.docx"
+    filename = f"longlist_report_{job.reference_number or job_id}_{job.title.replace(' ', '_')}.{fmt}"
+    return _download(buffer, filename, fmt)
 
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+
+def _candidate_report(result_id: int, fmt: str, db: Session) -> StreamingResponse:
+    result = db.query(MatchResult).filter(MatchResult.id == result_id).first()
+    if not result:
+        raise HTTPException(status_code=404, detail="Match result not found")
+
+    report_service = ReportService(db)
+    buffer = report_service.generate_candidate_report(result, fmt=fmt)
+
+    candidate_name = result.candidate.full_name.replace(" ", "_")
+    filename = f"evaluation_report_{candidate_name}.{fmt}"
+    return _download(buffer, filename, fmt)
+
+
+@router.get("/{job_id}/longlist/docx")
+def download_longlist_report(job_id: int, db: Session = Depends(get_db)):
+    """Download longlist report as DOCX"""
+    return _longlist_report(job_id, "docx", db)
+
+
+@router.get("/{job_id}/longlist/pdf")
+def download_longlist_pdf(job_id: int, db: Session = Depends(get_db)):
+    """Download longlist report as PDF"""
+    return _longlist_report(job_id, "pdf", db)
 
 
 @router.get("/{job_id}/longlist/xlsx")
@@ -40,29 +72,16 @@ def download_longlist_excel(job_id: int, db: Session = Depends(get_db)):
     buffer = report_service.generate_excel_report(job_id)
 
     filename = f"candidate_rankings_{job.reference_number or job_id}_{job.title.replace(' ', '_')}.xlsx"
-
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    return _download(buffer, filename, "xlsx")
 
 
 @router.get("/candidate/{result_id}/docx")
 def download_candidate_report(result_id: int, db: Session = Depends(get_db)):
     """Download detailed candidate evaluation report as DOCX"""
-    result = db.query(MatchResult).filter(MatchResult.id == result_id).first()
-    if not result:
-        raise HTTPException(status_code=404, detail="Match result not found")
+    return _candidate_report(result_id, "docx", db)
 
-    report_service = ReportService(db)
-    buffer = report_service.generate_candidate_report(result)
 
-    candidate_name = result.candidate.full_name.replace(" ", "_")
-    filename = f"evaluation_report_{candidate_name}.docx"
-
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+@router.get("/candidate/{result_id}/pdf")
+def download_candidate_pdf(result_id: int, db: Session = Depends(get_db)):
+    """Download detailed candidate evaluation report as PDF"""
+    return _candidate_report(result_id, "pdf", db)
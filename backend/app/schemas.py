@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 from enum import Enum
@@ -85,6 +85,9 @@ class JobUpdate(BaseModel):
     grade_level: Optional[GradeLevel] = None
     description: Optional[str] = None
     status: Optional[JobStatus] = None
+    # Replacing criteria re-scores only the criteria whose id is new or changed
+    education_criteria: Optional[List[Dict[str, Any]]] = None
+    experience_criteria: Optional[List[Dict[str, Any]]] = None
 
 
 class JobResponse(BaseModel):
@@ -149,6 +152,26 @@ class CandidateResponse(BaseModel):
         from_attributes = True
 
 
+class CandidateSearchHit(BaseModel):
+    candidate_id: int
+    job_id: int
+    full_name: str
+    nationality: Optional[str] = None
+    gender: Optional[str] = None
+    degree_level: Optional[str] = None
+    score: float
+
+
+class CandidateSearchResponse(BaseModel):
+    query: str
+    total: int
+    page: int
+    page_size: int
+    took_ms: float
+    hits: List[CandidateSearchHit]
+    facets: Dict[str, Dict[str, int]]
+
+
 # Match Result Schemas
 class MatchResultResponse(BaseModel):
     id: int
@@ -174,6 +197,9 @@ class MatchResultResponse(BaseModel):
     rank: Optional[int]
     is_in_longlist: bool
     passes_cutoff: bool
+    screening_status: Optional[str] = None
+    prescreen_score: Optional[float] = None
+    policy_version: Optional[int] = None
 
     overall_reasoning: Optional[str]
     strengths: List[str]
@@ -195,6 +221,7 @@ class StatisticsResponse(BaseModel):
     least_represented_countries: Optional[int] = 0
     score_statistics: Optional[Dict[str, float]] = None
     longlist_count: Optional[int] = 0
+    prescreen_rejected: Optional[int] = 0
 
 
 class ProcessJobResponse(BaseModel):
@@ -209,3 +236,209 @@ class ProcessCandidatesResponse(BaseModel):
     job_id: int
     candidates_processed: int
     longlist_count: int
+    prescreen_rejected: int = 0
+
+
+class TalentPoolMatchResponse(BaseModel):
+    message: str
+    job_id: int
+    pool_size: int
+    shortlisted: int
+    longlist_count: int
+
+
+# Scoring Policy Schemas
+# African Union least represented member states (default policy; configure
+# through a new scoring policy version)
+LEAST_REPRESENTED_COUNTRIES = [
+    "Botswana", "Cabo Verde", "Central African Republic", "Chad",
+    "Comoros", "Djibouti", "Equatorial Guinea", "Eritrea", "Eswatini",
+    "Gabon", "Gambia", "Guinea-Bissau", "Lesotho", "Liberia", "Libya",
+    "Madagascar", "Malawi", "Mauritania", "Mauritius", "Mozambique",
+    "Namibia", "Niger", "Sao Tome and Principe", "Seychelles",
+    "Sierra Leone", "Somalia", "South Sudan", "Togo"
+]
+
+
+class BonusPoints(BaseModel):
+    female: int = Field(5, ge=0)
+    age: int = Field(5, ge=0)
+    least_represented: int = Field(5, ge=0)
+    inclusion: int = Field(5, ge=0)
+
+    class Config:
+        extra = "forbid"
+
+
+class ScoringPolicyConfig(BaseModel):
+    """Scoring rules; the defaults are the original AU screening rules"""
+    education_weight: float = Field(30, ge=0)
+    experience_weight: float = Field(70, ge=0)
+    criterion_max: float = Field(10, gt=0)
+    bonuses: BonusPoints = BonusPoints()
+    max_bonus_age: int = Field(35, ge=0)
+    least_represented_countries: List[str] = LEAST_REPRESENTED_COUNTRIES
+    longlist_size: int = Field(20, ge=1)
+    pass_marks: Dict[GradeLevel, float] = {
+        GradeLevel.P1: 60, GradeLevel.P2: 60, GradeLevel.P3: 60, GradeLevel.P4: 60,
+        GradeLevel.P5: 70, GradeLevel.P6: 70, GradeLevel.D1: 70, GradeLevel.D2: 70,
+    }
+
+    class Config:
+        extra = "forbid"
+
+
+class ScoringPolicyCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    # Overrides on top of the active policy's config
+    config: Dict[str, Any] = {}
+    activate: bool = False
+
+
+class ScoringPolicyResponse(BaseModel):
+    id: int
+    version: int
+    name: str
+    description: Optional[str]
+    config: Dict[str, Any]
+    is_active: bool
+    created_by: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class WhatIfRequest(BaseModel):
+    # Base policy version (default: the active policy), plus config overrides
+    policy_version: Optional[int] = None
+    config: Dict[str, Any] = {}
+    limit: int = Field(100, ge=1, le=10000)
+
+
+class WhatIfResult(BaseModel):
+    result_id: int
+    candidate_id: int
+    candidate_name: Optional[str]
+    final_score: float
+    rank: int
+    is_in_longlist: bool
+    passes_cutoff: bool
+    current_final_score: Optional[float]
+    current_rank: Optional[int]
+
+
+class WhatIfResponse(BaseModel):
+    job_id: int
+    policy_version: Optional[int]
+    pass_mark: float
+    total_candidates: int
+    passing_cutoff: int
+    rank_changes: int
+    entered_longlist: List[int]
+    left_longlist: List[int]
+    results: List[WhatIfResult]
+
+
+# LLM Output Schemas
+# Structured outputs requested from Claude via tool use. Unknown keys are kept
+# so prompt changes don't silently drop data.
+class JobCriterion(BaseModel):
+    id: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_mandatory: Optional[bool] = None
+    years_required: Optional[float] = None
+
+    class Config:
+        extra = "allow"
+
+
+class JobCriteriaOutput(BaseModel):
+    title: Optional[str] = None
+    reference_number: Optional[str] = None
+    grade_level: Optional[str] = None
+    department: Optional[str] = None
+    duty_station: Optional[str] = None
+    education_criteria: List[JobCriterion] = Field(min_length=1)
+    experience_criteria: List[JobCriterion] = Field(min_length=1)
+
+    class Config:
+        extra = "allow"
+
+
+class CriterionScore(BaseModel):
+    score: float = Field(ge=0, le=10)
+    max: float = 10
+    reasoning: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+
+class MatchOutput(BaseModel):
+    education_scores: Dict[str, CriterionScore]
+    experience_scores: Dict[str, CriterionScore]
+    education_total: Optional[float] = None
+    experience_total: Optional[float] = None
+    base_score: Optional[float] = None
+    overall_reasoning: Optional[str] = None
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+    flags: List[str] = []
+    recommendations: Optional[str] = None
+    confidence: Optional[float] = Field(None, ge=0, le=1)
+
+    class Config:
+        extra = "allow"
+
+    @model_validator(mode="after")
+    def fill_totals(self):
+        """Derive totals from the criterion scores when the model omitted them"""
+        if self.education_total is None:
+            self.education_total = sum(s.score for s in self.education_scores.values())
+        if self.experience_total is None:
+            self.experience_total = sum(s.score for s in self.experience_scores.values())
+        if self.base_score is None:
+            self.base_score = self.education_total + self.experience_total
+        return self
+
+
+class CriterionScoresOutput(BaseModel):
+    """Scores for a subset of a job's criteria (incremental re-scoring)"""
+    education_scores: Dict[str, CriterionScore] = {}
+    experience_scores: Dict[str, CriterionScore] = {}
+
+    class Config:
+        extra = "allow"
+
+
+class PersonalInfo(BaseModel):
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    gender: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    nationality: Optional[str] = None
+    country_of_residence: Optional[str] = None
+
+    class Config:
+        extra = "allow"
+
+
+class ParsedCVOutput(BaseModel):
+    personal_info: PersonalInfo
+    education: List[Dict[str, Any]] = []
+    certifications: List[Dict[str, Any]] = []
+    experience: List[Dict[str, Any]] = []
+    skills: Dict[str, Any] = {}
+    total_years_experience: Optional[float] = None
+    has_international_experience: Optional[bool] = None
+    has_un_au_experience: Optional[bool] = None
+    disability_mentioned: Optional[bool] = None
+    disability_details: Optional[str] = None
+    confidence: Optional[float] = Field(None, ge=0, le=1)
+
+    class Config:
+        extra = "allow"
@@ -1,6 +1,12 @@
 from .claude_service import ClaudeService
 from .cv_parser import CVParser
+from .cv_preparser import CVPreparser
 from .matching_service import MatchingService
 from .report_service import ReportService
+from .prescreen_service import PrescreenService
+from .search_service import CandidateSearchService
 
-__all__ = ["ClaudeService", "CVParser", "MatchingService", "ReportService"]
+__all__ = [
+    "ClaudeService", "CVParser", "CVPreparser", "MatchingService", "ReportService",
+    "PrescreenService", "CandidateSearchService"
+]
@@ -1,27 +1,424 @@
-import anthropic
 import json
-from typing import Dict, List, Any
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Type
+from pydantic import BaseModel
 from ..config import get_settings
+from ..schemas import JobCriteriaOutput, ParsedCVOutput, MatchOutput, CriterionScoresOutput
+from ..tracing import record_span, set_attributes, trace_span
+from .json_repair import extract_json, PartialJSONParser
+from .llm_scheduler import LLMScheduler, get_llm_scheduler, estimate_tokens, PRIORITY_INTERACTIVE, PRIORITY_BULK
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Static scoring instructions, identical for every candidate and job so they
+# can be served from Anthropic's prompt cache
+MATCH_INSTRUCTIONS = """You are evaluating candidates for positions at the African Union. Each request gives the position with its education and experience criteria, followed by one candidate's parsed CV data.
+
+SCORING INSTRUCTIONS:
+1. Score each criterion from 0-10:
+   - 10: Exceeds requirements
+   - 8-9: Fully meets requirements
+   - 6-7: Mostly meets requirements
+   - 4-5: Partially meets requirements
+   - 2-3: Minimally meets requirements
+   - 0-1: Does not meet requirements
+
+2. For Education (30 points total):
+   - Degree Level (10 points): Score based on match to required degree
+   - Field of Study (10 points): Score based on relevance of field
+   - Certifications (10 points): Score based on relevant certifications
+
+3. For Experience (70 points total):
+   - Score each of the 7 criteria (10 points each)
+   - Consider years of experience, relevance, and quality
+
+Record your assessment with the record_match tool, following this structure:
+{
+    "education_scores": {
+        "degree_level": {
+            "score": 8,
+            "max": 10,
+            "reasoning": "Detailed explanation of why this score was given"
+        },
+        "field_of_study": {
+            "score": 9,
+            "max": 10,
+            "reasoning": "Detailed explanation"
+        },
+        "certifications": {
+            "score": 6,
+            "max": 10,
+            "reasoning": "Detailed explanation"
+        }
+    },
+    "experience_scores": {
+        "exp_1": {
+            "score": 8,
+            "max": 10,
+            "reasoning": "Detailed explanation"
+        },
+        ... (all 7 experience criteria)
+    },
+    "education_total": 23,
+    "experience_total": 58,
+    "base_score": 81,
+    "overall_reasoning": "Comprehensive summary of the candidate's fit for the role, explaining the total score",
+    "strengths": ["Strength 1", "Strength 2", "Strength 3"],
+    "weaknesses": ["Gap or weakness 1", "Missing qualification 2"],
+    "flags": ["Any red flags or concerns"],
+    "recommendations": "Recommendations for the hiring committee regarding this candidate",
+    "confidence": 0.9
+}
+
+Be fair, objective, and thorough in your assessment. Provide detailed reasoning for each score.
+Set confidence (0-1) to how sure you are of the scores; lower it when the CV data is sparse, ambiguous or contradictory."""
+
+
+RESCORE_INSTRUCTIONS = """You are re-evaluating candidates for positions at the African Union after some of the position's criteria were edited. Each request gives the position with only the edited criteria, followed by one candidate's parsed CV data.
+
+Score each criterion from 0-10:
+   - 10: Exceeds requirements
+   - 8-9: Fully meets requirements
+   - 6-7: Mostly meets requirements
+   - 4-5: Partially meets requirements
+   - 2-3: Minimally meets requirements
+   - 0-1: Does not meet requirements
+
+Record your assessment with the record_criterion_scores tool, keyed by criterion id, following this structure:
+{
+    "education_scores": {
+        "<criterion id>": {"score": 8, "max": 10, "reasoning": "Detailed explanation of why this score was given"}
+    },
+    "experience_scores": {
+        "<criterion id>": {"score": 6, "max": 10, "reasoning": "Detailed explanation"}
+    }
+}
+
+Score every listed criterion and no others. Be fair, objective, and thorough in your assessment."""
+
+# personal_info fields requested from the parse prompt, with their example values
+PERSONAL_INFO_FIELDS = {
+    "full_name": "Full name of the candidate",
+    "email": "email@example.com",
+    "phone": "+1234567890",
+    "gender": "male/female/other/not_specified",
+    "date_of_birth": "YYYY-MM-DD or null if not found",
+    "nationality": "Country of nationality",
+    "country_of_residence": "Current country of residence",
+}
+PERSONAL_INFO_NOTES = {
+    "gender": '- For gender, look for pronouns, titles (Mr/Ms/Mrs), or explicit mentions. If unclear, use "not_specified"',
+    "date_of_birth": "- For date of birth, look for DOB, birth date, age, or similar. Calculate from age if given.",
+}
+
+
+def _strip_empty(value: Any) -> Any:
+    """Drop null and empty values from nested JSON data"""
+    if isinstance(value, dict):
+        cleaned = {k: _strip_empty(v) for k, v in value.items()}
+        return {k: v for k, v in cleaned.items() if v not in (None, "", [], {}, "null")}
+    if isinstance(value, list):
+        cleaned = [_strip_empty(v) for v in value]
+        return [v for v in cleaned if v not in (None, "", [], {}, "null")]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """Serialise data for a prompt without indentation or empty fields"""
+    return json.dumps(_strip_empty(value), separators=(",", ":"), ensure_ascii=False)
+
+
+def _inline_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve $ref definitions so a tool input schema is self-contained"""
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+
+def output_tool(name: str, description: str, model: Type[BaseModel]) -> Dict[str, Any]:
+    """Tool definition whose input schema is the Pydantic output model"""
+    return {"name": name, "description": description, "input_schema": _inline_refs(model.model_json_schema())}
+
+
+JOB_CRITERIA_TOOL = output_tool(
+    "record_job_criteria", "Record the job metadata and scoring criteria extracted from a job description",
+    JobCriteriaOutput
+)
+PARSED_CV_TOOL = output_tool(
+    "record_parsed_cv", "Record the structured data extracted from a CV", ParsedCVOutput
+)
+MATCH_TOOL = output_tool(
+    "record_match", "Record the candidate's criterion scores and assessment", MatchOutput
+)
+CRITERION_SCORES_TOOL = output_tool(
+    "record_criterion_scores", "Record the candidate's scores for the edited criteria", CriterionScoresOutput
+)
+
+
+def structured_data(response, tool_name: str) -> Tuple[Any, bool]:
+    """
+    Return (data, repaired) from a response: the tool input if the model called
+    the tool, otherwise JSON recovered from its text. Raises ValueError if neither.
+    """
+    for block in response.content:
+        if block.type == "tool_use" and block.name == tool_name and block.input:
+            return block.input, False
+    text = "".join(block.text for block in response.content if block.type == "text")
+    return extract_json(text), True
+
+
+def correction_turn(response, tool_name: str, error: Exception) -> List[Dict[str, Any]]:
+    """Messages asking the model to fix output that failed validation"""
+    feedback = f"The output was invalid: {str(error)[:1000]}\nCall {tool_name} again with corrected input."
+    tool_use = next((block for block in response.content if block.type == "tool_use"), None)
+    if tool_use is None:
+        text = "".join(block.text for block in response.content if block.type == "text")
+        return [
+            {"role": "assistant", "content": text or "(no output)"},
+            {"role": "user", "content": feedback},
+        ]
+    return [
+        {
+            "role": "assistant",
+            "content": [{"type": "tool_use", "id": tool_use.id, "name": tool_use.name, "input": tool_use.input}]
+        },
+        {
+            "role": "user",
+            "content": [{"type": "tool_result", "tool_use_id": tool_use.id, "is_error": True, "content": feedback}]
+        },
+    ]
+
+
+class _CriteriaEmitter:
+    """Turns successive partial snapshots of job criteria into stream events"""
+
+    FIELDS = ("title", "reference_number", "grade_level", "department", "duty_station")
+    GROUPS = (("education", "education_criteria"), ("experience", "experience_criteria"))
+
+    def __init__(self):
+        self.sent_fields = set()
+        self.sent_criteria = {group: 0 for group, _ in self.GROUPS}
+
+    @property
+    def sent(self) -> bool:
+        return bool(self.sent_fields) or any(self.sent_criteria.values())
+
+    def update(self, snapshot: Dict[str, Any], final: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+        events = []
+        keys = list(snapshot)
+        for name in self.FIELDS:
+            if name in snapshot and name not in self.sent_fields:
+                self.sent_fields.add(name)
+                events.append(("field", {"name": name, "value": snapshot[name]}))
+
+        for group, key in self.GROUPS:
+            criteria = snapshot.get(key)
+            if not isinstance(criteria, list):
+                continue
+            # The last entry may still be streaming unless a later key has started
+            closed = final or keys.index(key) < len(keys) - 1
+            complete = len(criteria) if closed else len(criteria) - 1
+            for index in range(self.sent_criteria[group], complete):
+                events.append(("criterion", {"group": group, "index": index, "criterion": criteria[index]}))
+            self.sent_criteria[group] = max(self.sent_criteria[group], complete)
+        return events
+
+
+def escalation_reason(operation: str, result: Dict[str, Any], min_confidence: float) -> Optional[str]:
+    """Why valid output should be redone on the stronger model, or None"""
+    confidence = result.get("confidence")
+    if confidence is not None and confidence < min_confidence:
+        return f"confidence {confidence:.2f}"
+    if operation == "parse_cv":
+        if not (result.get("personal_info") or {}).get("full_name"):
+            return "no candidate name"
+        if not result.get("education") and not result.get("experience"):
+            return "no education or experience"
+    return None
+
+
+def _trace_attributes(operation: str, model: str, job_id: Optional[int]) -> Dict[str, Any]:
+    """OpenTelemetry GenAI semantic-convention attributes for a call"""
+    return {
+        "gen_ai.system": "anthropic",
+        "gen_ai.operation.name": operation,
+        "gen_ai.request.model": model,
+        "job.id": job_id,
+    }
+
+
+def _usage_attributes(response) -> Dict[str, Any]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    return {
+        "gen_ai.response.model": getattr(response, "model", None),
+        "gen_ai.usage.input_tokens": usage.input_tokens,
+        "gen_ai.usage.output_tokens": usage.output_tokens,
+        "gen_ai.usage.cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None),
+    }
+
+
+def log_usage(operation: str, model: str, response, started: float):
+    """Log token usage (including prompt cache hits) and latency of a call"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    logger.info(
+        "claude %s model=%s latency_ms=%.0f input_tokens=%s output_tokens=%s "
+        "cache_creation_input_tokens=%s cache_read_input_tokens=%s",
+        operation,
+        model,
+        (time.perf_counter() - started) * 1000,
+        usage.input_tokens,
+        usage.output_tokens,
+        getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        getattr(usage, "cache_read_input_tokens", 0) or 0,
+    )
 
 
 class ClaudeService:
     """Service for Claude AI API interactions"""
 
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        self.model = "claude-sonnet-4-20250514"
-
-    async def extract_job_criteria(self, job_description: str, job_title: str = None) -> Dict[str, Any]:
+        # Imported here: the SDK is the slowest import in the app
+        import anthropic
+
+        # Retries are handled by the shared LLM scheduler, not the SDK
+        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key, max_retries=0)
+        self.model = settings.llm_model
+        self.models = {
+            "extract_job_criteria": settings.llm_extract_model or self.model,
+            "parse_cv": settings.llm_parse_model or self.model,
+            "match_cv_to_job": settings.llm_match_model or self.model,
+            "score_criteria": settings.llm_match_model or self.model,
+        }
+        self.escalation_model = settings.llm_escalation_model or self.model
+        self.scheduler = get_llm_scheduler()
+
+    async def _create(
+        self, operation: str, priority: int, job_id: int = None, candidate_id: int = None, **kwargs
+    ):
+        """Send a Messages API request through the rate-limited scheduler"""
+        kwargs.setdefault("model", self.model)
+        prompt_text = json.dumps([kwargs.get("system", ""), kwargs["messages"]])
+        started = time.perf_counter()
+        with trace_span(f"claude.{operation}", **_trace_attributes(operation, kwargs["model"], job_id)):
+            response = await self.scheduler.run(
+                operation,
+                lambda: self.client.messages.create(**kwargs),
+                estimated_tokens=estimate_tokens(prompt_text) + kwargs["max_tokens"],
+                priority=priority,
+                job_id=job_id,
+                model=kwargs["model"],
+                candidate_id=candidate_id
+            )
+            set_attributes(**_usage_attributes(response))
+        log_usage(operation, kwargs["model"], response, started)
+        return response
+
+    async def _create_structured(
+        self,
+        operation: str,
+        priority: int,
+        output_model: Type[BaseModel],
+        tool: Dict[str, Any],
+        job_id: int = None,
+        candidate_id: int = None,
+        **kwargs
+    ) -> Dict[str, Any]:
         """
-        Extract job metadata and 10 scoring criteria from job description:
-        - Job details (title, reference number, grade level, department, duty station)
-        - 3 Education criteria (30% weight)
-        - 7 Experience criteria (70% weight)
+        Request validated structured output on the operation's model, redoing
+        it on the escalation model if the result looks unreliable.
         """
+        model = self.models[operation]
+        result = await self._request_structured(
+            operation, priority, output_model, tool, model, job_id, candidate_id, **kwargs
+        )
+        if model == self.escalation_model:
+            return result
+
+        reason = escalation_reason(operation, result, settings.llm_escalation_min_confidence)
+        if reason is None:
+            return result
+        logger.info("claude %s escalating from %s to %s: %s", operation, model, self.escalation_model, reason)
+        self.scheduler.record_parse(operation, "escalations")
+        try:
+            return await self._request_structured(
+                operation, priority, output_model, tool, self.escalation_model, job_id, candidate_id, **kwargs
+            )
+        except Exception:
+            logger.warning("claude %s escalation failed, keeping %s output", operation, model)
+            return result
+
+    async def _request_structured(
+        self,
+        operation: str,
+        priority: int,
+        output_model: Type[BaseModel],
+        tool: Dict[str, Any],
+        model: str,
+        job_id: int = None,
+        candidate_id: int = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Request output through a forced tool call and validate it against
+        `output_model`. Text responses go through JSON repair; invalid output
+        gets one follow-up turn with the validation errors on the escalation
+        model rather than a full re-run (truncated output is re-requested with
+        a larger token limit).
+        """
+        kwargs["tools"] = [tool]
+        kwargs["tool_choice"] = {"type": "tool", "name": tool["name"]}
+        messages = list(kwargs.pop("messages"))
+
+        for attempt in range(2):
+            response = await self._create(
+                operation, priority, job_id=job_id, candidate_id=candidate_id,
+                model=model, messages=messages, **kwargs
+            )
+            try:
+                data, repaired = structured_data(response, tool["name"])
+                result = output_model.model_validate(data)
+            except ValueError as error:
+                self.scheduler.record_parse(operation, "failures")
+                logger.warning(
+                    "claude %s returned unusable output (model=%s, attempt %d, stop_reason=%s): %s",
+                    operation, model, attempt + 1, response.stop_reason, str(error)[:500]
+                )
+                if attempt:
+                    raise Exception(f"Failed to parse {operation} output from Claude response") from error
+                self.scheduler.record_parse(operation, "retries")
+                if model != self.escalation_model:
+                    self.scheduler.record_parse(operation, "escalations")
+                    model = self.escalation_model
+                if response.stop_reason == "max_tokens":
+                    kwargs["max_tokens"] *= 2
+                else:
+                    messages = messages + correction_turn(response, tool["name"], error)
+                continue
+
+            if repaired:
+                self.scheduler.record_parse(operation, "repaired")
+            return result.model_dump(exclude_unset=True)
+
+    @staticmethod
+    def _job_criteria_prompt(job_description: str, job_title: str = None) -> str:
+        """Prompt for extracting job metadata and scoring criteria"""
         title_context = f' for the position of "{job_title}"' if job_title else ""
-        prompt = f"""Analyze this job description{title_context} at the African Union.
+        return f"""Analyze this job description{title_context} at the African Union.
 
 First, extract the job metadata, then extract exactly 10 scoring criteria for evaluating candidates.
 
@@ -43,7 +440,7 @@ Extract the 7 most important experience requirements from the job description. T
 JOB DESCRIPTION:
 {job_description}
 
-Respond in this exact JSON format:
+Record the result with the record_job_criteria tool, following this structure:
 {{
     "title": "Official Job Title",
     "reference_number": "AUC/XXX/2024/001 or null",
@@ -88,44 +485,149 @@ Respond in this exact JSON format:
 
 Be specific and extract the actual requirements from the job description. If something is not specified, make reasonable assumptions based on the job level and African Union standards."""
 
-        response = self.client.messages.create(
-            model=self.model,
+    async def extract_job_criteria(
+        self,
+        job_description: str,
+        job_title: str = None,
+        job_id: int = None
+    ) -> Dict[str, Any]:
+        """
+        Extract job metadata and 10 scoring criteria from job description:
+        - Job details (title, reference number, grade level, department, duty station)
+        - 3 Education criteria (30% weight)
+        - 7 Experience criteria (70% weight)
+        """
+        return await self._create_structured(
+            "extract_job_criteria",
+            PRIORITY_INTERACTIVE,
+            JobCriteriaOutput,
+            JOB_CRITERIA_TOOL,
+            job_id=job_id,
             max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": self._job_criteria_prompt(job_description, job_title)}]
         )
 
-        # Parse the JSON response
-        response_text = response.content[0].text
+    async def stream_job_criteria(
+        self,
+        job_description: str,
+        job_title: str = None,
+        job_id: int = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of extract_job_criteria yielding (event, data) pairs:
+        "field" for each metadata field, "criterion" for each completed
+        criterion, then "done" with the validated result.
+        """
+        messages = [{"role": "user", "content": self._job_criteria_prompt(job_description, job_title)}]
+        model = self.models["extract_job_criteria"]
+        kwargs = dict(
+            model=model,
+            max_tokens=4096,
+            tools=[JOB_CRITERIA_TOOL],
+            tool_choice={"type": "tool", "name": JOB_CRITERIA_TOOL["name"]},
+            messages=messages
+        )
+        estimated = estimate_tokens(json.dumps(messages)) + kwargs["max_tokens"]
+        emitter = _CriteriaEmitter()
+        started = time.perf_counter()
+        started_ns = time.time_ns()
+        message = None
 
-        # Extract JSON from response
         try:
-            # Try to find JSON in the response
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            raise Exception("Failed to parse job criteria from Claude response")
-
-    async def parse_cv(self, cv_text: str) -> Dict[str, Any]:
+            async with self.scheduler.admit(PRIORITY_INTERACTIVE, estimated):
+                async with self.client.messages.stream(**kwargs) as stream:
+                    parser = PartialJSONParser()
+                    async for event in stream:
+                        if event.type != "content_block_delta" or event.delta.type != "input_json_delta":
+                            continue
+                        snapshot = parser.feed(event.delta.partial_json)
+                        if isinstance(snapshot, dict):
+                            for item in emitter.update(snapshot):
+                                yield item
+                    message = await stream.get_final_message()
+        except Exception as error:
+            if emitter.sent or not LLMScheduler.is_retryable(error):
+                raise
+            # Nothing shown yet: fall back to the blocking call, which retries
+            logger.warning("claude stream_job_criteria failed (%s), falling back", error.__class__.__name__)
+
+        if message is None:
+            result = await self.extract_job_criteria(job_description, job_title, job_id=job_id)
+        else:
+            self.scheduler.settle(
+                job_id, "extract_job_criteria", model, message.usage, estimated,
+                latency=time.perf_counter() - started
+            )
+            # A generator can't hold a current span across yields; record it whole
+            record_span(
+                "claude.stream_job_criteria", started_ns,
+                **_trace_attributes("extract_job_criteria", model, job_id), **_usage_attributes(message)
+            )
+            log_usage("extract_job_criteria", model, message, started)
+            try:
+                data, repaired = structured_data(message, JOB_CRITERIA_TOOL["name"])
+                result = JobCriteriaOutput.model_validate(data).model_dump(exclude_unset=True)
+            except ValueError as error:
+                self.scheduler.record_parse("extract_job_criteria", "failures")
+                self.scheduler.record_parse("extract_job_criteria", "retries")
+                if model != self.escalation_model:
+                    self.scheduler.record_parse("extract_job_criteria", "escalations")
+                result = await self._request_structured(
+                    "extract_job_criteria",
+                    PRIORITY_INTERACTIVE,
+                    JobCriteriaOutput,
+                    JOB_CRITERIA_TOOL,
+                    self.escalation_model,
+                    job_id=job_id,
+                    max_tokens=4096,
+                    messages=messages + correction_turn(message, JOB_CRITERIA_TOOL["name"], error)
+                )
+
+        for item in emitter.update(result, final=True):
+            yield item
+        yield "done", result
+
+    async def parse_cv(
+        self,
+        cv_text: str,
+        job_id: int = None,
+        preparsed: Dict[str, Dict[str, Any]] = None,
+        candidate_id: int = None
+    ) -> Dict[str, Any]:
         """
-        Parse CV text and extract structured data
+        Parse CV text and extract structured data.
+
+        `preparsed` holds personal fields already found by CVPreparser: confident
+        ones are left out of the prompt and filled in afterwards, the rest are
+        passed to the model to verify.
         """
+        preparsed = preparsed or {}
+        known = {
+            name: field["value"] for name, field in preparsed.items()
+            if field["confidence"] >= settings.preparse_min_confidence
+        }
+        verify = {name: field["value"] for name, field in preparsed.items() if name not in known}
+        requested = [name for name in PERSONAL_INFO_FIELDS if name not in known]
+
+        personal_lines = ",\n".join(f'        "{name}": "{PERSONAL_INFO_FIELDS[name]}"' for name in requested)
+        personal_notes = "".join(f"{PERSONAL_INFO_NOTES[name]}\n" for name in requested if name in PERSONAL_INFO_NOTES)
+        verify_block = ""
+        if verify:
+            verify_block = (
+                "\nThese personal fields were found by pattern matching but may be wrong. "
+                "Check each against the CV and return the correct value in personal_info:\n"
+                + "".join(f"- {name}: {value}\n" for name, value in verify.items())
+            )
+
         prompt = f"""Parse this CV/Resume and extract all relevant information.
 
 CV TEXT:
 {cv_text}
-
-Extract and return the following information in this exact JSON format:
+{verify_block}
+Extract the following information and record it with the record_parsed_cv tool, following this structure:
 {{
     "personal_info": {{
-        "full_name": "Full name of the candidate",
-        "email": "email@example.com",
-        "phone": "+1234567890",
-        "gender": "male/female/other/not_specified",
-        "date_of_birth": "YYYY-MM-DD or null if not found",
-        "nationality": "Country of nationality",
-        "country_of_residence": "Current country of residence"
+{personal_lines}
     }},
     "education": [
         {{
@@ -172,122 +674,139 @@ Extract and return the following information in this exact JSON format:
     "has_international_experience": true,
     "has_un_au_experience": true,
     "disability_mentioned": false,
-    "disability_details": null
+    "disability_details": null,
+    "confidence": 0.9
 }}
 
 Important notes:
-- For gender, look for pronouns, titles (Mr/Ms/Mrs), or explicit mentions. If unclear, use "not_specified"
-- For date of birth, look for DOB, birth date, age, or similar. Calculate from age if given.
-- Be thorough in extracting all education and experience entries
+{personal_notes}- Be thorough in extracting all education and experience entries
 - Calculate total years of professional experience
-- Note if they have UN, AU, or international organization experience"""
-
-        response = self.client.messages.create(
-            model=self.model,
+- Note if they have UN, AU, or international organization experience
+- Set confidence (0-1) to how sure you are the extraction is complete and correct; lower it for garbled, truncated or unusually formatted text"""
+
+        result = await self._create_structured(
+            "parse_cv",
+            PRIORITY_BULK,
+            ParsedCVOutput,
+            PARSED_CV_TOOL,
+            job_id=job_id,
+            candidate_id=candidate_id,
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        response_text = response.content[0].text
-
-        try:
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            raise Exception("Failed to parse CV data from Claude response")
+        if preparsed:
+            logger.info("claude parse_cv prefilled=%s verified=%s", sorted(known), sorted(verify))
+            # The model's answer wins for verified fields, unless it left one out
+            result["personal_info"] = {**verify, **result.get("personal_info", {}), **known}
+        return result
 
     async def match_cv_to_job(
         self,
         cv_data: Dict[str, Any],
         education_criteria: List[Dict],
         experience_criteria: List[Dict],
-        job_title: str
+        job_title: str,
+        job_id: int = None,
+        candidate_id: int = None
     ) -> Dict[str, Any]:
         """
-        Match parsed CV against job criteria and generate scores
-        """
-        prompt = f"""You are evaluating a candidate for the position of "{job_title}" at the African Union.
+        Match parsed CV against job criteria and generate scores.
 
-CANDIDATE CV DATA:
-{json.dumps(cv_data, indent=2)}
+        The static instructions and the per-job criteria form a cached prompt
+        prefix shared by every candidate of the job; only the CV block varies.
+        """
+        job_context = f"""POSITION: "{job_title}" at the African Union.
 
 EDUCATION CRITERIA (30% of total score, 10 points each criterion, 30 points total):
-{json.dumps(education_criteria, indent=2)}
+{compact_json(education_criteria)}
 
 EXPERIENCE CRITERIA (70% of total score, 10 points each criterion, 70 points total):
-{json.dumps(experience_criteria, indent=2)}
-
-SCORING INSTRUCTIONS:
-1. Score each criterion from 0-10:
-   - 10: Exceeds requirements
-   - 8-9: Fully meets requirements
-   - 6-7: Mostly meets requirements
-   - 4-5: Partially meets requirements
-   - 2-3: Minimally meets requirements
-   - 0-1: Does not meet requirements
-
-2. For Education (30 points total):
-   - Degree Level (10 points): Score based on match to required degree
-   - Field of Study (10 points): Score based on relevance of field
-   - Certifications (10 points): Score based on relevant certifications
-
-3. For Experience (70 points total):
-   - Score each of the 7 criteria (10 points each)
-   - Consider years of experience, relevance, and quality
-
-Respond in this exact JSON format:
-{{
-    "education_scores": {{
-        "degree_level": {{
-            "score": 8,
-            "max": 10,
-            "reasoning": "Detailed explanation of why this score was given"
-        }},
-        "field_of_study": {{
-            "score": 9,
-            "max": 10,
-            "reasoning": "Detailed explanation"
-        }},
-        "certifications": {{
-            "score": 6,
-            "max": 10,
-            "reasoning": "Detailed explanation"
-        }}
-    }},
-    "experience_scores": {{
-        "exp_1": {{
-            "score": 8,
-            "max": 10,
-            "reasoning": "Detailed explanation"
-        }},
-        ... (all 7 experience criteria)
-    }},
-    "education_total": 23,
-    "experience_total": 58,
-    "base_score": 81,
-    "overall_reasoning": "Comprehensive summary of the candidate's fit for the role, explaining the total score",
-    "strengths": ["Strength 1", "Strength 2", "Strength 3"],
-    "weaknesses": ["Gap or weakness 1", "Missing qualification 2"],
-    "flags": ["Any red flags or concerns"],
-    "recommendations": "Recommendations for the hiring committee regarding this candidate"
-}}
-
-Be fair, objective, and thorough in your assessment. Provide detailed reasoning for each score."""
-
-        response = self.client.messages.create(
-            model=self.model,
+{compact_json(experience_criteria)}"""
+
+        return await self._create_structured(
+            "match_cv_to_job",
+            PRIORITY_BULK,
+            MatchOutput,
+            MATCH_TOOL,
+            job_id=job_id,
+            candidate_id=candidate_id,
             max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}]
+            system=[{
+                "type": "text",
+                "text": MATCH_INSTRUCTIONS,
+                "cache_control": {"type": "ephemeral"}
+            }],
+            messages=[{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": job_context,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": f"CANDIDATE CV DATA:\n{compact_json(cv_data)}"
+                    }
+                ]
+            }]
         )
 
-        response_text = response.content[0].text
+    async def score_criteria(
+        self,
+        cv_data: Dict[str, Any],
+        education_criteria: List[Dict],
+        experience_criteria: List[Dict],
+        job_title: str,
+        job_id: int = None,
+        candidate_id: int = None
+    ) -> Dict[str, Any]:
+        """
+        Score a candidate against a subset of a job's criteria only, e.g. the
+        ones edited since the last screening. Raises ValueError if a requested
+        criterion is missing from the output.
+        """
+        job_context = f"""POSITION: "{job_title}" at the African Union.
+
+EDITED EDUCATION CRITERIA:
+{compact_json(education_criteria)}
+
+EDITED EXPERIENCE CRITERIA:
+{compact_json(experience_criteria)}"""
+
+        result = await self._create_structured(
+            "score_criteria",
+            PRIORITY_BULK,
+            CriterionScoresOutput,
+            CRITERION_SCORES_TOOL,
+            job_id=job_id,
+            candidate_id=candidate_id,
+            max_tokens=512 + 384 * (len(education_criteria) + len(experience_criteria)),
+            system=[{
+                "type": "text",
+                "text": RESCORE_INSTRUCTIONS,
+                "cache_control": {"type": "ephemeral"}
+            }],
+            messages=[{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": job_context,
+                        "cache_control": {"type": "ephemeral"}
+                    },
+                    {
+                        "type": "text",
+                        "text": f"CANDIDATE CV DATA:\n{compact_json(cv_data)}"
+                    }
+                ]
+            }]
+        )
 
-        try:
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_str = response_text[start:end]
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            raise Exception("Failed to parse matching results from Claude response")
+        for section, criteria in (("education_scores", education_criteria), ("experience_scores", experience_criteria)):
+            missing = {c["id"] for c in criteria} - set(result.get(section, {}))
+            if missing:
+                raise ValueError(f"No score for criteria: {', '.join(sorted(missing))}")
+            result[section] = {c["id"]: result[section][c["id"]] for c in criteria}
+        return result
@@ -1,9 +1,38 @@
+import asyncio
+import io
 import os
-from PyPDF2 import PdfReader
-import docx2txt
-from docx import Document
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import tempfile
 
+from ..config import get_settings
+from ..metrics import EXTRACTION_PAGES, EXTRACTION_SECONDS
+from ..tracing import in_context, set_attributes, trace_span
+from .doc_extraction import OLE_MAGIC, extract_doc_text
+from .ocr_service import OCRService, MIN_PAGE_CHARS
+from .pdf_extraction import extract_pages
+from .text_normalizer import PAGE_BREAK
+
+settings = get_settings()
+
+# Detected format -> temp file suffix
+SUPPORTED_FORMATS = {"pdf": ".pdf", "docx": ".docx", "doc": ".doc"}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    """Shared extraction pool; its size bounds concurrent document parsing"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.extraction_workers, thread_name_prefix="extract")
+        return _executor
+
 
 class CVParser:
     """Extract text from CV files (PDF, DOCX, DOC)"""
@@ -12,50 +41,97 @@ class CVParser:
     def extract_text_from_pdf(file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text.strip()
+            pages = extract_pages(file_path)
+            if any(len("".join(text.split())) < MIN_PAGE_CHARS for text in pages):
+                from PyPDF2 import PdfReader
+
+                pages = OCRService.fill_scanned_pages(file_path, PdfReader(file_path), pages)
+            # Keep page boundaries so per-page headers/footers can be removed later
+            return PAGE_BREAK.join(pages).strip()
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
 
     @staticmethod
     def extract_text_from_docx(file_path: str) -> str:
         """Extract text from DOCX file"""
+        import docx2txt
+
         try:
             text = docx2txt.process(file_path)
             return text.strip()
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
 
+    @staticmethod
+    def extract_text_from_doc(file_path: str) -> str:
+        """Extract text from a legacy binary Word (.doc) file"""
+        try:
+            return extract_doc_text(file_path)
+        except Exception as e:
+            raise Exception(f"Error parsing DOC: {str(e)}")
+
+    @staticmethod
+    def detect_format(content: bytes) -> str:
+        """
+        Identify a document by its magic bytes rather than its extension
+        (.doc files are often renamed DOCX or PDF). Raises ValueError for
+        anything that is not a PDF, DOCX or Word 97-2003 document.
+        """
+        if b"%PDF-" in content[:1024]:
+            return "pdf"
+        if content.startswith(b"PK\x03\x04"):
+            # Only the zip central directory is read
+            try:
+                with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                    if "word/document.xml" in archive.namelist():
+                        return "docx"
+            except zipfile.BadZipFile:
+                raise ValueError("Corrupt DOCX file")
+            raise ValueError("Unsupported file format: zip archive is not a Word document")
+        if content.startswith(OLE_MAGIC):
+            return "doc"
+        if content.startswith(b"{\\rtf"):
+            raise ValueError("Unsupported file format: RTF (save as DOCX or PDF)")
+        if not content:
+            raise ValueError("Empty file")
+        raise ValueError("Unsupported file format: not a PDF, DOCX or DOC document")
+
     @staticmethod
     def extract_text(file_path: str) -> str:
-        """Extract text from file based on extension"""
-        _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
+        """Extract text from file based on its content"""
+        with open(file_path, "rb") as f:
+            file_format = CVParser.detect_format(f.read())
 
-        if ext == ".pdf":
-            return CVParser.extract_text_from_pdf(file_path)
-        elif ext in [".docx", ".doc"]:
-            return CVParser.extract_text_from_docx(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
+        started = time.perf_counter()
+        with trace_span("cv.extract_text", **{"cv.format": file_format, "cv.bytes": os.path.getsize(file_path)}):
+            if file_format == "pdf":
+                text = CVParser.extract_text_from_pdf(file_path)
+                pages = text.count(PAGE_BREAK) + 1
+                EXTRACTION_PAGES.observe(pages)
+                set_attributes(**{"cv.pages": pages})
+            elif file_format == "docx":
+                text = CVParser.extract_text_from_docx(file_path)
+            else:
+                text = CVParser.extract_text_from_doc(file_path)
+            set_attributes(**{"cv.chars": len(text)})
+        EXTRACTION_SECONDS.labels(file_format).observe(time.perf_counter() - started)
+        return text
 
     @staticmethod
     async def extract_text_from_upload(file_content: bytes, filename: str) -> str:
         """Extract text from uploaded file"""
-        _, ext = os.path.splitext(filename)
-        ext = ext.lower()
+        # Reject unsupported or mislabelled files before touching the disk
+        file_format = CVParser.detect_format(file_content)
 
         # Save to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=SUPPORTED_FORMATS[file_format]) as tmp:
             tmp.write(file_content)
             tmp_path = tmp.name
 
         try:
-            text = CVParser.extract_text(tmp_path)
-            return text
+            # Parsing (and OCR) is blocking; run it in the bounded extraction pool
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_pool(), in_context(CVParser.extract_text, tmp_path))
         finally:
             # Clean up temp file
             os.unlink(tmp_path)
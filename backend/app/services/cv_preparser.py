@@ -0,0 +1,251 @@
+import calendar
+import re
+import unicodedata
+from datetime import date
+from typing import Dict, Any, Optional, Tuple
+
+# AU member states and the demonyms/alternative names used for them in CVs
+AU_NATIONALITIES = {
+    "Algeria": ["Algerian"],
+    "Angola": ["Angolan"],
+    "Benin": ["Beninese", "Beninois"],
+    "Botswana": ["Motswana", "Batswana", "Botswanan"],
+    "Burkina Faso": ["Burkinabe", "Burkinabé"],
+    "Burundi": ["Burundian"],
+    "Cabo Verde": ["Cape Verde", "Cape Verdean", "Cabo Verdean"],
+    "Cameroon": ["Cameroonian"],
+    "Central African Republic": ["Central African", "CAR"],
+    "Chad": ["Chadian"],
+    "Comoros": ["Comorian"],
+    "Congo": ["Republic of the Congo", "Congo-Brazzaville", "Congo Brazzaville"],
+    "Cote d'Ivoire": ["Côte d'Ivoire", "Ivory Coast", "Ivorian"],
+    "Democratic Republic of the Congo": ["DR Congo", "DRC", "Congo-Kinshasa", "Congo Kinshasa"],
+    "Djibouti": ["Djiboutian"],
+    "Egypt": ["Egyptian"],
+    "Equatorial Guinea": ["Equatoguinean", "Equatorial Guinean"],
+    "Eritrea": ["Eritrean"],
+    "Eswatini": ["Swaziland", "Swazi", "Liswati"],
+    "Ethiopia": ["Ethiopian"],
+    "Gabon": ["Gabonese"],
+    "Gambia": ["The Gambia", "Gambian"],
+    "Ghana": ["Ghanaian"],
+    "Guinea": ["Guinean"],
+    "Guinea-Bissau": ["Guinea Bissau", "Bissau-Guinean"],
+    "Kenya": ["Kenyan"],
+    "Lesotho": ["Basotho", "Mosotho"],
+    "Liberia": ["Liberian"],
+    "Libya": ["Libyan"],
+    "Madagascar": ["Malagasy"],
+    "Malawi": ["Malawian"],
+    "Mali": ["Malian"],
+    "Mauritania": ["Mauritanian"],
+    "Mauritius": ["Mauritian"],
+    "Morocco": ["Moroccan"],
+    "Mozambique": ["Mozambican"],
+    "Namibia": ["Namibian"],
+    "Niger": ["Nigerien"],
+    "Nigeria": ["Nigerian"],
+    "Rwanda": ["Rwandan", "Rwandese"],
+    "Sahrawi Republic": ["Sahrawi Arab Democratic Republic", "Western Sahara", "Sahrawi"],
+    "Sao Tome and Principe": ["São Tomé and Príncipe", "Santomean"],
+    "Senegal": ["Senegalese"],
+    "Seychelles": ["Seychellois"],
+    "Sierra Leone": ["Sierra Leonean"],
+    "Somalia": ["Somali"],
+    "South Africa": ["South African"],
+    "South Sudan": ["South Sudanese"],
+    "Sudan": ["Sudanese"],
+    "Tanzania": ["Tanzanian", "United Republic of Tanzania"],
+    "Togo": ["Togolese"],
+    "Tunisia": ["Tunisian"],
+    "Uganda": ["Ugandan"],
+    "Zambia": ["Zambian"],
+    "Zimbabwe": ["Zimbabwean"],
+}
+
+# Names that could mean more than one member state
+AMBIGUOUS_NATIONALITIES = {"congolese": "Congo", "guinean": "Guinea"}
+
+_MONTHS = {
+    name.lower(): number
+    for number in range(1, 13)
+    for name in (calendar.month_name[number], calendar.month_abbr[number])
+}
+_MONTH = r"(?P<month_name>" + "|".join(sorted(_MONTHS, key=len, reverse=True)) + r")\.?"
+_DAY_SUFFIX = r"(?:st|nd|rd|th)?"
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE = r"(\+|00)?\(?\d[\d\s().-]{6,}\d"
+_LABELED_PHONE_RE = re.compile(
+    r"\b(?:tel(?:ephone)?|phone|mobile|cell(?:phone)?|whats ?app|gsm)\.?"
+    r"(?:\s*(?:no|number|nr)\.?)?\s*[:\-–]?\s*(" + _PHONE + ")",
+    re.IGNORECASE
+)
+_INTERNATIONAL_PHONE_RE = re.compile(r"(?<![\w+])\+\d{1,3}[\s.-]?\(?\d{1,4}\)?(?:[\s.-]?\d{2,4}){2,4}\b")
+_LABEL_END = r"\s*[:\-–]?\s*(?P<value>[^\n|;]{1,60})"
+_DOB_RE = re.compile(
+    r"\b(?:date\s+of\s+birth|birth\s*date|d\.?\s?o\.?\s?b\.?|born(?:\s+on)?)" + _LABEL_END,
+    re.IGNORECASE
+)
+_GENDER_RE = re.compile(r"\b(?:gender|sex)\s*[:\-–]?\s*(male|female|m|f)\b", re.IGNORECASE)
+_TITLE_RE = re.compile(r"\b(Mr|Mrs|Ms|Miss|Mme|Mlle|Madame|Monsieur)\b\.?\s+[A-Z]")
+_NATIONALITY_RE = re.compile(r"\b(?:nationality|citizenship)" + _LABEL_END, re.IGNORECASE)
+
+_ISO_DATE_RE = re.compile(r"\b(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\b")
+_NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})\b")
+_DAY_MONTH_YEAR_RE = re.compile(r"\b(?P<day>\d{1,2})" + _DAY_SUFFIX + r"\s+(?:of\s+)?" + _MONTH + r",?\s+(?P<year>\d{4})\b", re.IGNORECASE)
+_MONTH_DAY_YEAR_RE = re.compile(_MONTH + r"\s+(?P<day>\d{1,2})" + _DAY_SUFFIX + r",?\s+(?P<year>\d{4})\b", re.IGNORECASE)
+
+Field = Tuple[Any, float]
+
+
+def _fold(text: str) -> str:
+    """Lower-case and strip accents and punctuation for lookups"""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z]+", " ", text.lower()).strip()
+
+
+_NATIONALITY_LOOKUP = {
+    _fold(alias): country
+    for country, aliases in AU_NATIONALITIES.items()
+    for alias in [country, *aliases]
+}
+
+
+def _plausible_birth_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        value = date(year, month, day)
+    except ValueError:
+        return None
+    today = date.today()
+    return value if 1930 <= year <= today.year - 15 else None
+
+
+def parse_date(text: str) -> Optional[Field]:
+    """Parse the first date in `text` as (ISO string, confidence)"""
+    match = _ISO_DATE_RE.search(text)
+    if match:
+        value = _plausible_birth_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        return (value.isoformat(), 0.95) if value else None
+
+    match = _NUMERIC_DATE_RE.search(text)
+    if match:
+        first, second, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        if first > 12 or first == second:
+            day, month, confidence = first, second, 0.95
+        elif second > 12:
+            day, month, confidence = second, first, 0.9
+        else:
+            # 03/04/1985 is ambiguous; day-first is the common convention in AU member states
+            day, month, confidence = first, second, 0.5
+        value = _plausible_birth_date(year, month, day)
+        return (value.isoformat(), confidence) if value else None
+
+    match = _DAY_MONTH_YEAR_RE.search(text) or _MONTH_DAY_YEAR_RE.search(text)
+    if match:
+        month = _MONTHS[match.group("month_name").lower()]
+        value = _plausible_birth_date(int(match.group("year")), month, int(match.group("day")))
+        return (value.isoformat(), 0.95) if value else None
+    return None
+
+
+def match_nationality(text: str) -> Optional[Field]:
+    """Map a nationality or country mention to an AU member state name"""
+    folded = _fold(text)
+    if folded in AMBIGUOUS_NATIONALITIES:
+        return AMBIGUOUS_NATIONALITIES[folded], 0.5
+    if folded in _NATIONALITY_LOOKUP:
+        return _NATIONALITY_LOOKUP[folded], 0.95
+
+    # "Kenyan citizen", "Nigerian (by birth)": longest alias contained as whole
+    # words. Below the prefill threshold, so the LLM still confirms it ("Kenyan,
+    # resident in South Sudan" picks the wrong country)
+    padded = f" {folded} "
+    for alias in sorted(_NATIONALITY_LOOKUP, key=len, reverse=True):
+        if f" {alias} " in padded:
+            return _NATIONALITY_LOOKUP[alias], 0.7
+    return None
+
+
+class CVPreparser:
+    """
+    Rule-based extraction of CV personal fields (email, phone, date of birth,
+    gender, nationality) with a confidence per field, run before LLM parsing.
+    """
+
+    @staticmethod
+    def extract_email(text: str) -> Optional[Field]:
+        emails = _EMAIL_RE.findall(text)
+        if not emails:
+            return None
+        # Referees' addresses usually come later; the first one is the candidate's
+        distinct = {email.lower() for email in emails}
+        return emails[0], 0.98 if len(distinct) == 1 else 0.8
+
+    @staticmethod
+    def extract_phone(text: str) -> Optional[Field]:
+        match = _LABELED_PHONE_RE.search(text)
+        confidence = 0.9
+        if match:
+            value = match.group(1)
+            if not match.group(2):
+                confidence = 0.8
+        else:
+            match = _INTERNATIONAL_PHONE_RE.search(text)
+            if not match:
+                return None
+            value, confidence = match.group(0), 0.75
+
+        value = re.sub(r"\s+", " ", value).strip(" .-")
+        digits = re.sub(r"\D", "", value)
+        if not 8 <= len(digits) <= 15:
+            return None
+        return value, confidence
+
+    @staticmethod
+    def extract_date_of_birth(text: str) -> Optional[Field]:
+        for match in _DOB_RE.finditer(text):
+            parsed = parse_date(match.group("value"))
+            if parsed:
+                return parsed
+        return None
+
+    @staticmethod
+    def extract_gender(text: str) -> Optional[Field]:
+        match = _GENDER_RE.search(text)
+        if match:
+            return ("male" if match.group(1).lower().startswith("m") else "female"), 0.95
+
+        match = _TITLE_RE.search(text[:500])
+        if match:
+            return ("male" if match.group(1) in ("Mr", "Monsieur") else "female"), 0.75
+        return None
+
+    @staticmethod
+    def extract_nationality(text: str) -> Optional[Field]:
+        for match in _NATIONALITY_RE.finditer(text):
+            value = re.split(r"\s{2,}|\t", match.group("value").strip())[0].strip(" .,")
+            if not value:
+                continue
+            return match_nationality(value) or (value, 0.6)
+        return None
+
+    @staticmethod
+    def preparse(text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the personal fields found in CV text as
+        {field: {"value": ..., "confidence": 0-1}}; fields not found are omitted.
+        """
+        extractors = {
+            "email": CVPreparser.extract_email,
+            "phone": CVPreparser.extract_phone,
+            "date_of_birth": CVPreparser.extract_date_of_birth,
+            "gender": CVPreparser.extract_gender,
+            "nationality": CVPreparser.extract_nationality,
+        }
+        fields = {}
+        for name, extract in extractors.items():
+            found = extract(text or "")
+            if found:
+                fields[name] = {"value": found[0], "confidence": found[1]}
+        return fields
@@ -0,0 +1,120 @@
+import logging
+import re
+import shutil
+import struct
+import subprocess
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# FIB (File Information Block) at the start of the WordDocument stream
+_WORD_IDENT = 0xA5EC
+_WORD97_MIN_NFIB = 0xC1
+_FLAG_ENCRYPTED = 0x0100
+_FLAG_TABLE_1 = 0x0200
+_FC_CLX_INDEX = 33  # fcClx/lcbClx pair in FibRgFcLcb97
+_FC_COMPRESSED = 0x40000000
+
+# Field codes: \x13 instruction \x14 result \x15 -> keep the result only
+_FIELD_RE = re.compile(r"\x13[^\x13\x14\x15]*(?:\x14([^\x13\x15]*))?\x15")
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0e-\x1f]")
+_TRANSLATE = {0x0D: "\n", 0x0B: "\n", 0x07: "\t", 0x0C: "\n", 0x1E: "-", 0x1F: "", 0xA0: " "}
+
+
+def antiword_available() -> bool:
+    return bool(settings.antiword_cmd) and shutil.which(settings.antiword_cmd) is not None
+
+
+def extract_with_antiword(file_path: str) -> str:
+    result = subprocess.run(
+        [settings.antiword_cmd, "-w", "0", "-m", "UTF-8.txt", file_path],
+        capture_output=True,
+        timeout=settings.doc_timeout_seconds
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode(errors="replace").strip()[:200] or "antiword failed")
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def _clean(text: str) -> str:
+    # Fields may nest; strip the innermost first
+    previous = None
+    while previous != text:
+        previous, text = text, _FIELD_RE.sub(lambda m: m.group(1) or "", text)
+    text = text.translate(_TRANSLATE)
+    return _CONTROL_RE.sub("", text)
+
+
+def extract_with_olefile(file_path: str) -> str:
+    """
+    Text of a Word 97-2003 document read from its piece table (the Clx in the
+    table stream), which maps character positions to runs of 8-bit (cp1252)
+    or UTF-16 text in the WordDocument stream.
+    """
+    try:
+        import olefile
+    except ImportError:
+        raise RuntimeError("Reading .doc files needs the olefile package or the antiword binary")
+
+    with olefile.OleFileIO(file_path) as ole:
+        if not ole.exists("WordDocument"):
+            raise ValueError("Not a Word document (no WordDocument stream)")
+        word = ole.openstream("WordDocument").read()
+
+        ident, nfib = struct.unpack_from("<HH", word, 0)
+        flags = struct.unpack_from("<H", word, 0x0A)[0]
+        if ident != _WORD_IDENT:
+            raise ValueError("Not a Word document")
+        if flags & _FLAG_ENCRYPTED:
+            raise ValueError("Password-protected Word documents are not supported")
+        if nfib < _WORD97_MIN_NFIB:
+            raise ValueError("Word 6/95 documents are not supported; save as DOCX or PDF")
+
+        table_name = "1Table" if flags & _FLAG_TABLE_1 else "0Table"
+        if not ole.exists(table_name):
+            raise ValueError(f"Missing {table_name} stream")
+        table = ole.openstream(table_name).read()
+
+    # Walk the variable-length FIB to FibRgFcLcb
+    csw = struct.unpack_from("<H", word, 0x20)[0]
+    offset = 0x22 + csw * 2
+    cslw = struct.unpack_from("<H", word, offset)[0]
+    offset += 2 + cslw * 4 + 2
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, offset + _FC_CLX_INDEX * 8)
+    clx = table[fc_clx:fc_clx + lcb_clx]
+
+    # Skip property modifiers (Prc, 0x01) to the piece table (Pcdt, 0x02)
+    pos = 0
+    while pos < len(clx) and clx[pos] == 0x01:
+        pos += 3 + struct.unpack_from("<H", clx, pos + 1)[0]
+    if pos >= len(clx) or clx[pos] != 0x02:
+        raise ValueError("Word piece table not found")
+    lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + lcb]
+
+    count = (len(plc) - 4) // 12
+    cps = struct.unpack_from(f"<{count + 1}I", plc, 0)
+    parts = []
+    for i in range(count):
+        fc = struct.unpack_from("<I", plc, (count + 1) * 4 + i * 8 + 2)[0]
+        length = cps[i + 1] - cps[i]
+        if fc & _FC_COMPRESSED:
+            start = (fc & ~_FC_COMPRESSED) // 2
+            parts.append(word[start:start + length].decode("cp1252", errors="replace"))
+        else:
+            parts.append(word[fc:fc + length * 2].decode("utf-16-le", errors="replace"))
+    return _clean("".join(parts))
+
+
+def extract_doc_text(file_path: str) -> str:
+    """Text of a legacy binary .doc: antiword if installed, else the OLE piece-table reader"""
+    if antiword_available():
+        try:
+            return extract_with_antiword(file_path).strip()
+        except Exception as e:
+            logger.warning("antiword failed, falling back to OLE parser: %s", e)
+    return extract_with_olefile(file_path).strip()
@@ -0,0 +1,153 @@
+import json
+import re
+from typing import Any, Optional, Tuple
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PYTHON_LITERAL_RE = re.compile(r"(?<![\w\"])(True|False|None)(?![\w\"])")
+_DANGLING_KEY_RE = re.compile(r'[,{]\s*"(?:[^"\\]|\\.)*"$')
+_PARTIAL_SCALAR_RE = re.compile(r"[-+.\w]+$")
+
+
+def _scan(fragment: str) -> Tuple[list, bool]:
+    """Return the stack of unclosed brackets and whether a string is still open"""
+    stack, in_string, escaped = [], False, False
+    for ch in fragment:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    return stack, in_string
+
+
+def complete_json(fragment: str) -> str:
+    """
+    Close a truncated JSON document so it parses: finish an open string,
+    drop a dangling comma or key, and append the missing closing brackets.
+    """
+    stack, in_string = _scan(fragment)
+    text = fragment
+    if in_string:
+        if text.endswith("\\"):
+            text = text[:-1]
+        text += '"'
+    text = text.rstrip().rstrip(",").rstrip()
+
+    if stack and stack[-1] == "}":
+        if text.endswith(":"):
+            # A key whose value was cut off
+            text += " null"
+        else:
+            # A key without its colon: {"a": 1, "b"
+            key = _DANGLING_KEY_RE.search(text)
+            if key:
+                text = text[:key.start() + 1].rstrip(",").rstrip()
+
+    return text + "".join(reversed(stack))
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the JSON object in an LLM response, repairing near-valid output.
+
+    Handles code fences, prose or stray braces around the object, trailing
+    commas, Python literals and truncation. Raises ValueError if nothing
+    usable can be recovered.
+    """
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1)
+
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("No JSON object found in response")
+    text = text[start:]
+
+    decoder = json.JSONDecoder()
+    try:
+        # raw_decode ignores anything after the first complete object
+        return decoder.raw_decode(text)[0]
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _TRAILING_COMMA_RE.sub(r"\1", text)
+    repaired = _PYTHON_LITERAL_RE.sub(lambda m: _PYTHON_LITERALS[m.group(1)], repaired)
+    try:
+        return decoder.raw_decode(repaired)[0]
+    except json.JSONDecodeError:
+        pass
+
+    # Truncated output: close what is open, backing off to earlier commas
+    candidate = repaired
+    for _ in range(200):
+        try:
+            return json.loads(_TRAILING_COMMA_RE.sub(r"\1", complete_json(candidate)))
+        except json.JSONDecodeError:
+            # First drop a half-written number or literal, then whole items
+            partial = _PARTIAL_SCALAR_RE.search(candidate)
+            if partial:
+                candidate = candidate[:partial.start()]
+                continue
+            cut = candidate.rfind(",")
+            if cut <= 0:
+                break
+            candidate = candidate[:cut]
+
+    raise ValueError("Could not repair JSON in response")
+
+
+class PartialJSONParser:
+    """
+    Incremental parser for a JSON object that arrives in chunks.
+
+    `feed` returns a snapshot of the object parsed up to the last completed
+    value (a `,` or closing bracket outside a string), or None when no new
+    value has completed since the previous snapshot. Values in a snapshot are
+    never partial strings or numbers, though the innermost containers may
+    still be missing entries.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.boundary = 0
+        self._parsed_boundary = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        offset = len(self.buffer)
+        self.buffer += chunk
+        for position, ch in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in ",}]":
+                self.boundary = position + 1
+
+        if self.boundary == self._parsed_boundary:
+            return None
+        self._parsed_boundary = self.boundary
+        prefix = self.buffer[:self.boundary]
+        start = prefix.find("{")
+        if start < 0:
+            return None
+        try:
+            return json.loads(complete_json(prefix[start:]))
+        except json.JSONDecodeError:
+            return None
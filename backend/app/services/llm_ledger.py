@@ -0,0 +1,260 @@
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import get_engine
+from ..models import Job, LLMCall
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Entries held while the database is unreachable; the oldest are dropped beyond this
+MAX_BUFFERED = 10000
+
+_TOTAL_KEYS = (
+    "calls", "errors", "retries", "input_tokens", "output_tokens", "cache_creation_input_tokens",
+    "cache_read_input_tokens", "cost_usd", "avg_latency_ms", "p95_latency_ms", "wall_seconds",
+)
+
+
+class LLMLedger:
+    """
+    Buffers one entry per Claude call and writes them to llm_calls in
+    batches: every `flush_seconds`, or as soon as `batch_size` entries are
+    waiting. The flusher task starts with the app (or with the first entry
+    on a running event loop); `stop` writes whatever is left.
+    """
+
+    def __init__(self, batch_size: int, flush_seconds: float):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def record(
+        self,
+        operation: str,
+        model: str,
+        usage=None,
+        cost_usd: float = 0.0,
+        job_id: Optional[int] = None,
+        candidate_id: Optional[int] = None,
+        latency: float = 0.0,
+        wall: float = 0.0,
+        retries: int = 0,
+        error: Optional[str] = None
+    ):
+        """Queue one call; never touches the database"""
+        entry = {
+            "created_at": datetime.now(timezone.utc),
+            "operation": operation,
+            "job_id": job_id,
+            "candidate_id": candidate_id,
+            "model": model,
+            "input_tokens": usage.input_tokens if usage else 0,
+            "output_tokens": usage.output_tokens if usage else 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+            "cost_usd": cost_usd,
+            "latency_ms": round(latency * 1000),
+            "wall_ms": round(max(wall, latency) * 1000),
+            "retries": retries,
+            "error": error,
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            self._trim()
+            full = len(self._buffer) >= self.batch_size
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (scripts, threads): written by flush() or stop()
+        self.start()
+        if full:
+            self._wake.set()
+
+    def _trim(self):
+        overflow = len(self._buffer) - MAX_BUFFERED
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning("LLM ledger buffer full, dropped %d entries (%d in total)", overflow, self.dropped)
+
+    def start(self):
+        """Start the flusher on the running loop, unless it is already running there"""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wake = asyncio.Event()
+        # An empty context, so the flusher's queries are not traced as part of
+        # whichever request happened to record the first entry
+        self._task = contextvars.Context().run(loop.create_task, self._run(self._wake))
+
+    async def _run(self, wake: asyncio.Event):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=self.flush_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+                await loop.run_in_executor(None, self.flush)
+        finally:
+            # Cancelled at shutdown: write the rest
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered entries in one executemany; kept for the next flush on failure"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                with get_engine().begin() as connection:
+                    connection.execute(insert(LLMCall), rows)
+            except Exception:
+                logger.exception("could not write %d LLM ledger entries, will retry", len(rows))
+                with self._lock:
+                    self._buffer[:0] = rows
+                    self._trim()
+                return 0
+            return len(rows)
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.flush()
+
+
+@lru_cache()
+def get_llm_ledger() -> LLMLedger:
+    return LLMLedger(batch_size=settings.llm_ledger_batch_size, flush_seconds=settings.llm_ledger_flush_seconds)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Linearly interpolated percentile, as PostgreSQL's percentile_cont"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class LLMCostService:
+    """Cost and latency of Claude calls per job and per stage, from the ledger"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _conditions(self, job_id: Optional[int], days: Optional[int]):
+        conditions = []
+        if job_id is not None:
+            conditions.append(LLMCall.job_id == job_id)
+        if days:
+            conditions.append(LLMCall.created_at >= datetime.now(timezone.utc) - timedelta(days=days))
+        return conditions
+
+    def _aggregate(self, key, conditions) -> Dict[Any, Dict[str, Any]]:
+        """Totals and latency percentiles grouped by one ledger column"""
+        postgres = self.db.bind.dialect.name == "postgresql"
+        columns = [
+            func.count(LLMCall.id),
+            func.count(LLMCall.error),
+            func.sum(LLMCall.retries),
+            func.sum(LLMCall.input_tokens),
+            func.sum(LLMCall.output_tokens),
+            func.sum(LLMCall.cache_creation_input_tokens),
+            func.sum(LLMCall.cache_read_input_tokens),
+            func.sum(LLMCall.cost_usd),
+            func.avg(LLMCall.latency_ms),
+            func.sum(LLMCall.wall_ms),
+        ]
+        if postgres:
+            columns.append(func.percentile_cont(0.95).within_group(LLMCall.latency_ms))
+        rows = self.db.query(key, *columns).filter(*conditions).group_by(key).all()
+
+        p95 = {}
+        if not postgres:
+            # No percentile aggregate in SQLite: compute from the latencies
+            latencies = defaultdict(list)
+            for group, latency in self.db.query(key, LLMCall.latency_ms).filter(*conditions):
+                latencies[group].append(latency or 0)
+            p95 = {group: percentile(values, 0.95) for group, values in latencies.items()}
+
+        result = {}
+        for row in rows:
+            group, calls, errors, retries, input_tokens, output_tokens, cache_write, cache_read, cost, avg, wall = row[:11]
+            result[group] = {
+                "calls": calls,
+                "errors": errors,
+                "retries": retries or 0,
+                "input_tokens": input_tokens or 0,
+                "output_tokens": output_tokens or 0,
+                "cache_creation_input_tokens": cache_write or 0,
+                "cache_read_input_tokens": cache_read or 0,
+                "cost_usd": round(cost or 0.0, 6),
+                "avg_latency_ms": round(float(avg or 0), 1),
+                "p95_latency_ms": round(float(row[11] if postgres else p95.get(group, 0.0)), 1),
+                "wall_seconds": round((wall or 0) / 1000, 1),
+            }
+        return result
+
+    def by_job(self, days: Optional[int] = None, limit: int = 20, order_by: str = "cost") -> List[Dict[str, Any]]:
+        """Jobs ranked by LLM spend ("cost") or total call wall time ("wall_time")"""
+        totals = self._aggregate(LLMCall.job_id, self._conditions(None, days))
+        sort_key = "wall_seconds" if order_by == "wall_time" else "cost_usd"
+        ranked = sorted(totals.items(), key=lambda item: item[1][sort_key], reverse=True)[:limit]
+
+        job_ids = [job_id for job_id, _ in ranked if job_id is not None]
+        titles = dict(self.db.query(Job.id, Job.title).filter(Job.id.in_(job_ids))) if job_ids else {}
+        return [{"job_id": job_id, "title": titles.get(job_id), **stats} for job_id, stats in ranked]
+
+    def by_stage(self, job_id: Optional[int] = None, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per operation (parse_cv, match_cv_to_job, ...) totals, most expensive first"""
+        stages = self._aggregate(LLMCall.operation, self._conditions(job_id, days))
+        return [
+            {"operation": operation, **stats}
+            for operation, stats in sorted(stages.items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+        ]
+
+    def by_model(self, job_id: Optional[int] = None, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Per model totals, most expensive first"""
+        models = self._aggregate(LLMCall.model, self._conditions(job_id, days))
+        return [
+            {"model": model, **stats}
+            for model, stats in sorted(models.items(), key=lambda item: item[1]["cost_usd"], reverse=True)
+        ]
+
+    def job_summary(self, job_id: int, days: Optional[int] = None) -> Dict[str, Any]:
+        """Totals for one job plus its per-stage and per-model breakdowns"""
+        totals = self._aggregate(LLMCall.job_id, self._conditions(job_id, days)).get(job_id)
+        if totals is None:
+            totals = {key: 0 for key in _TOTAL_KEYS}
+        return {
+            "job_id": job_id, **totals,
+            "stages": self.by_stage(job_id, days),
+            "models": self.by_model(job_id, days),
+        }
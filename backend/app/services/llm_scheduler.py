@@ -0,0 +1,325 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from ..config import get_settings
+from ..metrics import (
+    LLM_ACTIVE, LLM_CALL_SECONDS, LLM_CALL_TOKENS, LLM_PARSE_OUTCOMES, LLM_QUEUED, LLM_RETRIES
+)
+from ..tracing import set_attributes
+from .llm_ledger import LLMLedger, get_llm_ledger
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower values are admitted first
+PRIORITY_INTERACTIVE = 0  # A user is waiting on the response (JD extraction)
+PRIORITY_BULK = 10  # Background screening (CV parsing and matching)
+
+# USD per million tokens: (input, output, cache write, cache read), matched by model prefix
+MODEL_PRICES = {
+    "claude-opus-4": (15.0, 75.0, 18.75, 1.50),
+    "claude-sonnet-4": (3.0, 15.0, 3.75, 0.30),
+    "claude-3-7-sonnet": (3.0, 15.0, 3.75, 0.30),
+    "claude-haiku-4": (1.0, 5.0, 1.25, 0.10),
+    "claude-3-5-haiku": (0.80, 4.0, 1.0, 0.08),
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def call_cost(model: str, usage) -> float:
+    """USD cost of one call from its response usage"""
+    prices = next((p for prefix, p in MODEL_PRICES.items() if model.startswith(prefix)), None)
+    if prices is None or usage is None:
+        return 0.0
+    input_price, output_price, write_price, read_price = prices
+    return (
+        usage.input_tokens * input_price
+        + usage.output_tokens * output_price
+        + (getattr(usage, "cache_creation_input_tokens", 0) or 0) * write_price
+        + (getattr(usage, "cache_read_input_tokens", 0) or 0) * read_price
+    ) / 1_000_000
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)"""
+        self._refill()
+        # Requests larger than the bucket only need it to be full
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate) if needed > 0 else 0.0
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= amount
+
+    def adjust(self, amount: float):
+        """Correct an earlier reservation once the real usage is known"""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class LLMScheduler:
+    """
+    Central admission control for all Claude calls.
+
+    Calls wait for a concurrency slot and for room in the requests-per-minute
+    and tokens-per-minute buckets, highest priority lane first. Rate-limit,
+    overload and transient network errors are retried with exponential
+    backoff and full jitter; a 429 pauses every caller for the retry-after
+    period. Latency, token and retry metrics are recorded per operation, and
+    every call is written to the ledger (per job cost and usage) if one is
+    given.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        ledger: Optional[LLMLedger] = None
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.ledger = ledger
+
+        self.active = 0
+        self.paused_until = 0.0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._changed: Optional[asyncio.Event] = None
+        self._loop = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiting)
+
+    def _event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters never span event loops; start clean on a new one
+            self._loop = loop
+            self._changed = asyncio.Event()
+            self._waiting = []
+            self.active = 0
+        return self._changed
+
+    def _notify(self):
+        LLM_QUEUED.set(len(self._waiting))
+        LLM_ACTIVE.set(self.active)
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _acquire(self, priority: int, tokens: int):
+        changed = self._event()
+        entry = (priority, next(self._sequence))
+        heapq.heappush(self._waiting, entry)
+        try:
+            while True:
+                delay = None
+                if self._waiting[0] == entry and self.active < self.max_concurrency:
+                    delay = max(
+                        self.paused_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(tokens)
+                    )
+                    if delay <= 0:
+                        heapq.heappop(self._waiting)
+                        self.requests.consume(1)
+                        self.tokens.consume(tokens)
+                        self.active += 1
+                        self._notify()
+                        return
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                changed = self._changed
+        except BaseException:
+            if entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._notify()
+            raise
+
+    def _release(self):
+        self.active -= 1
+        self._notify()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        import anthropic
+
+        if isinstance(error, (anthropic.APIConnectionError, anthropic.APITimeoutError)):
+            return True
+        if isinstance(error, anthropic.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES
+        return False
+
+    async def run(
+        self,
+        operation: str,
+        call: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        priority: int = PRIORITY_BULK,
+        job_id: Optional[int] = None,
+        model: str = "",
+        candidate_id: Optional[int] = None
+    ):
+        """Run `call` under the rate limits, retrying transient failures"""
+        attempt = 0
+        first_queued = time.perf_counter()
+        while True:
+            queued = time.perf_counter()
+            await self._acquire(priority, estimated_tokens)
+            started = time.perf_counter()
+            try:
+                response = await call()
+            except Exception as error:
+                failed = time.perf_counter()
+                self._release()
+                if not self.is_retryable(error) or attempt >= self.max_retries:
+                    if self.ledger is not None:
+                        self.ledger.record(
+                            operation, model, job_id=job_id, candidate_id=candidate_id, latency=failed - started,
+                            wall=failed - first_queued, retries=attempt, error=error.__class__.__name__
+                        )
+                    raise
+                delay = self._retry_delay(attempt, error)
+                if getattr(error, "status_code", None) == 429:
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                attempt += 1
+                self._record(operation, model, None, retried=True)
+                logger.warning(
+                    "claude %s failed (%s), retry %d/%d in %.1fs",
+                    operation, error.__class__.__name__, attempt, self.max_retries, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self._release()
+            now = time.perf_counter()
+            self.settle(
+                job_id, operation, model, getattr(response, "usage", None), estimated_tokens,
+                latency=now - started, candidate_id=candidate_id, retries=attempt, wall=now - first_queued
+            )
+            # Queue wait of the final attempt; earlier attempts show as retries
+            set_attributes(**{"llm.attempts": attempt + 1, "llm.queue_wait_ms": round((started - queued) * 1000, 1)})
+            return response
+
+    @asynccontextmanager
+    async def admit(self, priority: int, estimated_tokens: int):
+        """
+        Hold a concurrency slot for a call the caller drives itself (streaming).
+        No retries; report usage with `settle` once the call finishes.
+        """
+        await self._acquire(priority, estimated_tokens)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def settle(
+        self,
+        job_id: Optional[int],
+        operation: str,
+        model: str,
+        usage,
+        estimated_tokens: int,
+        latency: float = 0.0,
+        candidate_id: Optional[int] = None,
+        retries: int = 0,
+        wall: float = 0.0
+    ):
+        """Correct the token reservation with real usage and record the call"""
+        if usage is not None:
+            self.tokens.adjust(usage.input_tokens + usage.output_tokens - estimated_tokens)
+        self._record(operation, model, usage, latency=latency)
+        if self.ledger is not None:
+            self.ledger.record(
+                operation, model, usage, call_cost(model, usage), job_id=job_id, candidate_id=candidate_id,
+                latency=latency, wall=wall, retries=retries
+            )
+
+    def _record(
+        self,
+        operation: str,
+        model: str,
+        usage,
+        retried: bool = False,
+        latency: float = 0.0
+    ):
+        if retried:
+            LLM_RETRIES.labels(operation).inc()
+            return
+        if latency:
+            LLM_CALL_SECONDS.labels(operation, model).observe(latency)
+        if usage is not None:
+            LLM_CALL_TOKENS.labels(operation, model, "input").observe(usage.input_tokens)
+            LLM_CALL_TOKENS.labels(operation, model, "output").observe(usage.output_tokens)
+
+    def record_parse(self, operation: str, outcome: str):
+        """
+        Count a structured-output outcome: parse "repaired", "failures" or
+        "retries", or "escalations" to the stronger model
+        """
+        LLM_PARSE_OUTCOMES.labels(operation, outcome).inc()
+
+
+@lru_cache()
+def get_llm_scheduler() -> LLMScheduler:
+    settings = get_settings()
+    # The configured limits are for the whole deployment; split them between
+    # worker processes, which each run their own scheduler
+    workers = max(1, settings.llm_workers or settings.web_workers)
+    if workers > 1:
+        logger.info("LLM limits shared by %d workers, this worker gets 1/%d", workers, workers)
+    return LLMScheduler(
+        requests_per_minute=settings.llm_requests_per_minute / workers,
+        tokens_per_minute=settings.llm_tokens_per_minute // workers,
+        max_concurrency=max(1, settings.llm_max_concurrency // workers),
+        max_retries=settings.llm_max_retries,
+        ledger=get_llm_ledger() if settings.llm_ledger_enabled else None
+    )
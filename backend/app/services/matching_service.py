@@ -1,19 +1,32 @@
-from typing import List, Dict, Any
+import asyncio
+import logging
+import time
+from typing import List, Dict, Any, Optional, Set, Tuple
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 
-from ..models import Job, Candidate, MatchResult
+from ..config import get_settings
+from ..metrics import screening_slot, span, timed
+from ..models import Job, Candidate, MatchResult, ScreeningStatus
 from .claude_service import ClaudeService
+from .cv_preparser import CVPreparser
+from .prescreen_service import PrescreenService
+from .scoring_policy import CompiledPolicy, ScoringPolicyService
+from .text_normalizer import normalize_cv_text
 
-# African Union least represented member states (this can be configured)
-LEAST_REPRESENTED_COUNTRIES = [
-    "Botswana", "Cabo Verde", "Central African Republic", "Chad",
-    "Comoros", "Djibouti", "Equatorial Guinea", "Eritrea", "Eswatini",
-    "Gabon", "Gambia", "Guinea-Bissau", "Lesotho", "Liberia", "Libya",
-    "Madagascar", "Malawi", "Mauritania", "Mauritius", "Mozambique",
-    "Namibia", "Niger", "Sao Tome and Principe", "Seychelles",
-    "Sierra Leone", "Somalia", "South Sudan", "Togo"
-]
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+def diff_criteria(
+    old: List[Dict[str, Any]],
+    new: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """Criteria that are new or differ from their old version (by id), and ids no longer present"""
+    old_by_id = {c.get("id"): c for c in old or []}
+    new_ids = {c.get("id") for c in new or []}
+    changed = [c for c in new or [] if old_by_id.get(c.get("id")) != c]
+    return changed, set(old_by_id) - new_ids
 
 
 class MatchingService:
@@ -21,23 +34,41 @@ class MatchingService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.claude_service = ClaudeService()
-
+        self._claude_service: Optional[ClaudeService] = None
+        self._policy: Optional[CompiledPolicy] = None
+
+    @property
+    def claude_service(self) -> ClaudeService:
+        """Created on first use; recomputing and ranking never call Claude"""
+        if self._claude_service is None:
+            self._claude_service = ClaudeService()
+        return self._claude_service
+
+    @claude_service.setter
+    def claude_service(self, service: ClaudeService):
+        self._claude_service = service
+
+    @property
+    def policy(self) -> CompiledPolicy:
+        """The active scoring policy, loaded once per service instance"""
+        if self._policy is None:
+            self._policy = ScoringPolicyService.active(self.db)
+        return self._policy
+
+    @timed("matching.process_job_description")
     async def process_job_description(self, job: Job) -> Job:
         """Extract criteria from job description using Claude"""
         criteria = await self.claude_service.extract_job_criteria(
             job.raw_jd_text,
-            job.title
+            job.title,
+            job_id=job.id
         )
 
         job.education_criteria = criteria.get("education_criteria", [])
         job.experience_criteria = criteria.get("experience_criteria", [])
 
         # Set cutoff based on grade level
-        if job.grade_level.value in ["P5", "P6", "D1", "D2"]:
-            job.min_pass_mark = 70
-        else:
-            job.min_pass_mark = 60
+        job.min_pass_mark = self.policy.pass_mark(job.grade_level)
 
         job.status = "active"
         self.db.commit()
@@ -45,12 +76,26 @@ class MatchingService:
 
         return job
 
+    @timed("matching.process_candidate_cv")
     async def process_candidate_cv(self, candidate: Candidate) -> Candidate:
         """Parse candidate CV using Claude"""
         if not candidate.cv_raw_text:
             raise ValueError("CV text not available")
 
-        parsed_data = await self.claude_service.parse_cv(candidate.cv_raw_text)
+        preparsed = CVPreparser.preparse(candidate.cv_raw_text)
+        cv_text, stats = normalize_cv_text(candidate.cv_raw_text, settings.cv_token_budget)
+        logger.info(
+            "cv normalized candidate=%s pages=%d tokens_before=%d tokens_after=%d "
+            "boilerplate_lines=%d dropped_sections=%s",
+            candidate.id, stats["pages"], stats["tokens_before"], stats["tokens_after"],
+            stats["boilerplate_lines"], stats["dropped_sections"]
+        )
+        parsed_data = await self.claude_service.parse_cv(
+            cv_text,
+            job_id=candidate.job_id,
+            preparsed=preparsed,
+            candidate_id=candidate.id
+        )
 
         # Update candidate with parsed data
         personal_info = parsed_data.get("personal_info", {})
@@ -59,7 +104,7 @@ class MatchingService:
         candidate.phone = personal_info.get("phone")
 
         # Gender
-        gender_str = personal_info.get("gender", "not_specified").lower()
+        gender_str = (personal_info.get("gender") or "not_specified").lower()
         if gender_str == "male":
             candidate.gender = "male"
         elif gender_str == "female":
@@ -80,9 +125,7 @@ class MatchingService:
 
         # Check if least represented country
         if candidate.nationality:
-            candidate.is_least_represented_country = (
-                candidate.nationality in LEAST_REPRESENTED_COUNTRIES
-            )
+            candidate.is_least_represented_country = self.policy.is_least_represented(candidate.nationality)
 
         # Disability
         candidate.has_disability = parsed_data.get("disability_mentioned", False)
@@ -94,12 +137,14 @@ class MatchingService:
         candidate.skills = parsed_data.get("skills", {})
         candidate.certifications = parsed_data.get("certifications", [])
         candidate.parsed_cv_data = parsed_data
+        candidate.refresh_search_fields()
 
         self.db.commit()
         self.db.refresh(candidate)
 
         return candidate
 
+    @timed("matching.match_candidate_to_job")
     async def match_candidate_to_job(self, candidate: Candidate, job: Job) -> MatchResult:
         """Match a single candidate to a job"""
         # Get matching scores from Claude
@@ -107,7 +152,9 @@ class MatchingService:
             cv_data=candidate.parsed_cv_data,
             education_criteria=job.education_criteria,
             experience_criteria=job.experience_criteria,
-            job_title=job.title
+            job_title=job.title,
+            job_id=job.id,
+            candidate_id=candidate.id
         )
 
         # Create or update match result
@@ -133,41 +180,9 @@ class MatchingService:
 
         # Base score
         match_result.base_score = match_data.get("base_score", 0)
+        match_result.screening_status = ScreeningStatus.SCORED
 
-        # Calculate bonuses
-        # Female bonus
-        if candidate.gender == "female":
-            match_result.bonus_female = 5
-        else:
-            match_result.bonus_female = 0
-
-        # Age bonus (35 or under)
-        if candidate.date_of_birth:
-            age = self._calculate_age(candidate.date_of_birth)
-            if age and age <= 35:
-                match_result.bonus_age = 5
-            else:
-                match_result.bonus_age = 0
-        else:
-            match_result.bonus_age = 0
-
-        # Least represented country bonus
-        if candidate.is_least_represented_country:
-            match_result.bonus_least_represented = 5
-        else:
-            match_result.bonus_least_represented = 0
-
-        # Inclusion/disability bonus
-        if candidate.has_disability:
-            match_result.bonus_inclusion = 5
-        else:
-            match_result.bonus_inclusion = 0
-
-        # Calculate totals
-        match_result.calculate_final_score()
-
-        # Check if passes cutoff
-        match_result.passes_cutoff = match_result.base_score >= job.min_pass_mark
+        self._apply_policy(match_result, candidate, job)
 
         # AI analysis
         match_result.overall_reasoning = match_data.get("overall_reasoning", "")
@@ -181,23 +196,121 @@ class MatchingService:
 
         return match_result
 
-    async def process_all_candidates(self, job_id: int) -> List[MatchResult]:
-        """Process and match all candidates for a job"""
+    @timed("matching.rescore_changed_criteria")
+    async def rescore_changed_criteria(
+        self,
+        job: Job,
+        old_education_criteria: List[Dict[str, Any]],
+        old_experience_criteria: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        After a job's criteria were edited, re-score only the added or changed
+        criteria for every scored candidate, drop scores of removed criteria,
+        then recompute totals, bonuses, cutoffs and ranks locally.
+        """
+        education_changed, education_removed = diff_criteria(old_education_criteria, job.education_criteria)
+        experience_changed, experience_removed = diff_criteria(old_experience_criteria, job.experience_criteria)
+        summary = {
+            "changed": [c["id"] for c in education_changed + experience_changed],
+            "removed": sorted(education_removed | experience_removed),
+            "rescored": 0,
+            "skipped": 0,
+            "failed": 0,
+        }
+        if not summary["changed"] and not summary["removed"]:
+            return summary
+
+        results = self.db.query(MatchResult).filter(
+            MatchResult.job_id == job.id,
+            MatchResult.screening_status == ScreeningStatus.SCORED
+        ).all()
+        semaphore = asyncio.Semaphore(settings.screening_concurrency)
+
+        async def rescore(match_result: MatchResult) -> bool:
+            """False when changed criteria could not be scored for lack of parsed CV data"""
+            education_scores = {
+                k: v for k, v in (match_result.education_scores or {}).items() if k not in education_removed
+            }
+            experience_scores = {
+                k: v for k, v in (match_result.experience_scores or {}).items() if k not in experience_removed
+            }
+            scored = not summary["changed"] or bool(match_result.candidate.parsed_cv_data)
+            if summary["changed"] and scored:
+                async with screening_slot(semaphore):
+                    scores = await self.claude_service.score_criteria(
+                        cv_data=match_result.candidate.parsed_cv_data,
+                        education_criteria=education_changed,
+                        experience_criteria=experience_changed,
+                        job_title=job.title,
+                        job_id=job.id,
+                        candidate_id=match_result.candidate_id
+                    )
+                education_scores.update(scores["education_scores"])
+                experience_scores.update(scores["experience_scores"])
+
+            # Reassign (not mutate) so the JSON columns are flagged as changed
+            match_result.education_scores = education_scores
+            match_result.experience_scores = experience_scores
+            self._apply_policy(match_result, match_result.candidate, job)
+            return scored
+
+        outcomes = await asyncio.gather(*(rescore(r) for r in results), return_exceptions=True)
+        for result, outcome in zip(results, outcomes):
+            if isinstance(outcome, BaseException):
+                # The old scores stay; a full re-match will refresh this candidate
+                summary["failed"] += 1
+                logger.warning("Re-scoring match result %s failed: %s", result.id, outcome)
+            elif outcome:
+                summary["rescored"] += 1
+            else:
+                # Removed criteria are still dropped; the changed ones need a full re-match
+                summary["skipped"] += 1
+        self.db.commit()
+        self._rank_candidates(job.id)
+
+        logger.info(
+            "job %s criteria rescored changed=%s removed=%s rescored=%d skipped=%d failed=%d",
+            job.id, summary["changed"], summary["removed"], summary["rescored"], summary["skipped"],
+            summary["failed"]
+        )
+        return summary
+
+    @timed("matching.process_all_candidates")
+    async def process_all_candidates(
+        self,
+        job_id: int,
+        prescreen_top_k: Optional[int] = None,
+        prescreen_min_score: Optional[float] = None
+    ) -> List[MatchResult]:
+        """
+        Process and match all candidates for a job.
+
+        When a pre-screen limit is given, candidates are first ranked locally
+        and only the shortlist is parsed and scored by Claude.
+        """
         job = self.db.query(Job).filter(Job.id == job_id).first()
         if not job:
             raise ValueError("Job not found")
 
         candidates = self.db.query(Candidate).filter(Candidate.job_id == job_id).all()
 
-        results = []
-        for candidate in candidates:
-            # Parse CV if not already parsed
-            if not candidate.parsed_cv_data:
-                await self.process_candidate_cv(candidate)
-
-            # Match to job
-            result = await self.match_candidate_to_job(candidate, job)
-            results.append(result)
+        prescreen_scores = {}
+        shortlisted, rejected = candidates, []
+        if prescreen_top_k or prescreen_min_score is not None:
+            with span("matching.prescreen"):
+                prescreen_scores = PrescreenService.score_candidates(job, candidates)
+                shortlisted, rejected = PrescreenService.select(
+                    candidates, prescreen_scores, prescreen_top_k, prescreen_min_score
+                )
+
+        with span("matching.screen_candidates"):
+            results = await self._screen_candidates(shortlisted, job, prescreen_scores)
+
+        for candidate in rejected:
+            results.append(
+                self._record_prescreen_rejection(candidate, job, prescreen_scores.get(candidate.id, 0.0))
+            )
+        self.db.commit()
 
         # Rank candidates
         self._rank_candidates(job_id)
@@ -209,18 +322,324 @@ class MatchingService:
 
         return results
 
+    async def _screen_candidates(
+        self,
+        candidates: List[Candidate],
+        job: Job,
+        prescreen_scores: Dict[int, float]
+    ) -> List[MatchResult]:
+        """
+        Parse (if needed) and match candidates, several at a time.
+
+        Claude calls are rate limited by the shared LLM scheduler; database
+        work between calls is synchronous, so the session is never used by
+        two coroutines at once.
+        """
+        semaphore = asyncio.Semaphore(settings.screening_concurrency)
+
+        async def screen(candidate: Candidate) -> MatchResult:
+            async with screening_slot(semaphore):
+                # Parse CV if not already parsed
+                if not candidate.parsed_cv_data:
+                    await self.process_candidate_cv(candidate)
+
+                # Match to job
+                result = await self.match_candidate_to_job(candidate, job)
+                result.prescreen_score = prescreen_scores.get(candidate.id)
+                return result
+
+        outcomes = await asyncio.gather(*(screen(c) for c in candidates), return_exceptions=True)
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if errors:
+            # Keep the successful results, then surface the first failure
+            self.db.commit()
+            raise errors[0]
+        return list(outcomes)
+
+    @timed("matching.match_from_talent_pool")
+    async def match_from_talent_pool(self, job_id: int, limit: int = 50) -> Dict[str, Any]:
+        """
+        Score already-parsed candidates from other jobs against this job.
+
+        The pool is ranked locally against the job criteria and only the top
+        `limit` candidates are sent to Claude. Results reference the existing
+        Candidate rows, so no CV is stored twice.
+        """
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError("Job not found")
+
+        already_matched = self.db.query(MatchResult.candidate_id).filter(
+            MatchResult.job_id == job_id
+        )
+        # People who applied to, or were already matched against, this job
+        known_emails = {
+            email.lower() for (email,) in self.db.query(Candidate.email).filter(
+                (Candidate.job_id == job_id) | Candidate.id.in_(already_matched),
+                Candidate.email.isnot(None)
+            )
+        }
+
+        pool = self.db.query(Candidate).filter(
+            Candidate.job_id != job_id,
+            Candidate.parsed_cv_data.isnot(None),
+            Candidate.id.notin_(already_matched)
+        ).order_by(Candidate.updated_at.desc()).all()
+
+        # The same person may have applied to several vacancies; keep their latest CV
+        candidates, seen_emails = [], set(known_emails)
+        for candidate in pool:
+            if not candidate.parsed_cv_data:
+                continue
+            email = (candidate.email or "").lower()
+            if email and email in seen_emails:
+                continue
+            if email:
+                seen_emails.add(email)
+            candidates.append(candidate)
+
+        scores = PrescreenService.score_candidates(job, candidates, PrescreenService.parsed_text)
+        shortlist = [c for c in candidates if scores.get(c.id, 0) > 0]
+        shortlist, _ = PrescreenService.select(shortlist, scores, top_k=limit)
+
+        results = await self._screen_candidates(shortlist, job, scores)
+        self.db.commit()
+
+        self._rank_candidates(job_id)
+
+        return {
+            "pool_size": len(candidates),
+            "shortlisted": len(shortlist),
+            "results": results,
+        }
+
+    def _record_prescreen_rejection(self, candidate: Candidate, job: Job, score: float) -> MatchResult:
+        """
+        Store a zero-score result for a candidate rejected by pre-screening.
+        A result Claude already scored keeps its scores (they were paid for);
+        only its pre-screen score is updated.
+        """
+        match_result = self.db.query(MatchResult).filter(
+            MatchResult.candidate_id == candidate.id,
+            MatchResult.job_id == job.id
+        ).first()
+
+        if match_result and match_result.screening_status == ScreeningStatus.SCORED:
+            match_result.prescreen_score = score
+            return match_result
+
+        if not match_result:
+            match_result = MatchResult(
+                job_id=job.id,
+                candidate_id=candidate.id
+            )
+            self.db.add(match_result)
+
+        match_result.screening_status = ScreeningStatus.PRESCREEN_REJECTED
+        match_result.prescreen_score = score
+        match_result.education_scores = {}
+        match_result.education_total = 0
+        match_result.experience_scores = {}
+        match_result.experience_total = 0
+        match_result.bonus_female = 0
+        match_result.bonus_age = 0
+        match_result.bonus_least_represented = 0
+        match_result.bonus_inclusion = 0
+        match_result.calculate_final_score()
+        match_result.passes_cutoff = False
+        match_result.overall_reasoning = (
+            f"Not sent to full AI scoring: pre-screen relevance {score:.2f} "
+            "was outside the shortlist for this job."
+        )
+        match_result.strengths = []
+        match_result.weaknesses = []
+        match_result.flags = ["Rejected at pre-screening"]
+        match_result.recommendations = ""
+
+        return match_result
+
+    def _apply_policy(self, match_result: MatchResult, candidate: Candidate, job: Job):
+        """Section totals, bonuses, final score and cutoff under the active policy"""
+        job.min_pass_mark = self.policy.pass_mark(job.grade_level)
+        values = self.policy.evaluate(job, [match_result], [candidate], pass_mark=job.min_pass_mark)
+        for column in ("education_total", "experience_total", "base_score", "bonus_female", "bonus_age",
+                       "bonus_least_represented", "bonus_inclusion", "total_bonus", "final_score",
+                       "passes_cutoff"):
+            setattr(match_result, column, values[column][0])
+        match_result.policy_version = self.policy.version
+
+    @timed("matching.rank_candidates")
     def _rank_candidates(self, job_id: int):
         """Rank candidates by final score"""
-        results = self.db.query(MatchResult).filter(
-            MatchResult.job_id == job_id
-        ).order_by(MatchResult.final_score.desc()).all()
+        rows = self.db.query(
+            MatchResult.id, MatchResult.final_score, MatchResult.screening_status,
+            MatchResult.rank, MatchResult.is_in_longlist
+        ).filter(MatchResult.job_id == job_id).all()
+
+        updates = [
+            {"id": row.id, **ranking}
+            for row, ranking in zip(rows, self.policy.rank([r.final_score for r in rows], [r.id for r in rows],
+                                                           [r.screening_status for r in rows]))
+            if (row.rank, row.is_in_longlist) != (ranking["rank"], ranking["is_in_longlist"])
+        ]
+        self._bulk_update(MatchResult, updates)
+        self.db.commit()
 
-        for i, result in enumerate(results, 1):
-            result.rank = i
-            result.is_in_longlist = i <= 20  # Top 20
+    def _bulk_update(self, model, rows: List[Dict[str, Any]]):
+        """One executemany UPDATE by primary key, bypassing the ORM unit of work"""
+        if not rows:
+            return
+        table = model.__table__
+        columns = [key for key in rows[0] if key != "id"]
+        statement = update(table).where(table.c.id == bindparam("_id")).values(
+            {column: bindparam(column) for column in columns}
+        )
+        self.db.execute(statement, [{"_id": row["id"], **{c: row[c] for c in columns}} for row in rows])
+
+    def _score_rows(self, job: Job, policy: CompiledPolicy):
+        """
+        Plain column tuples of a job's results joined with their candidates,
+        and their section totals under `policy`. Stored totals are reused when
+        they were computed under the same section rules; only the remaining
+        results have their criterion score JSON loaded.
+        """
+        rows = self.db.query(
+            MatchResult.id, MatchResult.screening_status, MatchResult.education_total,
+            MatchResult.experience_total, MatchResult.bonus_female, MatchResult.bonus_age,
+            MatchResult.bonus_least_represented, MatchResult.bonus_inclusion, MatchResult.final_score,
+            MatchResult.passes_cutoff, MatchResult.rank, MatchResult.is_in_longlist, MatchResult.policy_version,
+            Candidate.id.label("candidate_id"), Candidate.full_name, Candidate.gender, Candidate.date_of_birth,
+            Candidate.nationality, Candidate.has_disability, Candidate.is_least_represented_country
+        ).join(Candidate, MatchResult.candidate_id == Candidate.id).filter(MatchResult.job_id == job.id).all()
+
+        reusable = set()
+        for version in {row.policy_version for row in rows if row.policy_version is not None}:
+            stored = ScoringPolicyService.get(self.db, version)
+            if stored and ScoringPolicyService.compile(stored).section_rules == policy.section_rules:
+                reusable.add(version)
+
+        stale = [row for row in rows if row.policy_version not in reusable]
+        computed = {}
+        if stale:
+            query = self.db.query(
+                MatchResult.id, MatchResult.education_scores, MatchResult.experience_scores
+            ).filter(MatchResult.job_id == job.id)
+            if reusable:
+                query = query.filter(
+                    MatchResult.policy_version.is_(None) | MatchResult.policy_version.notin_(reusable)
+                )
+            score_rows = query.all()
+            education, experience = policy.section_totals(job, score_rows)
+            computed = {row.id: totals for row, totals in zip(score_rows, zip(education, experience))}
+
+        education_total, experience_total = [], []
+        for row in rows:
+            totals = computed.get(row.id, (row.education_total or 0.0, row.experience_total or 0.0))
+            education_total.append(totals[0])
+            experience_total.append(totals[1])
+        return rows, (education_total, experience_total)
+
+    @timed("matching.recompute_job_scores")
+    def recompute_job_scores(self, job_id: int) -> Dict[str, Any]:
+        """
+        Re-apply the active scoring policy (section weights, bonuses, cutoff
+        and ranking) to every result of a job from the stored criterion scores
+        and candidate profiles, without calling Claude: e.g. after a policy
+        change or when candidates turn 36. Reads plain column tuples,
+        evaluates the rules column by column and writes changed rows with one
+        bulk UPDATE per table.
+        """
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError("Job not found")
 
+        started = time.perf_counter()
+        policy = self.policy
+        rows, totals = self._score_rows(job, policy)
+        job.min_pass_mark = policy.pass_mark(job.grade_level)
+        values = policy.evaluate(job, rows, rows, pass_mark=job.min_pass_mark, totals=totals)
+        rankings = policy.rank(values["final_score"], [r.id for r in rows], [r.screening_status for r in rows])
+
+        columns = ("education_total", "experience_total", "bonus_female", "bonus_age", "bonus_least_represented",
+                   "bonus_inclusion", "final_score", "passes_cutoff")
+        result_updates = []
+        for i, row in enumerate(rows):
+            changed = {column: values[column][i] for column in columns}
+            changed.update(rankings[i], policy_version=policy.version)
+            if any(getattr(row, key) != value for key, value in changed.items()):
+                result_updates.append({
+                    "id": row.id, "base_score": values["base_score"][i], "total_bonus": values["total_bonus"][i],
+                    **changed
+                })
+        candidate_updates = {
+            row.candidate_id: {"id": row.candidate_id, "is_least_represented_country": flag}
+            for row, flag in zip(rows, values["is_least_represented"])
+            if bool(row.is_least_represented_country) != flag
+        }
+
+        self._bulk_update(MatchResult, result_updates)
+        self._bulk_update(Candidate, list(candidate_updates.values()))
         self.db.commit()
 
+        summary = {
+            "job_id": job_id,
+            "policy_version": policy.version,
+            "pass_mark": job.min_pass_mark,
+            "results": len(rows),
+            "updated": len(result_updates),
+            "candidates_updated": len(candidate_updates),
+            "passing_cutoff": sum(values["passes_cutoff"]),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info("job %s scores recomputed %s", job_id, summary)
+        return summary
+
+    @timed("matching.what_if")
+    def what_if(self, job_id: int, policy: CompiledPolicy, limit: int = 100) -> Dict[str, Any]:
+        """
+        Rank a job's results under an alternate policy, in memory only:
+        nothing is written and Claude is not called. The pass mark comes from
+        the alternate policy for the job's grade.
+        """
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError("Job not found")
+
+        rows, totals = self._score_rows(job, policy)
+        pass_mark = policy.pass_mark(job.grade_level)
+        values = policy.evaluate(job, rows, rows, pass_mark=pass_mark, totals=totals)
+        rankings = policy.rank(values["final_score"], [r.id for r in rows], [r.screening_status for r in rows])
+
+        order = sorted(range(len(rows)), key=lambda i: rankings[i]["rank"])
+        return {
+            "job_id": job_id,
+            "policy_version": policy.version,
+            "pass_mark": pass_mark,
+            "total_candidates": len(rows),
+            "passing_cutoff": sum(values["passes_cutoff"]),
+            "rank_changes": sum(1 for row, ranking in zip(rows, rankings) if row.rank != ranking["rank"]),
+            "entered_longlist": [
+                rows[i].candidate_id for i in order if rankings[i]["is_in_longlist"] and not rows[i].is_in_longlist
+            ],
+            "left_longlist": [
+                rows[i].candidate_id for i in order if rows[i].is_in_longlist and not rankings[i]["is_in_longlist"]
+            ],
+            "results": [
+                {
+                    "result_id": rows[i].id,
+                    "candidate_id": rows[i].candidate_id,
+                    "candidate_name": rows[i].full_name,
+                    "final_score": values["final_score"][i],
+                    "rank": rankings[i]["rank"],
+                    "is_in_longlist": rankings[i]["is_in_longlist"],
+                    "passes_cutoff": values["passes_cutoff"][i],
+                    "current_final_score": rows[i].final_score,
+                    "current_rank": rows[i].rank,
+                }
+                for i in order[:limit]
+            ],
+        }
+
     def _calculate_age(self, dob: date) -> int:
         """Calculate age from date of birth"""
         today = date.today()
@@ -238,9 +657,8 @@ class MatchingService:
             MatchResult.job_id == job_id
         ).all()
 
-        candidates = self.db.query(Candidate).filter(
-            Candidate.job_id == job_id
-        ).all()
+        # Includes talent-pool candidates matched from other jobs
+        candidates = [r.candidate for r in results]
 
         total = len(results)
         if total == 0:
@@ -268,5 +686,8 @@ class MatchingService:
                 "highest": max(scores),
                 "lowest": min(scores)
             },
-            "longlist_count": sum(1 for r in results if r.is_in_longlist)
+            "longlist_count": sum(1 for r in results if r.is_in_longlist),
+            "prescreen_rejected": sum(
+                1 for r in results if r.screening_status == ScreeningStatus.PRESCREEN_REJECTED
+            )
         }
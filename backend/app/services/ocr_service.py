@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional
+
+from ..config import get_settings
+from ..tracing import in_context
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Pages with fewer extracted characters than this are treated as scanned images
+MIN_PAGE_CHARS = 20
+
+_CACHE_SIZE = 256
+_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    """Shared OCR pool; its size bounds concurrent tesseract processes"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.ocr_workers, thread_name_prefix="ocr")
+        return _executor
+
+
+class OCRService:
+    """OCR fallback for scanned (image-only) PDF pages using the tesseract binary"""
+
+    @staticmethod
+    def available() -> bool:
+        return settings.ocr_enabled and shutil.which(settings.tesseract_cmd) is not None
+
+    @staticmethod
+    def is_image_only(page, text: str) -> bool:
+        """Little or no text layer, but the page draws images (without decoding them)"""
+        if len("".join(text.split())) >= MIN_PAGE_CHARS:
+            return False
+        try:
+            resources = page.get("/Resources")
+            xobjects = resources.get_object().get("/XObject") if resources else None
+            if not xobjects:
+                return False
+            return any(
+                xobject.get_object().get("/Subtype") == "/Image"
+                for xobject in xobjects.get_object().values()
+            )
+        except Exception:
+            return False
+
+    @staticmethod
+    def _cache_key(content: bytes) -> str:
+        return hashlib.sha256(content + f"|{settings.ocr_language}".encode()).hexdigest()
+
+    @staticmethod
+    def _cache_get(key: str) -> Optional[List[str]]:
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+        if settings.ocr_cache_dir:
+            path = os.path.join(settings.ocr_cache_dir, f"{key}.json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    pages = json.load(f)
+            except (OSError, ValueError):
+                return None
+            OCRService._cache_put(key, pages, persist=False)
+            return pages
+        return None
+
+    @staticmethod
+    def _cache_put(key: str, pages: List[str], persist: bool = True):
+        with _cache_lock:
+            _cache[key] = pages
+            _cache.move_to_end(key)
+            while len(_cache) > _CACHE_SIZE:
+                _cache.popitem(last=False)
+        if persist and settings.ocr_cache_dir:
+            os.makedirs(settings.ocr_cache_dir, exist_ok=True)
+            tmp_path = os.path.join(settings.ocr_cache_dir, f"{key}.json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(pages, f)
+            os.replace(tmp_path, os.path.join(settings.ocr_cache_dir, f"{key}.json"))
+
+    @staticmethod
+    def ocr_image(data: bytes, timeout: float) -> str:
+        """Run tesseract on one image (PNG/JPEG/TIFF bytes) via stdin/stdout"""
+        result = subprocess.run(
+            [settings.tesseract_cmd, "stdin", "stdout", "-l", settings.ocr_language],
+            input=data,
+            capture_output=True,
+            timeout=max(timeout, 1)
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode(errors="replace").strip()[:200])
+        return result.stdout.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _ocr_page(images: List[bytes], deadline: float) -> str:
+        texts = []
+        for data in images:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            texts.append(OCRService.ocr_image(data, remaining))
+        return "\n".join(texts).strip()
+
+    @staticmethod
+    def fill_scanned_pages(file_path: str, reader, pages: List[str]) -> List[str]:
+        """
+        Replace the text of image-only pages with OCR output.
+
+        At most `ocr_max_pages` pages are OCR'd per document, all within
+        `ocr_timeout_seconds`; pages that miss the deadline keep their
+        (empty) text. Results are cached by file hash in memory and on disk.
+        """
+        scanned = [i for i, text in enumerate(pages) if OCRService.is_image_only(reader.pages[i], text)]
+        if not scanned:
+            return pages
+
+        with open(file_path, "rb") as f:
+            key = OCRService._cache_key(f.read())
+        cached = OCRService._cache_get(key)
+        if cached is not None and len(cached) == len(pages):
+            return cached
+
+        if not OCRService.available():
+            logger.warning("%d image-only PDF pages but OCR is unavailable (%s not found)",
+                           len(scanned), settings.tesseract_cmd)
+            return pages
+
+        started = time.monotonic()
+        deadline = started + settings.ocr_timeout_seconds
+        selected = scanned[:settings.ocr_max_pages]
+        futures = {}
+        failed = 0
+        for index in selected:
+            try:
+                images = [image.data for image in reader.pages[index].images]
+            except Exception as e:
+                # Encodings PyPDF2 can't decode (e.g. JBIG2)
+                failed += 1
+                logger.warning("Could not extract images from page %d: %s", index + 1, e)
+                continue
+            futures[_pool().submit(in_context(OCRService._ocr_page, images, deadline))] = index
+
+        done, not_done = wait(futures, timeout=settings.ocr_timeout_seconds)
+        for future in not_done:
+            future.cancel()
+
+        result = list(pages)
+        failed += len(not_done)
+        for future in done:
+            try:
+                result[futures[future]] = future.result()
+            except Exception as e:
+                failed += 1
+                logger.warning("OCR failed on page %d: %s", futures[future] + 1, e)
+
+        logger.info(
+            "OCR pages=%d scanned=%d ocr=%d failed=%d skipped=%d elapsed_ms=%.0f",
+            len(pages), len(scanned), len(selected), failed, len(scanned) - len(selected),
+            (time.monotonic() - started) * 1000
+        )
+        # Partial results are not cached so a later upload can try again
+        if not failed:
+            OCRService._cache_put(key, result)
+        return result
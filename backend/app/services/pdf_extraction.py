@@ -0,0 +1,143 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from ..config import get_settings
+from ..tracing import set_attributes, trace_span
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def _pypdf2_pages(file_path: str, indices: Sequence[int]) -> List[str]:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in indices]
+
+
+def _pypdfium2_pages(file_path: str, indices: Sequence[int]) -> List[str]:
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(file_path)
+    try:
+        texts = []
+        for i in indices:
+            page = document[i]
+            text_page = page.get_textpage()
+            texts.append(text_page.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+            text_page.close()
+            page.close()
+        return texts
+    finally:
+        document.close()
+
+
+def _pdfminer_pages(file_path: str, indices: Sequence[int]) -> List[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    # extract_pages yields the requested pages in document order
+    return [
+        "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+        for page in extract_pages(file_path, page_numbers=set(indices))
+    ]
+
+
+def _pypdf2_count(file_path: str) -> int:
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(file_path).pages)
+
+
+def _pypdfium2_count(file_path: str) -> int:
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(file_path)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+# name -> (page count, text of selected pages)
+BACKENDS: Dict[str, tuple] = {
+    "pypdf2": (_pypdf2_count, _pypdf2_pages),
+    "pypdfium2": (_pypdfium2_count, _pypdfium2_pages),
+    "pdfminer": (_pypdf2_count, _pdfminer_pages),
+}
+_BACKEND_MODULES = {"pypdf2": "PyPDF2", "pypdfium2": "pypdfium2", "pdfminer": "pdfminer"}
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_warned = set()
+
+
+def _worker_count() -> int:
+    """Configured workers, capped at the CPUs actually available"""
+    return max(1, min(settings.pdf_workers, os.cpu_count() or 1))
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: the server process runs threads (event loop, OCR pool)
+            _executor = ProcessPoolExecutor(
+                max_workers=_worker_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def resolve_backend(name: str = None) -> str:
+    """The configured backend, or pypdf2 if it is unknown or not installed"""
+    name = (name or settings.pdf_backend).lower()
+    if name in BACKENDS:
+        try:
+            __import__(_BACKEND_MODULES[name])
+            return name
+        except ImportError:
+            pass
+    if name not in _warned:
+        _warned.add(name)
+        logger.warning("PDF backend %r is not available, using pypdf2", name)
+    return "pypdf2"
+
+
+def extract_page_range(backend: str, file_path: str, start: int, stop: int) -> List[str]:
+    """Worker entry point: text of pages [start, stop)"""
+    return BACKENDS[backend][1](file_path, range(start, stop))
+
+
+def extract_pages(file_path: str, backend: str = None, parallel: bool = None) -> List[str]:
+    """
+    Text of every page of a PDF, one string per page.
+
+    Documents with at least `pdf_parallel_min_pages` pages are split into
+    contiguous page ranges extracted in a process pool.
+    """
+    backend = resolve_backend(backend)
+    with trace_span("pdf.extract_pages", **{"pdf.backend": backend}):
+        page_count = BACKENDS[backend][0](file_path)
+
+        if parallel is None:
+            parallel = _worker_count() > 1 and page_count >= settings.pdf_parallel_min_pages
+        if not parallel or page_count < 2:
+            set_attributes(**{"pdf.pages": page_count, "pdf.chunks": 1})
+            return extract_page_range(backend, file_path, 0, page_count)
+
+        chunks = min(_worker_count(), page_count)
+        set_attributes(**{"pdf.pages": page_count, "pdf.chunks": chunks})
+        bounds = [round(page_count * i / chunks) for i in range(chunks + 1)]
+        futures = [
+            _pool().submit(extract_page_range, backend, file_path, bounds[i], bounds[i + 1])
+            for i in range(chunks)
+        ]
+        pages: List[str] = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
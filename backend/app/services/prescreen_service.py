@@ -0,0 +1,96 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..models import Job, Candidate
+from .text_index import BM25Index, tokenize, flatten_text
+
+EDUCATION_WEIGHT = 0.3
+EXPERIENCE_WEIGHT = 0.7
+
+
+class PrescreenService:
+    """Cheap CPU-only relevance scoring used before full LLM matching"""
+
+    @staticmethod
+    def criterion_query(criterion: Dict) -> List[str]:
+        """Query terms for one education or experience criterion"""
+        return tokenize(flatten_text({
+            key: value for key, value in criterion.items()
+            if key not in ("id", "is_mandatory", "years_required")
+        }))
+
+    @staticmethod
+    def raw_text(candidate: Candidate) -> str:
+        return candidate.cv_raw_text or ""
+
+    @staticmethod
+    def parsed_text(candidate: Candidate) -> str:
+        return flatten_text(candidate.parsed_cv_data)
+
+    @staticmethod
+    def score_candidates(
+        job: Job,
+        candidates: List[Candidate],
+        document: Callable[[Candidate], str] = None
+    ) -> Dict[int, float]:
+        """
+        Score each candidate's CV (raw text by default) against the job criteria.
+
+        Each criterion is a BM25 query over the candidates' CV corpus; scores are
+        normalised by the best candidate for that criterion and combined with
+        the 30/70 education/experience weights, giving a 0-1 relevance score.
+        """
+        document = document or PrescreenService.raw_text
+        index = BM25Index()
+        for candidate in candidates:
+            index.add(candidate.id, tokenize(document(candidate)))
+
+        def criteria_relevance(criteria: List[Dict]) -> Dict[int, float]:
+            totals: Dict[int, float] = {}
+            queries = [q for q in (PrescreenService.criterion_query(c) for c in criteria or []) if q]
+            for query in queries:
+                scores = index.score(query)
+                best = max(scores.values(), default=0.0)
+                if best <= 0:
+                    continue
+                for candidate_id, score in scores.items():
+                    totals[candidate_id] = totals.get(candidate_id, 0.0) + score / best
+            return {cid: total / len(queries) for cid, total in totals.items()} if queries else {}
+
+        education = criteria_relevance(job.education_criteria)
+        experience = criteria_relevance(job.experience_criteria)
+
+        return {
+            candidate.id: round(
+                EDUCATION_WEIGHT * education.get(candidate.id, 0.0)
+                + EXPERIENCE_WEIGHT * experience.get(candidate.id, 0.0),
+                4
+            )
+            for candidate in candidates
+        }
+
+    @staticmethod
+    def select(
+        candidates: List[Candidate],
+        scores: Dict[int, float],
+        top_k: Optional[int] = None,
+        min_score: Optional[float] = None
+    ) -> Tuple[List[Candidate], List[Candidate]]:
+        """
+        Split candidates into (shortlisted, rejected).
+
+        A candidate is shortlisted if it ranks within `top_k` or scores at
+        least `min_score`; with neither limit set everyone is shortlisted.
+        """
+        if not top_k and min_score is None:
+            return list(candidates), []
+
+        ranked = sorted(candidates, key=lambda c: scores.get(c.id, 0.0), reverse=True)
+        shortlisted, rejected = [], []
+        for position, candidate in enumerate(ranked, 1):
+            in_top_k = bool(top_k) and position <= top_k
+            above_threshold = min_score is not None and scores.get(candidate.id, 0.0) >= min_score
+            if in_top_k or above_threshold:
+                shortlisted.append(candidate)
+            else:
+                rejected.append(candidate)
+        return shortlisted, rejected
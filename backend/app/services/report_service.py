@@ -1,306 +1,505 @@
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
+import time
+from collections import OrderedDict
 from io import BytesIO
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional
+from datetime import date
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from ..config import get_settings
+from ..metrics import REPORT_RENDER_SECONDS, span, timed
 from ..models import Job, Candidate, MatchResult
+from .scoring_policy import CompiledPolicy, ScoringPolicyService
+
+settings = get_settings()
+
+# Rendered reports keyed by (report, id, format, data fingerprint, date).
+# Rendering is most of a report's cost, so the bytes are cached and reports
+# are stamped with the generation date only, deliberately: a time of day
+# would be stale in the cached copy. The date in the key keeps the stamp right
+_REPORT_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_REPORT_CACHE_SIZE = 64
+
+# Core PDF fonts only cover Latin-1, so map the symbols used in reports
+_PDF_REPLACEMENTS = {
+    "≤": "<=",
+    "≥": ">=",
+    "✓": "[+]",
+    "✗": "[-]",
+    "⚠": "(!)",
+    "─": "-",
+    "–": "-",
+    "—": "-",
+    "‘": "'",
+    "’": "'",
+    "“": '"',
+    "”": '"',
+    "•": "-",
+}
+
+
+class ReportDocument:
+    """Format-neutral report content, rendered to DOCX or PDF"""
+
+    def __init__(self):
+        self.blocks: List[Dict[str, Any]] = []
+
+    def title(self, text: str):
+        self.blocks.append({"type": "title", "text": text})
+
+    def heading(self, text: str, level: int = 1):
+        self.blocks.append({"type": "heading", "text": text, "level": level})
+
+    def paragraph(
+        self,
+        text: str = "",
+        label: str = None,
+        bold: bool = False,
+        italic: bool = False,
+        size: int = None,
+        style: str = None
+    ):
+        """Add a paragraph; `label` is rendered as a bold prefix"""
+        self.blocks.append({
+            "type": "paragraph",
+            "text": text,
+            "label": label,
+            "bold": bold,
+            "italic": italic,
+            "size": size,
+            "style": style
+        })
+
+    def bullets(self, items: List[str]):
+        self.blocks.append({"type": "bullets", "items": list(items)})
+
+    def table(self, rows: List[List[str]], header: bool = False):
+        self.blocks.append({
+            "type": "table",
+            "rows": [[str(cell) for cell in row] for row in rows],
+            "header": header
+        })
 
 
 class ReportService:
-    """Service to generate DOCX reports"""
+    """Service to generate DOCX, PDF and Excel reports"""
 
     def __init__(self, db: Session):
         self.db = db
 
-    def generate_candidate_report(self, match_result: MatchResult) -> BytesIO:
+    def _policy(self, version: Optional[int] = None) -> CompiledPolicy:
+        """The policy a result was scored under, or the active one"""
+        policy = ScoringPolicyService.get(self.db, version) if version else None
+        return ScoringPolicyService.compile(policy) if policy else ScoringPolicyService.active(self.db)
+
+    def generate_candidate_report(self, match_result: MatchResult, fmt: str = "docx") -> BytesIO:
         """Generate detailed report for a single candidate"""
-        doc = Document()
+        fingerprint = (
+            match_result.updated_at,
+            match_result.candidate.updated_at,
+            match_result.job.updated_at
+        )
+        return self._cached(
+            ("candidate", match_result.id, fmt, fingerprint),
+            lambda: self._render(self._build_candidate_report(match_result), fmt)
+        )
+
+    def generate_longlist_report(self, job_id: int, fmt: str = "docx") -> BytesIO:
+        """Generate longlist report for a job (top candidates, 20 by default)"""
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError("Job not found")
+
+        return self._cached(
+            ("longlist", job_id, fmt, self._job_fingerprint(job)),
+            lambda: self._render(self._build_longlist_report(job), fmt)
+        )
+
+    def _build_candidate_report(self, match_result: MatchResult) -> ReportDocument:
+        """Build the content of a candidate evaluation report"""
+        doc = ReportDocument()
         candidate = match_result.candidate
         job = match_result.job
+        policy = self._policy(match_result.policy_version)
+        education_weight, experience_weight = f"{policy.education_weight:g}", f"{policy.experience_weight:g}"
 
         # Title
-        title = doc.add_heading('Candidate Evaluation Report', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.title('Candidate Evaluation Report')
 
         # Header info
-        doc.add_paragraph(f"African Union Commission")
-        doc.add_paragraph(f"Human Resources Management Directorate")
-        doc.add_paragraph(f"Talent Acquisition Unit")
-        doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        doc.add_paragraph()
+        doc.paragraph("African Union Commission")
+        doc.paragraph("Human Resources Management Directorate")
+        doc.paragraph("Talent Acquisition Unit")
+        doc.paragraph(f"Generated: {date.today().isoformat()}")  # Day granular, see _REPORT_CACHE
+        doc.paragraph()
 
         # Job Information
-        doc.add_heading('Position Information', level=1)
-        job_table = doc.add_table(rows=4, cols=2)
-        job_table.style = 'Table Grid'
-        job_data = [
+        doc.heading('Position Information', level=1)
+        doc.table([
             ("Position Title", job.title),
             ("Reference Number", job.reference_number or "N/A"),
             ("Grade Level", job.grade_level.value if job.grade_level else "N/A"),
             ("Minimum Pass Mark", f"{job.min_pass_mark}%")
-        ]
-        for i, (label, value) in enumerate(job_data):
-            job_table.rows[i].cells[0].text = label
-            job_table.rows[i].cells[1].text = str(value)
+        ])
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Candidate Information
-        doc.add_heading('Candidate Information', level=1)
-        cand_table = doc.add_table(rows=6, cols=2)
-        cand_table.style = 'Table Grid'
-        cand_data = [
+        doc.heading('Candidate Information', level=1)
+        doc.table([
             ("Full Name", candidate.full_name),
             ("Email", candidate.email or "N/A"),
             ("Nationality", candidate.nationality or "N/A"),
             ("Gender", candidate.gender.value.title() if candidate.gender else "Not Specified"),
             ("Least Represented Country", "Yes" if candidate.is_least_represented_country else "No"),
             ("Disability Status", "Yes" if candidate.has_disability else "No")
-        ]
-        for i, (label, value) in enumerate(cand_data):
-            cand_table.rows[i].cells[0].text = label
-            cand_table.rows[i].cells[1].text = str(value)
+        ])
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Score Summary
-        doc.add_heading('Score Summary', level=1)
+        doc.heading('Score Summary', level=1)
 
         # Final score highlight
-        p = doc.add_paragraph()
-        run = p.add_run(f"FINAL SCORE: {match_result.final_score:.1f}/100")
-        run.bold = True
-        run.font.size = Pt(16)
-
-        p = doc.add_paragraph()
-        run = p.add_run(f"RANK: #{match_result.rank}")
-        run.bold = True
+        doc.paragraph(f"FINAL SCORE: {match_result.final_score:.1f}/100", bold=True, size=16)
+        doc.paragraph(f"RANK: #{match_result.rank}", bold=True)
 
         status = "PASSES" if match_result.passes_cutoff else "DOES NOT PASS"
-        p = doc.add_paragraph()
-        run = p.add_run(f"Cutoff Status: {status} (minimum: {job.min_pass_mark}%)")
-        run.bold = True
+        doc.paragraph(f"Cutoff Status: {status} (minimum: {job.min_pass_mark}%)", bold=True)
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Score breakdown table
-        score_table = doc.add_table(rows=6, cols=2)
-        score_table.style = 'Table Grid'
-        score_data = [
-            ("Education Score (30%)", f"{match_result.education_total:.1f}/30"),
-            ("Experience Score (70%)", f"{match_result.experience_total:.1f}/70"),
+        doc.table([
+            (f"Education Score ({education_weight}%)", f"{match_result.education_total:.1f}/{education_weight}"),
+            (f"Experience Score ({experience_weight}%)", f"{match_result.experience_total:.1f}/{experience_weight}"),
             ("Base Score", f"{match_result.base_score:.1f}/100"),
             ("Female Bonus", f"+{match_result.bonus_female}"),
-            ("Age Bonus (≤35)", f"+{match_result.bonus_age}"),
+            (f"Age Bonus (≤{policy.max_bonus_age})", f"+{match_result.bonus_age}"),
             ("Least Represented Bonus", f"+{match_result.bonus_least_represented}"),
-        ]
-        for i, (label, value) in enumerate(score_data):
-            score_table.rows[i].cells[0].text = label
-            score_table.rows[i].cells[1].text = str(value)
+        ])
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Education Scores Detail
-        doc.add_heading('Education Assessment (30%)', level=1)
-        if match_result.education_scores:
-            for criterion_id, data in match_result.education_scores.items():
-                p = doc.add_paragraph()
-                run = p.add_run(f"{criterion_id.replace('_', ' ').title()}: ")
-                run.bold = True
-                p.add_run(f"{data.get('score', 0)}/{data.get('max', 10)}")
-
-                reasoning = doc.add_paragraph(data.get('reasoning', 'No reasoning provided'))
-                reasoning.style = 'Quote'
+        doc.heading(f'Education Assessment ({education_weight}%)', level=1)
+        self._add_criterion_scores(doc, match_result.education_scores)
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Experience Scores Detail
-        doc.add_heading('Experience Assessment (70%)', level=1)
-        if match_result.experience_scores:
-            for criterion_id, data in match_result.experience_scores.items():
-                p = doc.add_paragraph()
-                run = p.add_run(f"{criterion_id.replace('_', ' ').title()}: ")
-                run.bold = True
-                p.add_run(f"{data.get('score', 0)}/{data.get('max', 10)}")
-
-                reasoning = doc.add_paragraph(data.get('reasoning', 'No reasoning provided'))
-                reasoning.style = 'Quote'
+        doc.heading(f'Experience Assessment ({experience_weight}%)', level=1)
+        self._add_criterion_scores(doc, match_result.experience_scores)
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Overall Assessment
-        doc.add_heading('Overall Assessment', level=1)
-        doc.add_paragraph(match_result.overall_reasoning or "No overall assessment provided")
+        doc.heading('Overall Assessment', level=1)
+        doc.paragraph(match_result.overall_reasoning or "No overall assessment provided")
 
         # Strengths
-        doc.add_heading('Strengths', level=2)
+        doc.heading('Strengths', level=2)
         if match_result.strengths:
-            for strength in match_result.strengths:
-                doc.add_paragraph(strength, style='List Bullet')
+            doc.bullets(match_result.strengths)
         else:
-            doc.add_paragraph("No strengths identified")
+            doc.paragraph("No strengths identified")
 
         # Weaknesses
-        doc.add_heading('Areas of Concern / Gaps', level=2)
+        doc.heading('Areas of Concern / Gaps', level=2)
         if match_result.weaknesses:
-            for weakness in match_result.weaknesses:
-                doc.add_paragraph(weakness, style='List Bullet')
+            doc.bullets(match_result.weaknesses)
         else:
-            doc.add_paragraph("No concerns identified")
+            doc.paragraph("No concerns identified")
 
         # Flags
         if match_result.flags:
-            doc.add_heading('Flags', level=2)
-            for flag in match_result.flags:
-                doc.add_paragraph(f"⚠ {flag}", style='List Bullet')
+            doc.heading('Flags', level=2)
+            doc.bullets(f"⚠ {flag}" for flag in match_result.flags)
 
         # Recommendations
-        doc.add_heading('Recommendations', level=1)
-        doc.add_paragraph(match_result.recommendations or "No recommendations provided")
+        doc.heading('Recommendations', level=1)
+        doc.paragraph(match_result.recommendations or "No recommendations provided")
 
         # Footer
-        doc.add_paragraph()
-        doc.add_paragraph("─" * 50)
-        p = doc.add_paragraph()
-        run = p.add_run("This report was generated by the AI-supported CV Matching Tool")
-        run.italic = True
-        p = doc.add_paragraph()
-        run = p.add_run("African Union Commission - Human Resources Management Directorate")
-        run.italic = True
-
-        # Save to BytesIO
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-
-        return buffer
-
-    def generate_longlist_report(self, job_id: int) -> BytesIO:
-        """Generate longlist report for a job (top 20 candidates)"""
-        job = self.db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            raise ValueError("Job not found")
-
+        doc.paragraph()
+        doc.paragraph("─" * 50)
+        doc.paragraph("This report was generated by the AI-supported CV Matching Tool", italic=True)
+        doc.paragraph("African Union Commission - Human Resources Management Directorate", italic=True)
+
+        return doc
+
+    def _add_criterion_scores(self, doc: ReportDocument, scores: Dict[str, Any]):
+        """Add one scored line plus reasoning per criterion"""
+        if not scores:
+            return
+        for criterion_id, data in scores.items():
+            doc.paragraph(
+                f"{data.get('score', 0)}/{data.get('max', 10)}",
+                label=f"{criterion_id.replace('_', ' ').title()}: "
+            )
+            doc.paragraph(data.get('reasoning', 'No reasoning provided'), style='Quote')
+
+    def _build_longlist_report(self, job: Job) -> ReportDocument:
+        """Build the content of a longlist report"""
+        policy = self._policy()
         results = self.db.query(MatchResult).filter(
-            MatchResult.job_id == job_id
-        ).order_by(MatchResult.final_score.desc()).limit(20).all()
+            MatchResult.job_id == job.id
+        ).order_by(MatchResult.final_score.desc()).limit(policy.longlist_size).all()
+        education_weight, experience_weight = f"{policy.education_weight:g}", f"{policy.experience_weight:g}"
 
-        doc = Document()
+        doc = ReportDocument()
 
         # Title
-        title = doc.add_heading('Candidate Longlist Report', 0)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        doc.title('Candidate Longlist Report')
 
         # Header
-        doc.add_paragraph("African Union Commission")
-        doc.add_paragraph("Human Resources Management Directorate")
-        doc.add_paragraph("Talent Acquisition Unit")
-        doc.add_paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        doc.add_paragraph()
+        doc.paragraph("African Union Commission")
+        doc.paragraph("Human Resources Management Directorate")
+        doc.paragraph("Talent Acquisition Unit")
+        doc.paragraph(f"Generated: {date.today().isoformat()}")  # Day granular, see _REPORT_CACHE
+        doc.paragraph()
 
         # Job Info
-        doc.add_heading('Position Details', level=1)
-        doc.add_paragraph(f"Position: {job.title}")
-        doc.add_paragraph(f"Reference: {job.reference_number or 'N/A'}")
-        doc.add_paragraph(f"Grade: {job.grade_level.value if job.grade_level else 'N/A'}")
-        doc.add_paragraph(f"Minimum Pass Mark: {job.min_pass_mark}%")
-        doc.add_paragraph()
+        doc.heading('Position Details', level=1)
+        doc.paragraph(f"Position: {job.title}")
+        doc.paragraph(f"Reference: {job.reference_number or 'N/A'}")
+        doc.paragraph(f"Grade: {job.grade_level.value if job.grade_level else 'N/A'}")
+        doc.paragraph(f"Minimum Pass Mark: {job.min_pass_mark}%")
+        doc.paragraph()
 
         # Summary Statistics
-        doc.add_heading('Summary Statistics', level=1)
-        total_candidates = self.db.query(Candidate).filter(
-            Candidate.job_id == job_id
+        doc.heading('Summary Statistics', level=1)
+        total_candidates = self.db.query(MatchResult).filter(
+            MatchResult.job_id == job.id
         ).count()
 
         passing = sum(1 for r in results if r.passes_cutoff)
-        doc.add_paragraph(f"Total Candidates Screened: {total_candidates}")
-        doc.add_paragraph(f"Candidates in Longlist: {len(results)}")
-        doc.add_paragraph(f"Meeting Cutoff Score: {passing}")
+        doc.paragraph(f"Total Candidates Screened: {total_candidates}")
+        doc.paragraph(f"Candidates in Longlist: {len(results)}")
+        doc.paragraph(f"Meeting Cutoff Score: {passing}")
 
-        doc.add_paragraph()
+        doc.paragraph()
 
         # Longlist Table
-        doc.add_heading('Top 20 Candidates (Longlist)', level=1)
-
-        table = doc.add_table(rows=1, cols=7)
-        table.style = 'Table Grid'
-
-        # Header row
-        headers = ['Rank', 'Name', 'Gender', 'Nationality', 'Education', 'Experience', 'Final Score']
-        header_cells = table.rows[0].cells
-        for i, header in enumerate(headers):
-            header_cells[i].text = header
-            header_cells[i].paragraphs[0].runs[0].bold = True
+        doc.heading(f'Top {policy.longlist_size} Candidates (Longlist)', level=1)
 
-        # Data rows
+        rows = [['Rank', 'Name', 'Gender', 'Nationality', 'Education', 'Experience', 'Final Score']]
         for result in results:
             candidate = result.candidate
-            row = table.add_row().cells
-            row[0].text = str(result.rank)
-            row[1].text = candidate.full_name
-            row[2].text = candidate.gender.value.title() if candidate.gender else "N/S"
-            row[3].text = candidate.nationality or "N/A"
-            row[4].text = f"{result.education_total:.1f}/30"
-            row[5].text = f"{result.experience_total:.1f}/70"
-            row[6].text = f"{result.final_score:.1f}"
-
-        doc.add_paragraph()
+            rows.append([
+                str(result.rank),
+                candidate.full_name,
+                candidate.gender.value.title() if candidate.gender else "N/S",
+                candidate.nationality or "N/A",
+                f"{result.education_total:.1f}/{education_weight}",
+                f"{result.experience_total:.1f}/{experience_weight}",
+                f"{result.final_score:.1f}"
+            ])
+        doc.table(rows, header=True)
+
+        doc.paragraph()
 
         # Individual summaries
-        doc.add_heading('Individual Candidate Summaries', level=1)
+        doc.heading('Individual Candidate Summaries', level=1)
 
         for result in results:
             candidate = result.candidate
-            doc.add_heading(f"#{result.rank}. {candidate.full_name}", level=2)
-
-            p = doc.add_paragraph()
-            run = p.add_run(f"Score: {result.final_score:.1f}/100")
-            run.bold = True
+            doc.heading(f"#{result.rank}. {candidate.full_name}", level=2)
 
-            if result.passes_cutoff:
-                p.add_run(" ✓ Meets cutoff")
-            else:
-                p.add_run(" ✗ Below cutoff")
+            cutoff = " ✓ Meets cutoff" if result.passes_cutoff else " ✗ Below cutoff"
+            doc.paragraph(cutoff, label=f"Score: {result.final_score:.1f}/100")
 
             # Bonus breakdown
             bonuses = []
             if result.bonus_female > 0:
-                bonuses.append("Female (+5)")
+                bonuses.append(f"Female (+{result.bonus_female})")
             if result.bonus_age > 0:
-                bonuses.append("Age ≤35 (+5)")
+                bonuses.append(f"Age ≤{policy.max_bonus_age} (+{result.bonus_age})")
             if result.bonus_least_represented > 0:
-                bonuses.append("Least Rep. Country (+5)")
+                bonuses.append(f"Least Rep. Country (+{result.bonus_least_represented})")
             if result.bonus_inclusion > 0:
-                bonuses.append("Inclusion (+5)")
+                bonuses.append(f"Inclusion (+{result.bonus_inclusion})")
 
             if bonuses:
-                doc.add_paragraph(f"Bonuses: {', '.join(bonuses)}")
+                doc.paragraph(f"Bonuses: {', '.join(bonuses)}")
 
-            doc.add_paragraph(f"Summary: {result.overall_reasoning[:500] if result.overall_reasoning else 'N/A'}...")
-            doc.add_paragraph()
+            doc.paragraph(f"Summary: {result.overall_reasoning[:500] if result.overall_reasoning else 'N/A'}...")
+            doc.paragraph()
 
         # Footer
-        doc.add_paragraph("─" * 50)
-        p = doc.add_paragraph()
-        run = p.add_run("Generated by AI-supported CV Matching Tool - African Union Commission")
-        run.italic = True
+        doc.paragraph("─" * 50)
+        doc.paragraph("Generated by AI-supported CV Matching Tool - African Union Commission", italic=True)
+
+        return doc
+
+    @timed("report.render")
+    def _render(self, doc: ReportDocument, fmt: str) -> bytes:
+        """Render a report document in the requested format"""
+        if fmt == "docx":
+            return self._render_docx(doc)
+        if fmt == "pdf":
+            return self._render_pdf(doc)
+        raise ValueError(f"Unsupported report format: {fmt}")
+
+    def _render_docx(self, report: ReportDocument) -> bytes:
+        """Render a report document with python-docx"""
+        from docx import Document
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        from docx.shared import Pt
+
+        doc = Document()
+
+        for block in report.blocks:
+            kind = block["type"]
+            if kind == "title":
+                title = doc.add_heading(block["text"], 0)
+                title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            elif kind == "heading":
+                doc.add_heading(block["text"], level=block["level"])
+            elif kind == "paragraph":
+                p = doc.add_paragraph(style=block["style"])
+                if block["label"]:
+                    p.add_run(block["label"]).bold = True
+                if block["text"]:
+                    run = p.add_run(block["text"])
+                    run.bold = block["bold"]
+                    run.italic = block["italic"]
+                    if block["size"]:
+                        run.font.size = Pt(block["size"])
+            elif kind == "bullets":
+                for item in block["items"]:
+                    doc.add_paragraph(item, style='List Bullet')
+            elif kind == "table":
+                rows = block["rows"]
+                table = doc.add_table(rows=len(rows), cols=len(rows[0]) if rows else 0)
+                table.style = 'Table Grid'
+                for i, row in enumerate(rows):
+                    for j, value in enumerate(row):
+                        cell = table.rows[i].cells[j]
+                        cell.text = value
+                        if block["header"] and i == 0 and cell.paragraphs[0].runs:
+                            cell.paragraphs[0].runs[0].bold = True
 
         buffer = BytesIO()
         doc.save(buffer)
-        buffer.seek(0)
-
-        return buffer
+        return buffer.getvalue()
+
+    def _render_pdf(self, report: ReportDocument) -> bytes:
+        """Render a report document with the pure-Python fpdf2 writer"""
+        from fpdf import FPDF
+
+        pdf = FPDF(format="A4")
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+
+        if settings.report_pdf_font:
+            # A Unicode TTF font renders the report symbols as-is
+            pdf.add_font("Report", "", settings.report_pdf_font)
+            pdf.add_font("Report", "B", settings.report_pdf_font)
+            pdf.add_font("Report", "I", settings.report_pdf_font)
+            family = "Report"
+            clean = str
+        else:
+            family = "Helvetica"
+            clean = _latin1
+
+        def write(text: str, style: str = "", size: int = 10, height: float = 5.5):
+            pdf.set_font(family, style, size)
+            pdf.multi_cell(0, height, clean(text), new_x="LMARGIN", new_y="NEXT")
+
+        for block in report.blocks:
+            kind = block["type"]
+            if kind == "title":
+                pdf.set_font(family, "B", 18)
+                pdf.multi_cell(0, 10, clean(block["text"]), align="C", new_x="LMARGIN", new_y="NEXT")
+                pdf.ln(2)
+            elif kind == "heading":
+                pdf.ln(2)
+                write(block["text"], "B", 14 if block["level"] == 1 else 12, 7)
+            elif kind == "paragraph":
+                style = ("B" if block["bold"] else "") + ("I" if block["italic"] else "")
+                size = block["size"] or 10
+                if block["style"] == "Quote":
+                    style = "I"
+                    pdf.set_x(pdf.l_margin + 8)
+                    pdf.set_font(family, style, size)
+                    pdf.multi_cell(0, 5.5, clean(block["text"]), new_x="LMARGIN", new_y="NEXT")
+                elif block["label"]:
+                    pdf.set_font(family, "B", size)
+                    pdf.write(5.5, clean(block["label"]))
+                    pdf.set_font(family, style, size)
+                    pdf.write(5.5, clean(block["text"]))
+                    pdf.ln(5.5)
+                elif block["text"]:
+                    write(block["text"], style, size, 5.5 if size <= 12 else 8)
+                else:
+                    pdf.ln(3)
+            elif kind == "bullets":
+                for item in block["items"]:
+                    pdf.set_font(family, "", 10)
+                    pdf.set_x(pdf.l_margin + 4)
+                    pdf.multi_cell(0, 5.5, clean(f"- {item}"), new_x="LMARGIN", new_y="NEXT")
+            elif kind == "table":
+                pdf.set_font(family, "", 9)
+                with pdf.table(first_row_as_headings=block["header"], line_height=5) as table:
+                    for row in block["rows"]:
+                        table_row = table.row()
+                        for value in row:
+                            table_row.cell(clean(value))
+
+        return bytes(pdf.output())
+
+    def _job_fingerprint(self, job: Job) -> tuple:
+        """Cheap summary of everything a job-level report depends on"""
+        result_count, last_result_update = self.db.query(
+            func.count(MatchResult.id), func.max(MatchResult.updated_at)
+        ).filter(MatchResult.job_id == job.id).one()
+        candidate_count, last_candidate_update = self.db.query(
+            func.count(Candidate.id), func.max(Candidate.updated_at)
+        ).filter(Candidate.job_id == job.id).one()
+        return (
+            job.updated_at,
+            # The longlist size comes from the active scoring policy
+            ScoringPolicyService.get_active(self.db).version,
+            result_count,
+            last_result_update,
+            candidate_count,
+            last_candidate_update
+        )
+
+    def _cached(self, key: tuple, render: Callable[[], bytes]) -> BytesIO:
+        """Return a rendered report from cache, rendering it on a miss"""
+        key = (*key, date.today())
+        content: Optional[bytes] = _REPORT_CACHE.get(key)
+        if content is None:
+            report, fmt = key[0], key[2]
+            started = time.perf_counter()
+            with span(f"report.{report}.{fmt}"):
+                content = render()
+            REPORT_RENDER_SECONDS.labels(report, fmt).observe(time.perf_counter() - started)
+            _REPORT_CACHE[key] = content
+            while len(_REPORT_CACHE) > _REPORT_CACHE_SIZE:
+                _REPORT_CACHE.popitem(last=False)
+        else:
+            _REPORT_CACHE.move_to_end(key)
+        return BytesIO(content)
 
     def generate_excel_report(self, job_id: int) -> BytesIO:
         """Generate Excel report with all candidates"""
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise ValueError("Job not found")
+
+        return self._cached(
+            ("rankings", job_id, "xlsx", self._job_fingerprint(job)),
+            lambda: self._render_excel(job_id)
+        )
+
+    def _render_excel(self, job_id: int) -> bytes:
+        """Render the candidate rankings workbook"""
         import openpyxl
         from openpyxl.styles import Font, PatternFill, Alignment
 
-        job = self.db.query(Job).filter(Job.id == job_id).first()
         results = self.db.query(MatchResult).filter(
             MatchResult.job_id == job_id
         ).order_by(MatchResult.final_score.desc()).all()
@@ -358,6 +557,11 @@ class ReportService:
 
         buffer = BytesIO()
         wb.save(buffer)
-        buffer.seek(0)
+        return buffer.getvalue()
+
 
-        return buffer
+def _latin1(text: str) -> str:
+    """Make text safe for the Latin-1 core PDF fonts"""
+    for symbol, replacement in _PDF_REPLACEMENTS.items():
+        text = text.replace(symbol, replacement)
+    return text.encode("latin-1", "replace").decode("latin-1")
@@ -0,0 +1,258 @@
+import logging
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import Job, ScoringPolicy, ScreeningStatus
+from ..schemas import ScoringPolicyConfig
+
+logger = logging.getLogger(__name__)
+
+_compiled: Dict[int, "CompiledPolicy"] = {}
+_compiled_lock = threading.Lock()
+# Versions are max + 1, so concurrent creates can collide on the unique version
+CREATE_ATTEMPTS = 5
+
+
+class CompiledPolicy:
+    """
+    A scoring policy prepared for evaluation: rules are resolved once into
+    plain attributes and sets, then applied column by column to many results.
+    """
+
+    def __init__(self, version: Optional[int], config: ScoringPolicyConfig):
+        self.version = version
+        self.config = config
+        self.education_weight = config.education_weight
+        self.experience_weight = config.experience_weight
+        self.criterion_max = config.criterion_max
+        self.bonus_female = config.bonuses.female
+        self.bonus_age = config.bonuses.age
+        self.bonus_least_represented = config.bonuses.least_represented
+        self.bonus_inclusion = config.bonuses.inclusion
+        self.max_bonus_age = config.max_bonus_age
+        self.least_represented = frozenset(config.least_represented_countries)
+        self.longlist_size = config.longlist_size
+        self.pass_marks = {grade.value: mark for grade, mark in config.pass_marks.items()}
+
+    def pass_mark(self, grade_level) -> float:
+        grade = getattr(grade_level, "value", grade_level)
+        return self.pass_marks.get(grade, min(self.pass_marks.values(), default=0))
+
+    def is_least_represented(self, nationality: Optional[str]) -> bool:
+        return nationality in self.least_represented
+
+    @property
+    def section_rules(self) -> tuple:
+        """Policies with equal section rules produce equal section totals"""
+        return (self.education_weight, self.experience_weight, self.criterion_max)
+
+    def _section_totals(self, column: Sequence[Optional[Dict[str, Any]]], criteria_count: int, weight: float):
+        """Criterion scores scaled so a perfect section is worth `weight`"""
+        cap = self.criterion_max
+        totals = []
+        for scores in column:
+            if not scores:
+                totals.append(0.0)
+                continue
+            points = 0
+            for score in scores.values():
+                value = score.get("score") or 0
+                points += cap if value > cap else (value if value > 0 else 0)
+            totals.append(round(min(weight, weight * points / ((criteria_count or len(scores)) * cap)), 2))
+        return totals
+
+    def section_totals(self, job: Job, results: Sequence[Any]):
+        """(education totals, experience totals) from each result's criterion scores"""
+        return (
+            self._section_totals([r.education_scores for r in results], len(job.education_criteria or []),
+                                 self.education_weight),
+            self._section_totals([r.experience_scores for r in results], len(job.experience_criteria or []),
+                                 self.experience_weight),
+        )
+
+    def evaluate(
+        self,
+        job: Job,
+        results: Sequence[Any],
+        candidates: Sequence[Any],
+        pass_mark: float,
+        totals: tuple = None
+    ) -> Dict[str, List[Any]]:
+        """
+        Section totals, bonuses, final score and cutoff (base score against
+        `pass_mark`) for each result, as columns in input order. `results`
+        need screening_status, plus education_scores and experience_scores
+        unless precomputed section `totals` are given; `candidates` need
+        gender, date_of_birth, nationality and has_disability (the same row
+        object may serve as both).
+        """
+        today = date.today()
+        # age <= max_bonus_age exactly when born after this (year, month, day)
+        age_limit = (today.year - self.max_bonus_age - 1, today.month, today.day)
+
+        scored = [r.screening_status != ScreeningStatus.PRESCREEN_REJECTED for r in results]
+        education_total, experience_total = totals or self.section_totals(job, results)
+        education_total = [t if ok else 0.0 for ok, t in zip(scored, education_total)]
+        experience_total = [t if ok else 0.0 for ok, t in zip(scored, experience_total)]
+        least_represented = [c.nationality in self.least_represented for c in candidates]
+        bonus_female = [self.bonus_female if ok and c.gender == "female" else 0 for ok, c in zip(scored, candidates)]
+        bonus_age = [
+            self.bonus_age if ok and c.date_of_birth
+            and (c.date_of_birth.year, c.date_of_birth.month, c.date_of_birth.day) > age_limit else 0
+            for ok, c in zip(scored, candidates)
+        ]
+        bonus_least_represented = [
+            self.bonus_least_represented if ok and lr else 0 for ok, lr in zip(scored, least_represented)
+        ]
+        bonus_inclusion = [self.bonus_inclusion if ok and c.has_disability else 0 for ok, c in zip(scored, candidates)]
+        base_score = [e + x for e, x in zip(education_total, experience_total)]
+        total_bonus = [sum(b) for b in zip(bonus_female, bonus_age, bonus_least_represented, bonus_inclusion)]
+
+        return {
+            "education_total": education_total,
+            "experience_total": experience_total,
+            "base_score": base_score,
+            "bonus_female": bonus_female,
+            "bonus_age": bonus_age,
+            "bonus_least_represented": bonus_least_represented,
+            "bonus_inclusion": bonus_inclusion,
+            "total_bonus": total_bonus,
+            "final_score": [base + bonus for base, bonus in zip(base_score, total_bonus)],
+            "passes_cutoff": [ok and base >= pass_mark for ok, base in zip(scored, base_score)],
+            "is_least_represented": least_represented,
+        }
+
+    def rank(
+        self,
+        final_scores: Sequence[float],
+        ids: Sequence[int],
+        statuses: Sequence[ScreeningStatus]
+    ) -> List[Dict[str, Any]]:
+        """Rank and longlist flag for each result, in input order (ties by id)"""
+        order = sorted(range(len(ids)), key=lambda i: (-(final_scores[i] or 0), ids[i]))
+        rankings: List[Dict[str, Any]] = [{}] * len(ids)
+        for rank, i in enumerate(order, 1):
+            rankings[i] = {
+                "rank": rank,
+                # Never including candidates rejected at pre-screening
+                "is_in_longlist": rank <= self.longlist_size and statuses[i] != ScreeningStatus.PRESCREEN_REJECTED,
+            }
+        return rankings
+
+
+class ScoringPolicyService:
+    """Versioned scoring policies stored in the database"""
+
+    @staticmethod
+    def compile(policy: ScoringPolicy) -> CompiledPolicy:
+        """Compiled form of a stored policy; versions are immutable, so it is cached"""
+        with _compiled_lock:
+            compiled = _compiled.get(policy.version)
+            if compiled is None:
+                compiled = CompiledPolicy(policy.version, ScoringPolicyConfig(**policy.config))
+                _compiled[policy.version] = compiled
+            return compiled
+
+    @staticmethod
+    def get(db: Session, version: int) -> Optional[ScoringPolicy]:
+        return db.query(ScoringPolicy).filter(ScoringPolicy.version == version).first()
+
+    @staticmethod
+    def _find_active(db: Session) -> Optional[ScoringPolicy]:
+        policy = db.query(ScoringPolicy).filter(ScoringPolicy.is_active == True).first()
+        if policy is None:
+            policy = db.query(ScoringPolicy).order_by(ScoringPolicy.version.desc()).first()
+        return policy
+
+    @staticmethod
+    def seed_default(db: Session) -> ScoringPolicy:
+        """Store the default rules as version 1 unless a policy exists (run by app.migrate)"""
+        policy = ScoringPolicyService._find_active(db)
+        if policy is not None:
+            return policy
+        db.add(ScoringPolicy(
+            version=1,
+            name="Default",
+            description="Original AU screening rules",
+            config=ScoringPolicyConfig().model_dump(mode="json"),
+            is_active=True
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker stored it first
+            db.rollback()
+        return ScoringPolicyService._find_active(db)
+
+    @staticmethod
+    def get_active(db: Session) -> ScoringPolicy:
+        """The active policy; seeds the default if migrations have not"""
+        return ScoringPolicyService._find_active(db) or ScoringPolicyService.seed_default(db)
+
+    @staticmethod
+    def active(db: Session) -> CompiledPolicy:
+        return ScoringPolicyService.compile(ScoringPolicyService.get_active(db))
+
+    @staticmethod
+    def merge_config(base: Dict[str, Any], overrides: Dict[str, Any]) -> ScoringPolicyConfig:
+        """Apply overrides (nested dicts merged one level deep); raises ValueError if invalid"""
+        merged = dict(base)
+        for key, value in (overrides or {}).items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            else:
+                merged[key] = value
+        # pydantic's ValidationError is a ValueError
+        return ScoringPolicyConfig(**merged)
+
+    @staticmethod
+    def create(
+        db: Session,
+        name: str,
+        overrides: Dict[str, Any],
+        description: str = None,
+        activate: bool = False,
+        created_by: str = None
+    ) -> ScoringPolicy:
+        """Store a new version built from the active policy plus overrides"""
+        base = ScoringPolicyService.get_active(db)
+        config = ScoringPolicyService.merge_config(base.config, overrides)
+        for attempt in range(CREATE_ATTEMPTS):
+            version = (db.query(func.max(ScoringPolicy.version)).scalar() or 0) + 1
+            policy = ScoringPolicy(
+                version=version,
+                name=name,
+                description=description,
+                config=config.model_dump(mode="json"),
+                is_active=False,
+                created_by=created_by
+            )
+            db.add(policy)
+            try:
+                db.commit()
+                break
+            except IntegrityError:
+                # Another worker took this version number; take the next one
+                db.rollback()
+                if attempt == CREATE_ATTEMPTS - 1:
+                    raise
+        if activate:
+            ScoringPolicyService.activate(db, version)
+        db.refresh(policy)
+        return policy
+
+    @staticmethod
+    def activate(db: Session, version: int) -> ScoringPolicy:
+        policy = ScoringPolicyService.get(db, version)
+        if policy is None:
+            raise ValueError("Scoring policy not found")
+        db.query(ScoringPolicy).filter(ScoringPolicy.version != version).update({"is_active": False})
+        policy.is_active = True
+        db.commit()
+        logger.info("scoring policy v%d (%s) activated", version, policy.name)
+        return policy
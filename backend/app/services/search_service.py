@@ -0,0 +1,226 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import func, cast, Text, literal_column
+from sqlalchemy.orm import Session
+
+from ..models import Candidate
+from ..models.candidate import Gender, search_document
+from .text_index import BM25Index, tokenize, flatten_text, normalize_text
+
+FACETS = ("nationality", "gender", "degree_level")
+
+
+class _LocalSearchIndex:
+    """
+    In-process inverted index used when the database has no full-text search
+    (SQLite). Kept in sync lazily by comparing a cheap fingerprint of the
+    candidates table before each search.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = BM25Index()
+        self.docs: Dict[int, Dict[str, Any]] = {}
+        self.fingerprint = None
+        self.last_updated = None
+
+    def sync(self, db: Session):
+        count, last_updated = db.query(func.count(Candidate.id), func.max(Candidate.updated_at)).one()
+        if (count, last_updated) == self.fingerprint:
+            return
+
+        query = db.query(Candidate)
+        if self.last_updated is not None:
+            query = query.filter(Candidate.updated_at >= self.last_updated)
+        for candidate in query.yield_per(500):
+            self._add(candidate)
+
+        if len(self.docs) != count:
+            live_ids = {row[0] for row in db.query(Candidate.id)}
+            for candidate_id in set(self.docs) - live_ids:
+                self.index.remove(candidate_id)
+                del self.docs[candidate_id]
+
+        self.fingerprint = (count, last_updated)
+        self.last_updated = last_updated
+
+    def _add(self, candidate: Candidate):
+        self.index.add(candidate.id, tokenize(" ".join((
+            candidate.full_name or "",
+            candidate.search_text or "",
+            candidate.cv_raw_text or "",
+        ))))
+        self.docs[candidate.id] = {
+            "candidate_id": candidate.id,
+            "job_id": candidate.job_id,
+            "full_name": candidate.full_name,
+            "nationality": candidate.nationality,
+            "gender": candidate.gender.value if candidate.gender else None,
+            "degree_level": candidate.highest_degree_level,
+            "skills": normalize_text(flatten_text(candidate.skills)),
+            "created_at": candidate.created_at,
+        }
+
+
+_local_index = _LocalSearchIndex()
+
+
+class CandidateSearchService:
+    """Full-text and faceted candidate search across all jobs"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        q: str = "",
+        job_id: Optional[int] = None,
+        nationality: Optional[str] = None,
+        gender: Optional[str] = None,
+        degree_level: Optional[str] = None,
+        skill: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict[str, Any]:
+        """Return one page of ranked hits plus facet counts for the full match set"""
+        started = time.perf_counter()
+        filters = {
+            "job_id": job_id,
+            "nationality": nationality,
+            "gender": gender,
+            "degree_level": degree_level,
+            "skill": skill,
+        }
+        if self.db.bind.dialect.name == "postgresql":
+            total, hits, facets = self._search_postgres(q, filters, page, page_size)
+        else:
+            total, hits, facets = self._search_local(q, filters, page, page_size)
+
+        return {
+            "query": q,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+            "hits": hits,
+            "facets": facets,
+        }
+
+    def _search_postgres(self, q: str, filters: Dict[str, Any], page: int, page_size: int):
+        conditions = []
+        rank = literal_column("0")
+        if q.strip():
+            tsquery = func.websearch_to_tsquery(literal_column("'english'::regconfig"), q)
+            document = search_document()
+            conditions.append(document.op("@@")(tsquery))
+            rank = func.ts_rank_cd(document, tsquery)
+        if filters["job_id"] is not None:
+            conditions.append(Candidate.job_id == filters["job_id"])
+        if filters["nationality"]:
+            conditions.append(func.lower(Candidate.nationality) == filters["nationality"].lower())
+        if filters["gender"]:
+            conditions.append(Candidate.gender == Gender(filters["gender"]))
+        if filters["degree_level"]:
+            conditions.append(Candidate.highest_degree_level == filters["degree_level"])
+        if filters["skill"]:
+            conditions.append(cast(Candidate.skills, Text).ilike(f"%{filters['skill']}%"))
+
+        total = self.db.query(func.count(Candidate.id)).filter(*conditions).scalar()
+
+        rows = self.db.query(
+            Candidate.id, Candidate.job_id, Candidate.full_name, Candidate.nationality,
+            Candidate.gender, Candidate.highest_degree_level, rank.label("score")
+        ).filter(*conditions).order_by(
+            rank.desc(), Candidate.created_at.desc()
+        ).offset((page - 1) * page_size).limit(page_size).all()
+
+        hits = [
+            {
+                "candidate_id": row.id,
+                "job_id": row.job_id,
+                "full_name": row.full_name,
+                "nationality": row.nationality,
+                "gender": row.gender.value if row.gender else None,
+                "degree_level": row.highest_degree_level,
+                "score": round(float(row.score or 0), 4),
+            }
+            for row in rows
+        ]
+
+        facet_columns = {
+            "nationality": Candidate.nationality,
+            "gender": Candidate.gender,
+            "degree_level": Candidate.highest_degree_level,
+        }
+        facets = {}
+        for name, column in facet_columns.items():
+            counts = self.db.query(column, func.count(Candidate.id)).filter(
+                *conditions
+            ).group_by(column).order_by(func.count(Candidate.id).desc()).limit(25).all()
+            facets[name] = {
+                (value.value if hasattr(value, "value") else value) or "unknown": count
+                for value, count in counts
+            }
+
+        return total, hits, facets
+
+    def _search_local(self, q: str, filters: Dict[str, Any], page: int, page_size: int):
+        with _local_index.lock:
+            _local_index.sync(self.db)
+            docs = _local_index.docs
+
+            def matches(doc: Dict[str, Any]) -> bool:
+                if filters["job_id"] is not None and doc["job_id"] != filters["job_id"]:
+                    return False
+                if filters["nationality"] and (doc["nationality"] or "").lower() != filters["nationality"].lower():
+                    return False
+                if filters["gender"] and doc["gender"] != filters["gender"]:
+                    return False
+                if filters["degree_level"] and doc["degree_level"] != filters["degree_level"]:
+                    return False
+                if filters["skill"] and normalize_text(filters["skill"]) not in doc["skills"]:
+                    return False
+                return True
+
+            query_tokens = tokenize(q)
+            if query_tokens:
+                ranked = [
+                    (candidate_id, score)
+                    for candidate_id, score in _local_index.index.search(query_tokens)
+                    if matches(docs[candidate_id])
+                ]
+            else:
+                ranked = sorted(
+                    ((candidate_id, 0.0) for candidate_id, doc in docs.items() if matches(doc)),
+                    key=lambda item: docs[item[0]]["created_at"] or datetime.min,
+                    reverse=True
+                )
+
+            facets: Dict[str, Dict[str, int]] = {name: {} for name in FACETS}
+            for candidate_id, _ in ranked:
+                for name in FACETS:
+                    value = docs[candidate_id][name] or "unknown"
+                    facets[name][value] = facets[name].get(value, 0) + 1
+            facets = {
+                name: dict(sorted(counts.items(), key=lambda item: item[1], reverse=True)[:25])
+                for name, counts in facets.items()
+            }
+
+            start = (page - 1) * page_size
+            hits: List[Dict[str, Any]] = []
+            for candidate_id, score in ranked[start:start + page_size]:
+                doc = docs[candidate_id]
+                hits.append({
+                    "candidate_id": candidate_id,
+                    "job_id": doc["job_id"],
+                    "full_name": doc["full_name"],
+                    "nationality": doc["nationality"],
+                    "gender": doc["gender"],
+                    "degree_level": doc["degree_level"],
+                    "score": round(score, 4),
+                })
+
+        return len(ranked), hits, facets
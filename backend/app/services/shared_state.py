@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import secrets
+import threading
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from ..config import get_settings
+from ..database import get_engine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Redis: release / extend only while the key still holds our token
+_RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+_EXTEND_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('pexpire', KEYS[1], ARGV[2]) end return 0"
+)
+
+_local_locks: Set[str] = set()
+_local_lock = threading.Lock()
+_redis = None
+_redis_sync = None
+_backend: Optional[str] = None
+
+
+class LockUnavailable(Exception):
+    """Another worker (or request) holds the lock"""
+
+
+def backend() -> str:
+    """
+    Where cross-worker state lives: "redis" when `shared_state_url` is set,
+    "postgresql" advisory locks on a PostgreSQL database, otherwise "local"
+    (in-process, correct only for a single worker; refused when
+    `web_workers` is above 1).
+    """
+    global _backend
+    if _backend is None:
+        if settings.shared_state_url:
+            _backend = "redis"
+        elif get_engine().dialect.name == "postgresql":
+            _backend = "postgresql"
+        elif settings.web_workers > 1:
+            # Process-local locks would let two workers screen the same job
+            raise RuntimeError(
+                f"{settings.web_workers} workers need PostgreSQL or SHARED_STATE_URL for shared state"
+            )
+        else:
+            _backend = "local"
+            logger.info("shared state is process-local; run a single worker or set SHARED_STATE_URL")
+    return _backend
+
+
+def _import_redis():
+    try:
+        import redis
+        import redis.asyncio
+    except ImportError:
+        raise RuntimeError("SHARED_STATE_URL needs the redis package (pip install redis)")
+    return redis
+
+
+def redis_client():
+    """Async client for SHARED_STATE_URL"""
+    global _redis
+    if _redis is None:
+        _redis = _import_redis().asyncio.from_url(settings.shared_state_url)
+    return _redis
+
+
+def redis_sync_client():
+    """Blocking client for SHARED_STATE_URL, for code running in threads"""
+    global _redis_sync
+    if _redis_sync is None:
+        _redis_sync = _import_redis().Redis.from_url(settings.shared_state_url)
+    return _redis_sync
+
+
+def _advisory_key(name: str):
+    """Two-int advisory lock key: (namespace, id) for "namespace:id", else a hash"""
+    namespace, _, suffix = name.rpartition(":")
+    if namespace and suffix.isdigit() and int(suffix) < 2 ** 31:
+        return zlib.crc32(namespace.encode()) & 0x7FFFFFFF, int(suffix)
+    return zlib.crc32(b"shared_state") & 0x7FFFFFFF, zlib.crc32(name.encode()) & 0x7FFFFFFF
+
+
+def _advisory(connection, function: str, namespace: int, key: int):
+    result = connection.execute(
+        text(f"SELECT {function}(:namespace, :key)"), {"namespace": namespace, "key": key}
+    ).scalar()
+    connection.commit()
+    return result
+
+
+@asynccontextmanager
+async def _postgresql_lock(name: str) -> AsyncIterator[None]:
+    # Session-level advisory lock: held by this connection until unlocked,
+    # and released by the server if the worker dies. Pool checkout and the
+    # lock queries go to the threadpool, so a busy pool doesn't block the loop
+    namespace, key = _advisory_key(name)
+    connection = await run_in_threadpool(get_engine().connect)
+    try:
+        if not await run_in_threadpool(_advisory, connection, "pg_try_advisory_lock", namespace, key):
+            raise LockUnavailable(name)
+        try:
+            yield
+        finally:
+            await run_in_threadpool(_advisory, connection, "pg_advisory_unlock", namespace, key)
+    finally:
+        await run_in_threadpool(connection.close)
+
+
+@asynccontextmanager
+async def _redis_lock(name: str) -> AsyncIterator[None]:
+    # A lease renewed while held, so a crashed worker's lock expires
+    client = redis_client()
+    key = f"lock:{name}"
+    token = secrets.token_hex(16)
+    ttl_ms = int(settings.job_lock_ttl_seconds * 1000)
+    if not await client.set(key, token, nx=True, px=ttl_ms):
+        raise LockUnavailable(name)
+
+    async def renew():
+        while True:
+            await asyncio.sleep(settings.job_lock_ttl_seconds / 3)
+            if not await client.eval(_EXTEND_SCRIPT, 1, key, token, ttl_ms):
+                logger.warning("lost lock %s", name)
+                return
+
+    renewer = asyncio.create_task(renew())
+    try:
+        yield
+    finally:
+        renewer.cancel()
+        await client.eval(_RELEASE_SCRIPT, 1, key, token)
+
+
+@asynccontextmanager
+async def _local_lock_held(name: str) -> AsyncIterator[None]:
+    with _local_lock:
+        if name in _local_locks:
+            raise LockUnavailable(name)
+        _local_locks.add(name)
+    try:
+        yield
+    finally:
+        with _local_lock:
+            _local_locks.discard(name)
+
+
+def lock(name: str):
+    """
+    Non-blocking lock shared by all workers: raises LockUnavailable at once
+    if it is held elsewhere, otherwise held for the `async with` block.
+    """
+    kind = backend()
+    if kind == "redis":
+        return _redis_lock(name)
+    if kind == "postgresql":
+        return _postgresql_lock(name)
+    return _local_lock_held(name)
+
+
+def job_screening_lock(job_id: int):
+    """Held while a job's candidates are being screened or re-scored"""
+    return lock(f"job_screening:{job_id}")
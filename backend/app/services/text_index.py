@@ -0,0 +1,130 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple, Any
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Common English words plus words that appear in nearly every CV or JD
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be been being below between both but by
+can could did do does doing during each few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not of off on once only or
+other our ours out over own same she should so some such than that the their them then there these
+they this those through to too under until up very was we were what when where which while who whom
+why will with would you your yours
+ability able candidate candidates demonstrated experience experienced good including knowledge
+minimum must plus preferred proven related relevant required requirement requirements strong work
+working year years
+""".split())
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so 'Côte' and 'cote' index the same"""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def _stem(token: str) -> str:
+    """Very light plural stripping, applied identically to queries and documents"""
+    if len(token) <= 3 or token[-1] != "s" or token.endswith("ss"):
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    return token[:-1]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into index terms"""
+    return [
+        _stem(token)
+        for token in TOKEN_RE.findall(normalize_text(text))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def flatten_text(value: Any) -> str:
+    """Join every string and number inside nested JSON data"""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        return " ".join(flatten_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return " ".join(flatten_text(v) for v in value)
+    if isinstance(value, bool):
+        return ""
+    return str(value)
+
+
+class BM25Index:
+    """In-memory inverted index with Okapi BM25 ranking"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[Any, int]] = {}
+        self.doc_lengths: Dict[Any, int] = {}
+        self.doc_terms: Dict[Any, Tuple[str, ...]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id, tokens: Iterable[str]):
+        """Index a document, replacing any previous version"""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        length = sum(counts.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = tuple(counts)
+        self.total_length += length
+
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in self.doc_terms.pop(doc_id, ()):
+            docs = self.postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        n = len(self.doc_lengths)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, query_tokens: Iterable[str], doc_ids=None) -> Dict[Any, float]:
+        """BM25 score of every matching document (optionally restricted to doc_ids)"""
+        if not self.doc_lengths:
+            return {}
+        avg_length = self.total_length / len(self.doc_lengths) or 1.0
+        scores: Dict[Any, float] = {}
+        for term, query_tf in Counter(query_tokens).items():
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in docs.items():
+                if doc_ids is not None and doc_id not in doc_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, query_tokens: Iterable[str], limit: int = None, doc_ids=None) -> List[Tuple[Any, float]]:
+        """Documents ranked by BM25 score, best first"""
+        scores = self.score(query_tokens, doc_ids).items()
+        if limit:
+            return heapq.nlargest(limit, scores, key=lambda item: item[1])
+        return sorted(scores, key=lambda item: item[1], reverse=True)
@@ -0,0 +1,187 @@
+import re
+from math import ceil
+from typing import Dict, Any, List, Tuple
+
+from .llm_scheduler import estimate_tokens
+
+PAGE_BREAK = "\f"
+
+# Section headings by keep priority: 0 is never dropped, higher is dropped first
+SECTION_PRIORITIES = {
+    0: ("education", "academic", "qualification", "experience", "employment", "work history",
+        "career", "professional background", "positions held"),
+    1: ("skill", "competenc", "language", "certifica", "licen", "summary", "profile", "objective"),
+    2: ("training", "course", "workshop", "seminar"),
+    3: ("publication", "research", "conference", "presentation", "award", "honour", "honor",
+        "membership", "volunteer", "consultanc"),
+    4: ("hobb", "interest", "reference", "referee", "declaration", "annex", "appendi", "attachment"),
+}
+
+# Room reserved for the "[... N lines omitted ...]" marker
+OMITTED_MARKER_CHARS = 32
+
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?-?\s*\d{1,3}\s*-?(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+_HEADING_RE = re.compile(r"^(?:[\dIVX]+[.)]\s*)?([A-Za-z][A-Za-z &/,'-]{2,50}?)(?:\s+[\dIVX]+)?\s*(:?)$")
+_HYPHEN_BREAK_RE = re.compile(r"([a-z])-\n[ \t]*([a-z])")
+_SPACES_RE = re.compile(r"[ \t\u00a0]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _line_key(line: str) -> str:
+    """Compare boilerplate lines ignoring case, spacing and page numbers"""
+    return re.sub(r"\d+", "#", _SPACES_RE.sub(" ", line.strip().lower()))
+
+
+def strip_page_boilerplate(pages: List[str], edge_lines: int = 3) -> Tuple[List[str], int]:
+    """
+    Remove page numbers, and headers and footers (lines near the top or bottom
+    of a page that recur on most pages) after the first page.
+    Returns (pages, lines removed).
+    """
+    split = [page.split("\n") for page in pages]
+
+    def edges(lines: List[str]) -> List[int]:
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        return sorted(set(filled[:edge_lines] + filled[-edge_lines:]))
+
+    repeated = set()
+    if len(split) >= 3:
+        counts: Dict[str, int] = {}
+        for lines in split:
+            for key in {_line_key(lines[i]) for i in edges(lines)}:
+                counts[key] = counts.get(key, 0) + 1
+        threshold = max(3, ceil(0.6 * len(split)))
+        repeated = {key for key, count in counts.items() if count >= threshold}
+
+    removed = 0
+    cleaned = []
+    for number, lines in enumerate(split):
+        # The first copy stays: running headers often carry the candidate's name
+        drop = {
+            i for i in edges(lines)
+            if (number > 0 and _line_key(lines[i]) in repeated) or _PAGE_NUMBER_RE.match(lines[i].strip())
+        }
+        removed += len(drop)
+        cleaned.append("\n".join(line for i, line in enumerate(lines) if i not in drop))
+    return cleaned, removed
+
+
+def dehyphenate(text: str) -> str:
+    """Rejoin words split across lines ("manage-\\nment" -> "management")"""
+    return _HYPHEN_BREAK_RE.sub(r"\1\2", text)
+
+
+def collapse_whitespace(text: str) -> str:
+    lines = (_SPACES_RE.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def section_priority(line: str) -> int:
+    """Priority of a section heading line, or -1 if the line is not a heading"""
+    match = _HEADING_RE.match(line.strip())
+    if not match:
+        return -1
+    words = match.group(1).split()
+    # Headings are short and set apart: upper case, Title Case or a trailing colon
+    styled = (
+        match.group(1).isupper()
+        or match.group(2)
+        or all(word[0].isupper() for word in words if len(word) > 3)
+    )
+    if len(words) > 5 or not styled:
+        return -1
+    heading = match.group(1).lower()
+    for priority, keywords in SECTION_PRIORITIES.items():
+        if any(heading.startswith(k) or f" {k}" in heading for k in keywords):
+            return priority
+    return -1
+
+
+def split_sections(text: str) -> List[Dict[str, Any]]:
+    """Split CV text at recognised headings; the preamble has priority 0"""
+    sections = [{"title": "", "priority": 0, "lines": []}]
+    for line in text.split("\n"):
+        priority = section_priority(line)
+        if priority >= 0:
+            sections.append({"title": line.strip().rstrip(":"), "priority": priority, "lines": [line]})
+        else:
+            sections[-1]["lines"].append(line)
+    return [s for s in sections if s["lines"]]
+
+
+def truncate_to_budget(text: str, token_budget: int) -> Tuple[str, List[str]]:
+    """
+    Fit text into `token_budget` by dropping whole low-priority sections
+    (annexes, references, publications...) from the end first, then trimming
+    the tails of the longest remaining sections. Returns (text, dropped titles).
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text, []
+
+    budget_chars = token_budget * 4
+    sections = split_sections(text)
+
+    def size(section: Dict[str, Any]) -> int:
+        marker = OMITTED_MARKER_CHARS if section.get("omitted") else 0
+        return sum(len(line) + 1 for line in section["lines"]) + marker
+
+    total = sum(size(s) for s in sections)
+
+    dropped = []
+    order = sorted(range(len(sections)), key=lambda i: (-sections[i]["priority"], -i))
+    for index in order:
+        section = sections[index]
+        if total <= budget_chars or section["priority"] == 0:
+            break
+        total -= size(section)
+        section["lines"] = [f"[{section['title']} section omitted]"]
+        total += size(section)
+        dropped.append(section["title"])
+
+    # Long experience lists: keep the head (most recent roles) of each section
+    while total > budget_chars:
+        section = max(sections, key=size)
+        lines = section["lines"]
+        if len(lines) <= 5:
+            break
+        excess = total - budget_chars + (0 if section.get("omitted") else OMITTED_MARKER_CHARS)
+        total -= size(section)
+        keep = len(lines)
+        while keep > 5 and excess > 0:
+            keep -= 1
+            excess -= len(lines[keep]) + 1
+        section["omitted"] = section.get("omitted", 0) + len(lines) - keep
+        section["lines"] = lines[:keep]
+        total += size(section)
+
+    result = "\n".join(
+        line
+        for s in sections
+        for line in s["lines"] + ([f"[... {s['omitted']} lines omitted ...]"] if s.get("omitted") else [])
+    )
+    return result[:budget_chars], dropped
+
+
+def normalize_cv_text(text: str, token_budget: int = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Clean extracted CV text for the LLM: drop per-page headers/footers,
+    rejoin hyphenated words, collapse whitespace and truncate to the token
+    budget. Returns (text, stats) with token counts before and after.
+    """
+    text = text or ""
+    pages = text.split(PAGE_BREAK)
+    pages, boilerplate_lines = strip_page_boilerplate(pages)
+    normalized = collapse_whitespace(dehyphenate("\n\n".join(pages)))
+
+    dropped: List[str] = []
+    if token_budget:
+        normalized, dropped = truncate_to_budget(normalized, token_budget)
+
+    stats = {
+        "pages": len(pages),
+        "tokens_before": estimate_tokens(text),
+        "tokens_after": estimate_tokens(normalized),
+        "boilerplate_lines": boilerplate_lines,
+        "dropped_sections": dropped,
+    }
+    return normalized, stats
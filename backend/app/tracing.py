@@ -0,0 +1,196 @@
+"""
+Optional OpenTelemetry tracing.
+
+Enabled by TRACING_EXPORTER ("otlp" or "file") when the OpenTelemetry
+packages are installed; otherwise every helper here is a no-op. FastAPI
+routes are traced by the official instrumentation, SQL statements by engine
+events and application steps by `trace_span`.
+"""
+import contextvars
+import functools
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+from .config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_tracer = None
+_MAX_STATEMENT_CHARS = 2000
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def _file_exporter(path: str):
+    from opentelemetry.sdk.trace.export import SpanExportResult, SpanExporter
+
+    class JSONLinesSpanExporter(SpanExporter):
+        """One JSON span per line, for offline analysis"""
+
+        def __init__(self):
+            self._file = open(path, "a", encoding="utf-8")
+            self._lock = threading.Lock()
+
+        def export(self, spans):
+            with self._lock:
+                for span in spans:
+                    self._file.write(json.dumps(json.loads(span.to_json()), separators=(",", ":")) + "\n")
+                self._file.flush()
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            self._file.close()
+
+    return JSONLinesSpanExporter()
+
+
+def setup_tracing(app=None):
+    """Install the tracer provider and instrumentations (once per process)"""
+    global _tracer
+    exporter_name = (settings.tracing_exporter or "").lower()
+    if not exporter_name or _tracer is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    except ImportError:
+        logger.error("TRACING_EXPORTER is set but opentelemetry-sdk is not installed; tracing is off")
+        return
+
+    if exporter_name == "otlp":
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter()
+    elif exporter_name == "file":
+        exporter = _file_exporter(settings.tracing_file)
+    else:
+        logger.error("Unknown TRACING_EXPORTER %r (use otlp or file); tracing is off", exporter_name)
+        return
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBasedTraceIdRatio(settings.tracing_sample_ratio)
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("au-cv-matching")
+
+    _instrument_database()
+    if app is not None:
+        try:
+            from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+            FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics", exclude_spans=["send", "receive"])
+        except ImportError:
+            logger.warning("opentelemetry-instrumentation-fastapi not installed; routes are not traced")
+    logger.info("tracing to %s", exporter_name)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    conn.info.setdefault("trace_spans", []).append(_tracer.start_span(
+        f"db.{verb}",
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:_MAX_STATEMENT_CHARS],
+            "db.executemany": executemany,
+        }
+    ))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans:
+        span = spans.pop()
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+        span.end()
+
+
+def _handle_error(context):
+    spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(context.original_exception)
+        span.end()
+
+
+def _before_commit(session):
+    session.info["commit_span"] = _tracer.start_span("db.commit")
+
+
+def _end_commit(session):
+    span = session.info.pop("commit_span", None)
+    if span is not None:
+        span.end()
+
+
+def _instrument_database():
+    """
+    A span per SQL statement and per session commit (including its flush),
+    via engine and session events on every engine, the lazy one included;
+    works with any SQLAlchemy version
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_commit", _end_commit)
+    event.listen(Session, "after_rollback", _end_commit)
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any):
+    """A span around the block (child of the current one); yields it, or None when tracing is off"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        name, attributes={k: v for k, v in attributes.items() if v is not None}
+    ) as span:
+        yield span
+
+
+def set_attributes(**attributes: Any):
+    """Add attributes to the current span, if any"""
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+
+    span = trace.get_current_span()
+    for key, value in attributes.items():
+        if value is not None:
+            span.set_attribute(key, value)
+
+
+def record_span(name: str, start_time_ns: int, **attributes: Any):
+    """A finished span from `start_time_ns` (time.time_ns()) to now, for work that can't hold a current span"""
+    if _tracer is None:
+        return
+    span = _tracer.start_span(name, start_time=start_time_ns,
+                              attributes={k: v for k, v in attributes.items() if v is not None})
+    span.end()
+
+
+def in_context(function: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """
+    `function(*args, **kwargs)` bound to the caller's context, so spans
+    started in a thread pool stay children of the request's trace
+    (run_in_executor and submit do not copy contextvars).
+    """
+    context: Optional[contextvars.Context] = contextvars.copy_context() if _tracer is not None else None
+    if context is None:
+        return functools.partial(function, *args, **kwargs)
+    return functools.partial(context.run, function, *args, **kwargs)
@@ -0,0 +1,65 @@
+"""
+Token savings of CV text normalisation.
+
+Runs normalize_cv_text over stored candidate CVs and reports estimated
+tokens before and after boilerplate removal, de-hyphenation, whitespace
+collapsing and truncation to the token budget.
+
+Run from the backend directory:
+
+    python -m benchmarks.cv_normalization --job-id 12 --budget 12000
+"""
+import argparse
+import time
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models import Candidate
+from app.services.text_normalizer import normalize_cv_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--job-id", type=int, action="append", help="Job to sample (default: all jobs)")
+    parser.add_argument("--budget", type=int, default=get_settings().cv_token_budget)
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of CVs")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        query = db.query(Candidate).filter(Candidate.cv_raw_text.isnot(None))
+        if args.job_id:
+            query = query.filter(Candidate.job_id.in_(args.job_id))
+        if args.limit:
+            query = query.limit(args.limit)
+
+        count = before = after = truncated = boilerplate = 0
+        largest = []
+        started = time.perf_counter()
+        for candidate in query.yield_per(200):
+            _, stats = normalize_cv_text(candidate.cv_raw_text, args.budget)
+            count += 1
+            before += stats["tokens_before"]
+            after += stats["tokens_after"]
+            boilerplate += stats["boilerplate_lines"]
+            truncated += bool(stats["dropped_sections"])
+            largest.append((stats["tokens_before"], stats["tokens_after"], candidate.id))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+    if not count:
+        print("No CVs with extracted text")
+        return
+
+    print(f"CVs={count} budget={args.budget} time={elapsed_ms:.0f}ms ({elapsed_ms / count:.1f}ms/CV)")
+    print(f"  tokens before={before} after={after} saved={1 - after / before:.1%}")
+    print(f"  avg per CV before={before // count} after={after // count}")
+    print(f"  boilerplate lines removed={boilerplate} CVs with dropped sections={truncated}")
+    print("  largest CVs (before -> after):")
+    for tokens_before, tokens_after, candidate_id in sorted(largest, reverse=True)[:5]:
+        print(f"    candidate {candidate_id}: {tokens_before} -> {tokens_after}")
+
+
+if __name__ == "__main__":
+    main()
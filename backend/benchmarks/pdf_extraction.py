@@ -0,0 +1,87 @@
+"""
+PDF text extraction benchmark.
+
+Compares the original PyPDF2 loop (string concatenation, one process) with
+each installed backend, sequentially and with page-level parallelism.
+Without file arguments a synthetic CV-like PDF is generated.
+
+Run from the backend directory:
+
+    python -m benchmarks.pdf_extraction cv1.pdf cv2.pdf --repeat 3
+    python -m benchmarks.pdf_extraction --pages 40
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app.services.pdf_extraction import BACKENDS, extract_pages, resolve_backend
+
+
+def legacy_extract(file_path: str) -> str:
+    """The implementation before pluggable backends"""
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file_path)
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() or ""
+    return text.strip()
+
+
+def synthetic_pdf(pages: int) -> str:
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=10)
+    for number in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 5, f"Curriculum Vitae - page {number + 1}\n" + (
+            "Programme Officer, African Union Commission, Addis Ababa (2015-2020). "
+            "Coordinated regional integration policy analysis and stakeholder engagement. "
+        ) * 30)
+    path = os.path.join(tempfile.mkdtemp(), f"synthetic_{pages}.pdf")
+    pdf.output(path)
+    return path
+
+
+def timed(function, repeat: int):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--pages", type=int, default=30, help="Pages in the synthetic PDF")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    files = args.files or [synthetic_pdf(args.pages)]
+    backends = [name for name in BACKENDS if resolve_backend(name) == name]
+
+    for file_path in files:
+        print(f"\n{os.path.basename(file_path)}")
+        print(f"  {'method':<24}{'ms':>10}{'chars':>10}")
+        elapsed, text = timed(lambda: legacy_extract(file_path), args.repeat)
+        print(f"  {'legacy pypdf2 loop':<24}{elapsed:>10.1f}{len(text):>10}")
+
+        for backend in backends:
+            for parallel in (False, True):
+                # Warm the process pool outside the timing
+                if parallel:
+                    extract_pages(file_path, backend, parallel=True)
+                elapsed, pages = timed(
+                    lambda: "\f".join(extract_pages(file_path, backend, parallel=parallel)), args.repeat
+                )
+                label = f"{backend}{' parallel' if parallel else ''}"
+                print(f"  {label:<24}{elapsed:>10.1f}{len(pages):>10}")
+
+
+if __name__ == "__main__":
+    main()
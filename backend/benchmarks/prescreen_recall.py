@@ -0,0 +1,75 @@
+"""
+Recall benchmark for local pre-screening.
+
+Replays PrescreenService over jobs that were already fully scored by Claude
+and reports how many of the LLM's longlisted and cutoff-passing candidates
+would have survived the pre-screen, and how many LLM calls it would save.
+
+Run from the backend directory:
+
+    python -m benchmarks.prescreen_recall --job-id 12 --top-k 20 50 100 --min-score 0.2 0.3
+"""
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.models import Job, Candidate, MatchResult, ScreeningStatus
+from app.services.prescreen_service import PrescreenService
+
+
+def recall(kept: set, relevant: set) -> float:
+    return len(kept & relevant) / len(relevant) if relevant else 1.0
+
+
+def benchmark_job(db, job: Job, top_ks, min_scores):
+    results = db.query(MatchResult).filter(
+        MatchResult.job_id == job.id,
+        MatchResult.screening_status == ScreeningStatus.SCORED
+    ).all()
+    scored_ids = {r.candidate_id for r in results}
+    candidates = db.query(Candidate).filter(Candidate.id.in_(scored_ids)).all()
+    if not candidates:
+        print(f"Job {job.id}: no fully scored candidates, skipping")
+        return
+
+    longlist = {r.candidate_id for r in results if r.is_in_longlist}
+    passing = {r.candidate_id for r in results if r.passes_cutoff}
+
+    started = time.perf_counter()
+    scores = PrescreenService.score_candidates(job, candidates)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"\nJob {job.id} - {job.title}")
+    print(f"  candidates={len(candidates)} longlist={len(longlist)} passing={len(passing)} "
+          f"prescreen_time={elapsed_ms:.1f}ms")
+    print(f"  {'setting':<18}{'kept':>6}{'saved':>8}{'longlist':>10}{'passing':>10}")
+
+    settings = [(k, None) for k in top_ks] + [(None, s) for s in min_scores]
+    for top_k, min_score in settings:
+        shortlisted, rejected = PrescreenService.select(candidates, scores, top_k, min_score)
+        kept = {c.id for c in shortlisted}
+        label = f"top_k={top_k}" if top_k else f"min_score={min_score}"
+        print(f"  {label:<18}{len(kept):>6}{len(rejected) / len(candidates):>8.0%}"
+              f"{recall(kept, longlist):>10.0%}{recall(kept, passing):>10.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--job-id", type=int, action="append", help="Job to replay (default: all jobs)")
+    parser.add_argument("--top-k", type=int, nargs="*", default=[20, 50, 100])
+    parser.add_argument("--min-score", type=float, nargs="*", default=[0.2, 0.3, 0.4])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        query = db.query(Job)
+        if args.job_id:
+            query = query.filter(Job.id.in_(args.job_id))
+        for job in query.all():
+            benchmark_job(db, job, args.top_k, args.min_score)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
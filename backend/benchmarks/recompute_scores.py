@@ -0,0 +1,109 @@
+"""
+Local score recomputation benchmark.
+
+Seeds a synthetic job with N scored candidates in a throwaway SQLite
+database and times MatchingService.recompute_job_scores and what_if
+against the per-result ORM loop (policy evaluation, then ranking).
+
+Run from the backend directory:
+
+    python -m benchmarks.recompute_scores --candidates 10000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Job, Candidate, MatchResult
+from app.schemas import LEAST_REPRESENTED_COUNTRIES
+from app.services.matching_service import MatchingService
+
+
+def seed(db, count: int) -> int:
+    rng = random.Random(7)
+    job = Job(title="Synthetic", grade_level="P3", raw_jd_text="jd", min_pass_mark=60,
+              education_criteria=[{"id": f"edu_{i}"} for i in range(3)],
+              experience_criteria=[{"id": f"exp_{i}"} for i in range(7)], status="active")
+    db.add(job)
+    db.flush()
+    countries = LEAST_REPRESENTED_COUNTRIES + ["Kenya", "Nigeria", "Egypt", "Ethiopia", "Ghana"] * 6
+    candidates = [
+        Candidate(
+            job_id=job.id, full_name=f"Candidate {i}", gender=rng.choice(["male", "female", "not_specified"]),
+            date_of_birth=date(rng.randint(1965, 2000), rng.randint(1, 12), rng.randint(1, 28)),
+            nationality=rng.choice(countries), has_disability=rng.random() < 0.05
+        )
+        for i in range(count)
+    ]
+    db.add_all(candidates)
+    db.flush()
+    db.add_all([
+        MatchResult(job_id=job.id, candidate_id=c.id,
+                    education_scores={f"edu_{i}": {"score": rng.randint(0, 10), "max": 10} for i in range(3)},
+                    experience_scores={f"exp_{i}": {"score": rng.randint(0, 10), "max": 10} for i in range(7)},
+                    bonus_female=0, bonus_age=0, bonus_least_represented=0, bonus_inclusion=0)
+        for c in candidates
+    ])
+    db.commit()
+    return job.id
+
+
+def legacy_recompute(service: MatchingService, job_id: int):
+    """Per-result ORM loop, as done after each Claude match"""
+    job = service.db.query(Job).filter(Job.id == job_id).first()
+    for result in service.db.query(MatchResult).filter(MatchResult.job_id == job_id).all():
+        candidate = result.candidate
+        candidate.is_least_represented_country = candidate.nationality in LEAST_REPRESENTED_COUNTRIES
+        service._apply_policy(result, candidate, job)
+    service.db.commit()
+    results = service.db.query(MatchResult).filter(
+        MatchResult.job_id == job_id
+    ).order_by(MatchResult.final_score.desc()).all()
+    for i, result in enumerate(results, 1):
+        result.rank = i
+        result.is_in_longlist = i <= 20
+    service.db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=10000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "recompute.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        job_id = seed(db, args.candidates)
+        service = MatchingService(db)
+
+        for label, run in (
+            ("legacy ORM loop", lambda: legacy_recompute(service, job_id)),
+            ("recompute (first run)", lambda: service.recompute_job_scores(job_id)),
+            ("recompute (no changes)", lambda: service.recompute_job_scores(job_id)),
+            ("what-if (in memory)", lambda: service.what_if(job_id, service.policy)),
+        ):
+            db.expunge_all()
+            # Reset so every method starts from unscored bonuses and ranks
+            if label.startswith("recompute (first"):
+                db.query(MatchResult).update({"bonus_female": 0, "bonus_age": 0, "rank": None, "final_score": 0})
+                db.commit()
+            started = time.perf_counter()
+            summary = run()
+            elapsed = (time.perf_counter() - started) * 1000
+            detail = f" updated={summary['updated']}" if summary and "updated" in summary else ""
+            print(f"{label:<26}{elapsed:>10.1f} ms{detail}")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Startup time benchmark.
+
+Starts fresh interpreters and times importing app.main, the first /health
+request and the first authenticated request (which builds the engine and
+reads the user) against a migrated throwaway SQLite database. Optionally
+lists the slowest imports.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup --repeat 5 --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.auth import create_access_token
+client = TestClient(app.main.app)
+ready = time.perf_counter()
+assert client.get("/health").status_code == 200
+health = time.perf_counter()
+token = create_access_token({"sub": "admin", "uid": 1, "adm": True})
+assert client.get("/api/auth/me", headers={"Authorization": "Bearer " + token}).status_code == 200
+authenticated = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (health - ready) * 1000,
+    "first_auth_request_ms": (authenticated - health) * 1000,
+}))
+"""
+
+
+def run(env: dict, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], env=env, capture_output=True, text=True, check=True)
+
+
+def slowest_imports(env: dict, top: int):
+    """(cumulative ms, module) for the slowest top-level and app imports"""
+    stderr = run(env, "-X", "importtime", "-c", "import app.main").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting shows as indentation; keep the top two levels
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "startup.db")
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", LOG_LEVEL="WARNING")
+    env.setdefault("ANTHROPIC_API_KEY", "benchmark")
+    run(env, "-m", "app.migrate")
+
+    samples = [json.loads(run(env, "-c", CHILD).stdout.strip().splitlines()[-1]) for _ in range(args.repeat)]
+    print(f"{'phase':<24}{'median ms':>12}{'min ms':>10}")
+    for key in ("import_ms", "first_request_ms", "first_auth_request_ms"):
+        values = [sample[key] for sample in samples]
+        print(f"{key[:-3]:<24}{statistics.median(values):>12.1f}{min(values):>10.1f}")
+
+    if args.top:
+        print("\nslowest imports (cumulative ms)")
+        for elapsed, name in slowest_imports(env, args.top):
+            print(f"  {elapsed:>8.1f}  {name}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
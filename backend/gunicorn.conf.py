@@ -0,0 +1,78 @@
+"""
+Multi-worker deployment: gunicorn managing uvicorn workers.
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Run `python -m app.migrate` first. Workers share no memory: per-job locks
+live in PostgreSQL (advisory locks) or a Redis-compatible server
+(SHARED_STATE_URL); with SQLite and no SHARED_STATE_URL only one worker is
+started. The Claude rate limits are split evenly between workers
+(WEB_WORKERS).
+"""
+import multiprocessing
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import Settings
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# WEB_CONCURRENCY overrides; each worker also runs its own PDF process pool,
+# so keep PDF_WORKERS small when raising this. CPUs are counted from the
+# scheduler affinity, which respects container CPU sets
+cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else multiprocessing.cpu_count()
+workers = int(os.environ.get("WEB_CONCURRENCY", cpus * 2 + 1))
+
+# A fresh Settings, not get_settings(): a cached copy would be inherited by the
+# forked workers without the WEB_WORKERS set below
+_settings = Settings()
+_shared_state = bool(_settings.shared_state_url) or _settings.database_url.startswith("postgres")
+_requested_workers = workers
+if not _shared_state:
+    # Job locks would be per process, so two workers could screen one job
+    workers = 1
+# Inherited by the workers, which each take 1/workers of the LLM budgets
+os.environ["WEB_WORKERS"] = str(workers)
+
+# Screening requests wait on Claude for minutes
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 600))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth from document parsing
+max_requests = 1000
+max_requests_jitter = 100
+
+# Heartbeat files on tmpfs where available (a slow disk can stall workers)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+
+# Client addresses from X-Forwarded-For are only trusted from these proxies;
+# on platforms whose router is the only way in (Render, Heroku) use "*"
+forwarded_allow_ips = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def on_starting(server):
+    if workers < _requested_workers:
+        server.log.warning(
+            "starting 1 worker instead of %d: multiple workers need a PostgreSQL DATABASE_URL "
+            "or SHARED_STATE_URL", _requested_workers
+        )
+    # Metrics from a previous run would be aggregated into this one
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.endswith(".db"):
+                os.remove(os.path.join(directory, name))
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -43,6 +43,9 @@ DATABASE_URL=${DATABASE_URL_VAL}
 SECRET_KEY=$(python3 -c "import secrets; print(secrets.token_hex(32))")
 ENVEOF
 
+# Create tables and the default admin user
+python -m app.migrate
+
 deactivate
 
 # 3. Build frontend
@@ -66,7 +69,7 @@ echo ""
 echo "Now start the app with these 2 commands (in separate terminals or use &):"
 echo ""
 echo "--- Start backend ---"
-echo "cd $APP_DIR/backend && source venv/bin/activate && uvicorn app.main:app --host 0.0.0.0 --port 8000"
+echo "cd $APP_DIR/backend && source venv/bin/activate && gunicorn app.main:app -c gunicorn.conf.py"
 echo ""
 echo "--- Start frontend ---"
 echo "cd $APP_DIR/frontend && npx serve dist -l 3000"
@@ -83,7 +86,8 @@ cat > "$APP_DIR/start.sh" << STARTEOF
 #!/bin/bash
 cd $APP_DIR/backend
 source venv/bin/activate
-uvicorn app.main:app --host 0.0.0.0 --port 8000 &
+python -m app.migrate
+gunicorn app.main:app -c gunicorn.conf.py &
 BACKEND_PID=\$!
 echo "Backend started (PID: \$BACKEND_PID)"
 